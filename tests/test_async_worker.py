@@ -0,0 +1,139 @@
+"""AsyncWorker 测试模块
+
+测试异步 Worker 在共享事件循环中的执行
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from zoo_framework.utils.loop_thread import get_event_loop_thread
+from zoo_framework.workers import AsyncWorker
+
+
+class EchoWorker(AsyncWorker):
+    """返回参数和执行线程的异步 Worker"""
+
+    async def async_execute(self, value=None):
+        await asyncio.sleep(0)
+        return value, threading.current_thread()
+
+
+class TestAsyncWorker:
+    """AsyncWorker 测试类"""
+
+    def test_execute_uses_shared_loop(self):
+        """测试同步调用在共享事件循环线程中执行，多次调用复用同一个循环"""
+        worker = EchoWorker("EchoWorker")
+
+        value, first_thread = worker.execute(1)
+        _, second_thread = worker.execute(2)
+
+        assert value == 1
+        assert first_thread is second_thread
+        assert get_event_loop_thread().in_loop_thread() is False
+        assert first_thread.name == get_event_loop_thread().name
+
+    def test_run_in_background_returns_future(self):
+        """测试后台运行返回 concurrent.futures.Future"""
+        worker = EchoWorker()
+
+        future = worker.run_in_background("background")
+        assert isinstance(future, Future)
+        assert future.result(timeout=2)[0] == "background"
+        assert future.done()
+
+    def test_execute_in_running_loop(self):
+        """测试在事件循环中调用时返回 Task"""
+        worker = EchoWorker()
+
+        async def main():
+            task = worker.execute("task")
+            assert isinstance(task, asyncio.Task)
+            return await task
+
+        assert asyncio.run(main())[0] == "task"
+
+    def test_worker_run(self):
+        """测试作为普通 Worker 运行"""
+        worker = EchoWorker("RunWorker")
+        result = worker.run()
+        assert result.content[0] is None
+        assert "RunWorker" in worker.name
+
+
+class SquareWorker(AsyncWorker):
+    """计算平方的异步 Worker，值越小耗时越长"""
+
+    async def async_execute(self, value):
+        await asyncio.sleep(0.001 * (5 - value % 5))
+        if value < 0:
+            raise ValueError("negative value")
+        return value * value
+
+
+class TestAsyncWorkerPool:
+    """AsyncWorkerPool 测试类"""
+
+    def test_map_keeps_order(self):
+        """测试 map 按输入顺序返回结果"""
+        from zoo_framework.workers import AsyncWorkerPool
+
+        async def main():
+            pool = AsyncWorkerPool(max_workers=4)
+            return await pool.map(SquareWorker(), range(20))
+
+        assert asyncio.run(main()) == [i * i for i in range(20)]
+
+    def test_as_completed(self):
+        """测试 as_completed 按完成顺序产出全部结果"""
+        from zoo_framework.workers import AsyncWorkerPool
+
+        async def main():
+            pool = AsyncWorkerPool(max_workers=4)
+            return [result async for result in pool.as_completed(SquareWorker(), range(10))]
+
+        results = asyncio.run(main())
+        assert sorted(results) == [i * i for i in range(10)]
+
+    def test_imap_reads_input_lazily(self):
+        """测试流式处理按需读取输入，内存占用有上限"""
+        import itertools
+
+        from zoo_framework.workers import AsyncWorkerPool
+
+        produced = []
+
+        def items():
+            for i in itertools.count():
+                produced.append(i)
+                yield i
+
+        async def main():
+            pool = AsyncWorkerPool(max_workers=2, queue_size=3)
+            results = []
+            async for result in pool.imap(SquareWorker(), items()):
+                results.append(result)
+                if len(results) == 10:
+                    break
+            return results
+
+        assert asyncio.run(main()) == [i * i for i in range(10)]
+        # 读取的输入不超过已取走的结果数加窗口大小
+        assert len(produced) <= 10 + 2 + 3 + 1
+
+    def test_imap_raises_error(self):
+        """测试任务失败时在对应位置抛出异常"""
+        import pytest
+
+        from zoo_framework.workers import AsyncWorkerPool
+
+        async def main():
+            pool = AsyncWorkerPool(max_workers=2)
+            results = []
+            async for result in pool.imap(SquareWorker(), [1, 2, -1, 3]):
+                results.append(result)
+            return results
+
+        with pytest.raises(ValueError):
+            asyncio.run(main())
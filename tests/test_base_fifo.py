@@ -1,28 +1,117 @@
 import unittest
 
-from zoo_framework.fifo import BaseFIFO
+from zoo_framework.fifo import BackpressurePolicy, BaseFIFO, FIFOFullError
 
 
 class BaseFIFOTester(unittest.TestCase):
 
-    def setUp(self):
-        """每个测试前清理 FIFO"""
-        BaseFIFO._fifo = []
-
     def test_put(self):
         """
         测试入队
         """
         fifo = BaseFIFO()
-        BaseFIFO.push_value(1)
-        BaseFIFO.push_value(2)
-        BaseFIFO.push_value(3)
+        fifo.push_value(1)
+        fifo.push_value(2)
+        fifo.push_value(3)
         self.assertEqual(fifo.size(), 3)
 
     def test_get(self):
+        fifo = BaseFIFO()
+        fifo.push_value(1)
+
+        self.assertEqual(fifo.pop_value(), 1)
+        self.assertIsNone(fifo.pop_value())
+
+    def test_instances_are_isolated(self):
+        """
+        测试不同实例之间互不影响
+        """
         class TestFIFO(BaseFIFO):
-            _fifo = []
+            pass
+
+        fifo = BaseFIFO()
+        other = TestFIFO()
+        fifo.push_value(1)
+
+        self.assertEqual(fifo.size(), 1)
+        self.assertEqual(other.size(), 0)
+
+    def test_reject(self):
+        """
+        测试队列满时拒绝入队
+        """
+        fifo = BaseFIFO(capacity=2, policy=BackpressurePolicy.REJECT)
+        fifo.push_value(1)
+        fifo.push_value(2)
+
+        with self.assertRaises(FIFOFullError):
+            fifo.push_value(3)
+        self.assertEqual(fifo.size(), 2)
+
+    def test_drop_oldest(self):
+        """
+        测试队列满时丢弃最旧的值
+        """
+        fifo = BaseFIFO(capacity=2, policy=BackpressurePolicy.DROP_OLDEST)
+        fifo.push_values([1, 2, 3])
+
+        self.assertEqual(fifo.size(), 2)
+        self.assertEqual(fifo.dropped_count, 1)
+        self.assertEqual(fifo.pop_value(), 2)
+        self.assertEqual(fifo.pop_value(), 3)
+
+    def test_block(self):
+        """
+        测试队列满时阻塞，超时后抛出异常
+        """
+        fifo = BaseFIFO(capacity=1, policy=BackpressurePolicy.BLOCK, block_timeout=0.05)
+        fifo.push_value(1)
+
+        with self.assertRaises(FIFOFullError):
+            fifo.push_value(2)
+
+    def test_block_until_pop(self):
+        """
+        测试阻塞的入队在出队后继续
+        """
+        import threading
+
+        fifo = BaseFIFO(capacity=1, policy=BackpressurePolicy.BLOCK)
+        fifo.push_value(1)
+
+        producer = threading.Thread(target=fifo.push_value, args=(2,))
+        producer.start()
+        self.assertEqual(fifo.pop_value(), 1)
+        producer.join(2)
+
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(fifo.pop_value(block=True, timeout=1), 2)
+
+    def test_push_if_null_concurrent(self):
+        """
+        测试多个线程同时入队同一个值时只入队一次
+        """
+        import threading
+        import time
+
+        class SlowFIFO(BaseFIFO):
+            def push_value(self, value):
+                # 入队前的处理较慢时，检查和入队之间容易被其他线程打断
+                time.sleep(0.001)
+                super().push_value(value)
+
+        fifo = SlowFIFO()
+        barrier = threading.Barrier(8)
+
+        def push():
+            barrier.wait()
+            for value in range(20):
+                fifo.push_values_if_null(value)
 
-        TestFIFO.push_value(1)
+        threads = [threading.Thread(target=push) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
 
-        self.assertEqual(TestFIFO.pop_value(), 1)
+        self.assertEqual(fifo.size(), 20)
@@ -1,3 +1,4 @@
+import time
 from zoo_framework.reactor.event_reactor_req import EventReactorReq
 from zoo_framework.utils import LogUtils
 from zoo_framework.event.event_channel_manager import EventChannelManager
@@ -31,3 +32,366 @@ class TestEvent(unittest.TestCase):
         
         event2 = EventNode(topic="test_event2", content="it‘s a test event2", channel_name="test_channel2")
         EventChannelManager().perform_event(event2)
+
+
+class TestEventChannelQueue:
+    """EventChannel 独立队列测试类"""
+
+    def test_channels_have_own_queue(self):
+        """测试每个通道持有独立的队列和容量"""
+        log_channel = EventChannel("queue_log", capacity=2)
+        business_channel = EventChannel("queue_business")
+
+        for i in range(3):
+            log_channel.push_event(EventNode(topic="log", content=str(i)))
+        business_channel.push_event(EventNode(topic="business", content="order"))
+
+        assert log_channel.size() == 2
+        assert business_channel.size() == 1
+        assert log_channel.get_metrics()["rejected_count"] == 1
+        assert business_channel.pop_value().content == "order"
+        assert log_channel.size() == 2
+
+    def test_hot_channel_not_starve_other_channel(self):
+        """测试事件堆积的通道不会阻塞其他通道的处理"""
+        import threading
+
+        release = threading.Event()
+        handled = []
+
+        def handler(node: EventNode):
+            if node.topic == "log":
+                release.wait(2)
+            handled.append(node.topic)
+
+        log_channel = EventChannel("drain_log", concurrency=1)
+        business_channel = EventChannel("drain_business", concurrency=1)
+        for i in range(5):
+            log_channel.push_event(EventNode(topic="log", content=str(i)))
+        business_channel.push_event(EventNode(topic="business", content="order"))
+
+        log_futures = log_channel.drain(handler)
+        # 并发数已满时不再启动新的处理循环
+        assert log_channel.drain(handler) == []
+        for future in business_channel.drain(handler):
+            future.result(timeout=2)
+
+        assert handled == ["business"]
+        assert log_channel.get_active_count() == 1
+
+        release.set()
+        for future in log_futures:
+            future.result(timeout=2)
+        assert handled.count("log") == 5
+        assert log_channel.get_metrics()["processed_count"] == 5
+        log_channel.shutdown()
+        business_channel.shutdown()
+
+    def test_configure_while_draining(self, monkeypatch):
+        """测试 drain 提交处理循环时修改并发数，处理循环不会提交到已关闭的线程池"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        from zoo_framework.event import event_channel
+
+        channel = EventChannel("drain_configure", concurrency=2)
+        configured = []
+
+        class ConfigureOnSubmitExecutor(ThreadPoolExecutor):
+            def submit(self, fn, /, *args, **kwargs):
+                # 第一次提交前在另一个线程中修改并发数
+                if not configured:
+                    configured.append(
+                        threading.Thread(target=channel.configure, kwargs={"concurrency": 4})
+                    )
+                    configured[0].start()
+                    configured[0].join(0.2)
+                return super().submit(fn, *args, **kwargs)
+
+        monkeypatch.setattr(event_channel, "ThreadPoolExecutor", ConfigureOnSubmitExecutor)
+
+        handled = []
+        for i in range(5):
+            channel.push_event(EventNode(topic="drain", content=i))
+        for future in channel.drain(lambda node: handled.append(node.content)):
+            future.result(timeout=2)
+        configured[0].join(2)
+
+        assert sorted(handled) == [0, 1, 2, 3, 4]
+        assert channel.concurrency == 4
+        assert channel.get_active_count() == 0
+        channel.shutdown()
+
+
+class TestEventBatch:
+    """事件批量模式测试类"""
+
+    def test_batch_by_size(self):
+        """测试事件数达到 batch_size 时整批交给处理方法"""
+        from zoo_framework.reactor import EventReactor
+
+        batches = []
+        reactor = EventReactor("batch_size_reactor")
+        reactor.set_event_callback(lambda reqs: batches.append([req.content for req in reqs]))
+        reactor.set_batch(3)
+
+        for i in range(7):
+            reactor.submit("batch.insert", i)
+
+        assert batches == [[0, 1, 2], [3, 4, 5]]
+        reactor.flush()
+        assert batches[-1] == [6]
+
+    def test_batch_by_linger(self):
+        """测试逗留超时后由定时器触发批次"""
+        import threading
+
+        from zoo_framework.reactor import EventReactor
+
+        done = threading.Event()
+        batches = []
+
+        def handle_batch(reqs):
+            batches.append([req.content for req in reqs])
+            done.set()
+
+        reactor = EventReactor("batch_linger_reactor")
+        reactor.set_event_callback(handle_batch)
+        reactor.set_batch(100, max_linger_ms=20)
+
+        reactor.submit("batch.insert", "a")
+        reactor.submit("batch.insert", "b")
+        assert done.wait(2)
+        assert batches == [["a", "b"]]
+
+    def test_event_decorator_batch(self):
+        """测试 @event 注册批量处理方法，事件工作者按反应器合并事件"""
+        from zoo_framework.workers import EventWorker
+
+        batches = []
+
+        @event("batch_decorator_event", channel="batch_channel", batch_size=2)
+        def handle_batch(reqs: list[EventReactorReq]):
+            batches.append([req.content for req in reqs])
+
+        channel = EventChannelManager().get_channel("batch_channel")
+        for i in range(4):
+            channel.push_event(
+                EventNode(topic="batch_decorator_event", content=i, channel_name="batch_channel")
+            )
+        for future in channel.drain(EventWorker().handle_event):
+            future.result(timeout=2)
+        assert EventWorker().reactor_executor.join(timeout=2)
+
+        assert [len(batch) for batch in batches] == [2, 2]
+        assert sorted(item for batch in batches for item in batch) == [0, 1, 2, 3]
+
+
+    def test_worker_flushes_partial_batch(self):
+        """测试事件数不足 batch_size 且没有逗留时间时，事件工作者在本轮结束前执行批次"""
+        from zoo_framework.workers import EventWorker
+
+        batches = []
+
+        @event("batch_partial_event", channel="batch_partial_channel", batch_size=10)
+        def handle_batch(reqs: list[EventReactorReq]):
+            batches.append([req.content for req in reqs])
+
+        channel = EventChannelManager().get_channel("batch_partial_channel")
+        for i in range(3):
+            channel.push_event(
+                EventNode(topic="batch_partial_event", content=i, channel_name="batch_partial_channel")
+            )
+        EventWorker()._execute()
+
+        assert sorted(item for batch in batches for item in batch) == [0, 1, 2]
+
+
+class TestAsyncEventChannel:
+    """AsyncEventChannel 测试类"""
+
+    def test_async_handlers_await_concurrently(self):
+        """测试大量协程处理方法在共享事件循环上同时等待，不占用线程"""
+        import asyncio
+        import threading
+
+        from zoo_framework.event import AsyncEventChannel
+
+        count = 2000
+        waiting = []
+        finished = []
+        release = asyncio.Event()
+
+        @event("async_wait_event", channel="async_wait_channel")
+        async def handle_async(req: EventReactorReq):
+            waiting.append(req.content)
+            await release.wait()
+            finished.append(req.content)
+
+        channel = EventChannelManager().configure_channel("async_wait_channel", concurrency=count)
+        assert isinstance(channel, AsyncEventChannel)
+
+        thread_count = threading.active_count()
+        for i in range(count):
+            channel.push_event(
+                EventNode(topic="async_wait_event", content=i, channel_name="async_wait_channel")
+            )
+
+        deadline = time.time() + 5
+        while len(waiting) < count and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(waiting) == count
+        assert channel.get_active_count() == count
+        assert threading.active_count() - thread_count <= 1
+
+        channel._loop_thread.call_soon(release.set)
+        deadline = time.time() + 5
+        while channel.get_metrics()["processed_count"] < count and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(finished) == count
+        assert channel.get_metrics()["processed_count"] == count
+
+    def test_async_channel_priority_and_capacity(self):
+        """测试异步通道按优先级出队和容量限制"""
+        import asyncio
+
+        handled = []
+        release = asyncio.Event()
+
+        @event("async_order_event", channel="async_order_channel")
+        async def handle_order(req: EventReactorReq):
+            handled.append(req.content)
+            await release.wait()
+
+        channel = EventChannelManager().configure_channel(
+            "async_order_channel", capacity=2, concurrency=1
+        )
+
+        def push(content, priority=0):
+            channel.push_event(
+                EventNode(
+                    topic="async_order_event",
+                    content=content,
+                    channel_name="async_order_channel",
+                    priority=priority,
+                )
+            )
+
+        def wait_until(predicate):
+            deadline = time.time() + 2
+            while not predicate() and time.time() < deadline:
+                time.sleep(0.01)
+
+        push("first")
+        wait_until(lambda: channel.get_active_count() == 1)
+        # 消费协程取出 a 后等待并发空位，b 和 c 留在队列中
+        push("a")
+        wait_until(lambda: channel.get_metrics()["popped_count"] == 2)
+        push("b", priority=1)
+        push("c", priority=10)
+        wait_until(lambda: channel.size() == 2)
+        push("d")
+        wait_until(lambda: channel.get_metrics()["rejected_count"] == 1)
+        assert channel.get_metrics()["rejected_count"] == 1
+        assert channel.size() == 2
+
+        channel._loop_thread.call_soon(release.set)
+        wait_until(lambda: len(handled) == 4)
+        assert handled == ["first", "a", "c", "b"]
+
+    def test_async_channel_capacity_concurrent_push(self):
+        """测试多个线程同时入队时，异步通道的队列不超过容量"""
+        import asyncio
+        import threading
+
+        release = asyncio.Event()
+
+        @event("async_capacity_event", channel="async_capacity_channel")
+        async def handle_capacity(req: EventReactorReq):
+            await release.wait()
+
+        channel = EventChannelManager().configure_channel(
+            "async_capacity_channel", capacity=5, concurrency=1
+        )
+
+        def push_many():
+            for i in range(50):
+                channel.push_event(
+                    EventNode(
+                        topic="async_capacity_event",
+                        content=i,
+                        channel_name="async_capacity_channel",
+                    )
+                )
+
+        threads = [threading.Thread(target=push_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        def settled():
+            metrics = channel.get_metrics()
+            return metrics["pushed_count"] + metrics["rejected_count"] == 400
+
+        deadline = time.time() + 2
+        while not settled() and time.time() < deadline:
+            time.sleep(0.01)
+        assert settled()
+        assert channel.size() <= 5
+        assert channel.get_metrics()["capacity"] == 5
+
+        channel._loop_thread.call_soon(release.set)
+
+    def test_async_channel_drop_oldest(self):
+        """测试异步通道按 DROP_OLDEST 策略丢弃事件，不支持 BLOCK 策略"""
+        import asyncio
+
+        import pytest
+
+        from zoo_framework.fifo import BackpressurePolicy
+
+        release = asyncio.Event()
+
+        @event("async_drop_event", channel="async_drop_channel")
+        async def handle_drop(req: EventReactorReq):
+            await release.wait()
+
+        channel = EventChannelManager().configure_channel(
+            "async_drop_channel", capacity=2, concurrency=1, policy=BackpressurePolicy.DROP_OLDEST
+        )
+        for i in range(6):
+            channel.push_event(
+                EventNode(topic="async_drop_event", content=i, channel_name="async_drop_channel")
+            )
+
+        def settled():
+            return channel.get_metrics()["pushed_count"] == 6
+
+        deadline = time.time() + 2
+        while not settled() and time.time() < deadline:
+            time.sleep(0.01)
+        metrics = channel.get_metrics()
+        assert settled()
+        assert metrics["rejected_count"] == 0
+        # 消费协程最多取走两个事件：一个正在处理，一个等待通道的并发空位
+        assert metrics["dropped_count"] >= 2
+        assert channel.size() <= 2
+
+        with pytest.raises(ValueError):
+            channel.configure(policy=BackpressurePolicy.BLOCK)
+        channel._loop_thread.call_soon(release.set)
+
+    def test_sync_execute_async_handler(self):
+        """测试同步路径执行协程处理方法时提交到共享事件循环"""
+        from zoo_framework.reactor import EventReactor
+
+        received = []
+
+        async def handle_async(req):
+            received.append(req.content)
+
+        reactor = EventReactor("async_sync_bridge")
+        reactor.set_event_callback(handle_async)
+        reactor.execute("bridge", "value")
+        assert received == ["value"]
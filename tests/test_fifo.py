@@ -5,8 +5,8 @@
 
 import pytest
 import time
-from zoo_framework.fifo import BaseFIFO, EventFIFO
-from zoo_framework.fifo.node import EventNode
+from zoo_framework.fifo import BaseFIFO, DelayFIFO, EventFIFO, PriorityEventFIFO
+from zoo_framework.fifo.node import DelayFIFONode, EventNode
 from zoo_framework.fifo.node.event_fifo_node import (
     PriorityLevel,
     EventPriorityCalculator,
@@ -16,28 +16,24 @@ from zoo_framework.fifo.node.event_fifo_node import (
 class TestBaseFIFO:
     """BaseFIFO 测试类"""
 
-    def setup_method(self):
-        """每个测试前清理"""
-        BaseFIFO._fifo = []
-
     def test_push_and_pop(self):
         """测试入队和出队"""
         fifo = BaseFIFO()
-        BaseFIFO.push_value("item1")
-        BaseFIFO.push_value("item2")
+        fifo.push_value("item1")
+        fifo.push_value("item2")
         
-        assert BaseFIFO.size() == 2
+        assert fifo.size() == 2
         
-        item = BaseFIFO.pop_value()
+        item = fifo.pop_value()
         assert item == "item1"
-        assert BaseFIFO.size() == 1
+        assert fifo.size() == 1
 
     def test_push_values(self):
         """测试批量入队"""
         fifo = BaseFIFO()
-        BaseFIFO.push_values(["item1", "item2", "item3"])
+        fifo.push_values(["item1", "item2", "item3"])
         
-        assert BaseFIFO.size() == 3
+        assert fifo.size() == 3
 
 
 class TestEventNode:
@@ -148,10 +144,6 @@ class TestEventPriorityCalculator:
 class TestEventFIFO:
     """EventFIFO 测试类"""
 
-    def setup_method(self):
-        """每个测试前清理"""
-        BaseFIFO._fifo = []
-
     def test_push_event_node(self):
         """测试推送 EventNode"""
         fifo = EventFIFO()
@@ -177,6 +169,100 @@ class TestEventFIFO:
         fifo.dispatch("test.topic", "test content")
         assert fifo.size() == 1
         
-        node = BaseFIFO.pop_value()
+        node = fifo.pop_value()
         assert node.topic == "test.topic"
         assert node.content == "test content"
+
+
+class TestPriorityEventFIFO:
+    """PriorityEventFIFO 测试类"""
+
+    def test_critical_jumps_ahead(self):
+        """测试 CRITICAL 事件排在 BACKGROUND 积压之前"""
+        fifo = PriorityEventFIFO()
+        for i in range(100):
+            fifo.push_value(EventNode(f"bg{i}", "content", priority_level=PriorityLevel.BACKGROUND))
+        fifo.push_value(EventNode("critical", "content", priority_level=PriorityLevel.CRITICAL))
+
+        assert fifo.size() == 101
+        assert fifo.get_top().topic == "critical"
+        assert fifo.pop_value().topic == "critical"
+        assert fifo.pop_value().topic == "bg0"
+
+    def test_same_priority_keeps_order(self):
+        """测试同优先级保持先进先出"""
+        fifo = PriorityEventFIFO()
+        for i in range(5):
+            fifo.dispatch(f"topic{i}", "content")
+
+        assert [fifo.pop_value().topic for _ in range(5)] == [f"topic{i}" for i in range(5)]
+        assert fifo.pop_value() is None
+
+    def test_aging(self):
+        """测试等待足够久的低优先级事件会超过新的高优先级事件"""
+        fifo = PriorityEventFIFO()
+        old = EventNode("old", "content", priority=10)
+        old.create_time = time.time() - 300
+        fifo.push_value(old)
+        fifo.push_value(EventNode("new", "content", priority=100))
+
+        assert fifo.pop_value().topic == "old"
+        assert fifo.pop_value().topic == "new"
+
+    def test_has_event_and_replace(self):
+        """测试查找和替换事件"""
+        fifo = PriorityEventFIFO()
+        node = EventNode("topic", "content", priority=1)
+        fifo.push_value(node)
+        fifo.push_value(EventNode("other", "content", priority=5))
+
+        replacement = EventNode("topic", "content", priority=100)
+        assert fifo.has_event(replacement)
+        fifo.replace(replacement)
+
+        assert fifo.size() == 2
+        assert fifo.pop_value() is replacement
+
+
+class TestDelayFIFO:
+    """DelayFIFO 测试类"""
+
+    def test_pop_expired(self):
+        """测试只弹出到期的节点，并按到期时间排序"""
+        fifo = DelayFIFO()
+        now = time.time()
+        fifo.push_value(DelayFIFONode("later", 0, now + 100))
+        fifo.push_value(DelayFIFONode("second", 1, now - 1))
+        fifo.push_value(DelayFIFONode("first", 2, now - 2))
+
+        assert [node.value for node in fifo.get_expire_values(now)] == ["first", "second"]
+        assert fifo.size() == 3
+
+        assert [node.value for node in fifo.pop_expired(now)] == ["first", "second"]
+        assert fifo.size() == 1
+        assert fifo.pop_expired(now) == []
+
+    def test_rearm(self):
+        """测试 loop_times 重复触发"""
+        fifo = DelayFIFO()
+        now = time.time()
+        fifo.push_value(DelayFIFONode("loop", 0, now - 1, loop_times=2, interval=10))
+
+        assert len(fifo.pop_expired(now)) == 1
+        assert fifo.size() == 1
+        assert fifo.get_next_expire_time() == now + 9
+
+        assert len(fifo.pop_expired(now + 10)) == 1
+        assert fifo.size() == 0
+
+    def test_wait_next(self):
+        """测试阻塞等待最早的节点到期"""
+        fifo = DelayFIFO()
+        fifo.push_value(DelayFIFONode("soon", 0, time.time() + 0.05))
+
+        start = time.time()
+        values = fifo.wait_next(timeout=2)
+        assert [node.value for node in values] == ["soon"]
+        assert time.time() - start >= 0.04
+
+        assert fifo.wait_next(timeout=0.01) == []
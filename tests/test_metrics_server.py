@@ -0,0 +1,132 @@
+"""指标端点测试
+
+测试 OpenMetrics 文本生成和 HTTP 抓取
+"""
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from zoo_framework.core.master import SVMWorker
+from zoo_framework.core.metrics_server import MetricFamily, MetricsServer
+from zoo_framework.workers import BaseWorker
+
+
+class PersistentWorker(BaseWorker):
+    """提供持久化指标的 Worker"""
+
+    def __init__(self):
+        BaseWorker.__init__(self, {"name": "PersistentWorker"})
+
+    def get_persistence_metrics(self):
+        return {
+            "save_count": 3,
+            "save_error_count": 1,
+            "last_save_duration": 0.25,
+            "last_save_time": 1700000000.0,
+        }
+
+
+class TestMetricFamily:
+    """MetricFamily 测试类"""
+
+    def test_render(self):
+        """测试 TYPE/HELP/UNIT 行和标签转义"""
+        family = MetricFamily("zoo_test_seconds", "gauge", "Test gauge", "seconds")
+        family.add({"name": 'a"b\\c'}, 1.5)
+        family.add({}, True)
+
+        assert family.render() == [
+            "# TYPE zoo_test_seconds gauge",
+            "# HELP zoo_test_seconds Test gauge",
+            "# UNIT zoo_test_seconds seconds",
+            'zoo_test_seconds{name="a\\"b\\\\c"} 1.5',
+            "zoo_test_seconds 1",
+        ]
+
+
+class TestMetricsServer:
+    """MetricsServer 测试类"""
+
+    def _create_server(self):
+        svm = SVMWorker()
+        svm.register_worker("metrics_worker", BaseWorker({"name": "MetricsWorker"}))
+        svm.record_execute("metrics_worker", 0.2)
+        svm.record_execute("metrics_worker", 0.4, success=False)
+        workers = {"persistent": PersistentWorker()}
+        server = MetricsServer(svm_worker=svm, get_workers=lambda: workers, port=0)
+        return svm, server
+
+    def test_render(self):
+        """测试输出 Worker、持久化指标并以 # EOF 结束"""
+        svm, server = self._create_server()
+        try:
+            text = server.render()
+        finally:
+            svm.stop_monitoring()
+
+        assert text.endswith("# EOF\n")
+        assert 'zoo_worker_executions_total{worker="metrics_worker"} 2' in text
+        assert 'zoo_worker_errors_total{worker="metrics_worker"} 1' in text
+        assert 'zoo_worker_status{worker="metrics_worker",status="running"} 1' in text
+        # summary 的 _count/_sum 是启动以来的累计值，分窗口的分位数单独作为 gauge 输出
+        assert 'zoo_worker_latency_seconds_count{worker="metrics_worker"} 2' in text
+        assert 'zoo_worker_latency_seconds_sum{worker="metrics_worker"} 0.6' in text
+        assert "window=" not in "".join(
+            line for line in text.splitlines() if line.startswith("zoo_worker_latency_seconds")
+        )
+        assert "# TYPE zoo_worker_latency_quantile_seconds gauge" in text
+        assert (
+            'zoo_worker_latency_quantile_seconds{worker="metrics_worker",window="1m",quantile="0.99"}'
+            in text
+        )
+        assert 'zoo_persistence_saves_total{worker="persistent"} 3' in text
+        assert "# TYPE zoo_worker_pool_size gauge" in text
+
+    def test_render_prometheus(self):
+        """测试 Prometheus 0.0.4 文本不含 UNIT 和 # EOF，counter 的 TYPE 使用样本名"""
+        svm, server = self._create_server()
+        try:
+            text = server.render(openmetrics=False)
+        finally:
+            svm.stop_monitoring()
+
+        assert "# EOF" not in text
+        assert "# UNIT" not in text
+        assert "# TYPE zoo_worker_executions_total counter" in text
+        assert 'zoo_worker_executions_total{worker="metrics_worker"} 2' in text
+        assert "# TYPE zoo_worker_latency_seconds summary" in text
+
+    def test_scrape_cached_snapshot(self):
+        """测试抓取返回缓存的快照，刷新后才反映新的指标"""
+        svm, server = self._create_server()
+        port = server.start()
+        try:
+            url = f"http://127.0.0.1:{port}/metrics"
+            request = urllib.request.Request(
+                url, headers={"Accept": "application/openmetrics-text; version=1.0.0"}
+            )
+            with urllib.request.urlopen(request, timeout=5) as response:
+                assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+                body = response.read().decode()
+            assert 'zoo_worker_executions_total{worker="metrics_worker"} 2' in body
+
+            svm.record_execute("metrics_worker", 0.1)
+            with urllib.request.urlopen(request, timeout=5) as response:
+                assert response.read().decode() == body
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                assert response.read() == server.prometheus_snapshot
+
+            server.refresh()
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert 'zoo_worker_executions_total{worker="metrics_worker"} 3' in (
+                    response.read().decode()
+                )
+
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/other", timeout=5)
+        finally:
+            server.stop()
+            svm.stop_monitoring()
@@ -10,7 +10,10 @@ import tempfile
 from zoo_framework.core.persistence_scheduler import (
     PersistenceScheduler,
     FileChecksumValidator,
+    ForkSnapshotter,
+    JsonLinesPersistenceStrategy,
     PicklePersistenceStrategy,
+    StructPersistenceStrategy,
 )
 
 
@@ -91,3 +94,229 @@ class TestPersistenceScheduler:
         
         result = scheduler.load()
         assert result is None
+
+
+class TestFramedPersistenceStrategy:
+    """带文件头的持久化策略测试类"""
+
+    DATA = {
+        "name": "设备",
+        "count": 42,
+        "ratio": 0.5,
+        "enabled": True,
+        "empty": None,
+        "tags": ["a", "b\nc"],
+        "nested": {"level": {"value": -1}},
+    }
+
+    @pytest.fixture(params=["json", "struct", "msgpack"])
+    def strategy(self, request):
+        if request.param == "json":
+            return JsonLinesPersistenceStrategy()
+        if request.param == "struct":
+            return StructPersistenceStrategy()
+        pytest.importorskip("msgpack")
+        from zoo_framework.core.persistence_scheduler import MsgpackPersistenceStrategy
+
+        return MsgpackPersistenceStrategy()
+
+    def test_round_trip(self, strategy, tmp_path):
+        """测试通过调度器保存和加载"""
+        filepath = str(tmp_path / "data.bin")
+        scheduler = PersistenceScheduler(
+            filepath=filepath, strategy=strategy, auto_save_interval=0, enable_backup=False
+        )
+        scheduler.update_data(self.DATA)
+        assert scheduler.save(force=True)
+
+        assert strategy.validate(filepath)
+        loaded = PersistenceScheduler(
+            filepath=filepath, strategy=strategy, auto_save_interval=0, enable_backup=False
+        ).load()
+        assert loaded == self.DATA
+
+    def test_detect_corruption(self, strategy, tmp_path):
+        """测试校验能发现截断和内容损坏"""
+        filepath = str(tmp_path / "data.bin")
+        strategy.save(self.DATA, filepath)
+        with open(filepath, "rb") as f:
+            content = bytearray(f.read())
+
+        with open(filepath, "wb") as f:
+            f.write(content[:-1])
+        assert not strategy.validate(filepath)
+
+        content[-1] ^= 0xFF
+        with open(filepath, "wb") as f:
+            f.write(content)
+        assert not strategy.validate(filepath)
+        assert strategy.load(filepath) is None
+
+    def test_reject_other_encoding(self, tmp_path):
+        """测试不能用其他编码的策略读取"""
+        filepath = str(tmp_path / "data.bin")
+        JsonLinesPersistenceStrategy().save(self.DATA, filepath)
+        assert not StructPersistenceStrategy().validate(filepath)
+        assert not PicklePersistenceStrategy().validate(filepath)
+
+    def test_struct_types(self, tmp_path):
+        """测试 struct 策略保留元组、字节、大整数和非字符串键"""
+        filepath = str(tmp_path / "data.bin")
+        data = {1: (1, 2), (3, "x"): b"\x00\xff", "big": 1 << 80, "neg": -(1 << 70)}
+        strategy = StructPersistenceStrategy()
+        assert strategy.save(data, filepath)
+        assert strategy.load(filepath) == data
+
+
+@pytest.mark.skipif(not ForkSnapshotter.available(), reason="os.fork is not available")
+class TestBackgroundSave:
+    """后台保存测试类"""
+
+    def test_snapshotter(self, tmp_path):
+        """测试子进程写入，完成后调用回调，同一时间只有一个子进程"""
+        import time
+
+        path = tmp_path / "child.txt"
+        results = []
+
+        def save():
+            time.sleep(0.2)
+            path.write_text("saved")
+            return True
+
+        snapshotter = ForkSnapshotter()
+        assert snapshotter.start(save, results.append)
+        assert snapshotter.is_running()
+        assert not snapshotter.start(save)
+        assert snapshotter.wait(5)
+
+        assert results == [True]
+        assert path.read_text() == "saved"
+
+        assert snapshotter.start(lambda: 1 / 0, results.append)
+        assert snapshotter.wait(5)
+        assert results == [True, False]
+
+    def test_snapshotter_timeout(self):
+        """测试超时的子进程被结束，视为失败"""
+        import time
+
+        results = []
+        snapshotter = ForkSnapshotter(timeout=0.1)
+        snapshotter.start(lambda: time.sleep(10), results.append)
+        assert snapshotter.wait(5)
+        assert results == [False]
+
+    def test_fork_reinit_locks(self):
+        """测试 fork 时被其他线程持有的 ThreadSafeDict 锁在子进程中可以使用"""
+        import threading
+
+        from zoo_framework.utils.thread_safe_dict import ThreadSafeDict
+
+        data = ThreadSafeDict()
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with data._lock:
+                locked.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        assert locked.wait(5)
+        results = []
+        snapshotter = ForkSnapshotter(timeout=2)
+        try:
+            assert snapshotter.start(lambda: data.setdefault("key", 1) == 1, results.append)
+            assert snapshotter.wait(5)
+        finally:
+            release.set()
+            holder.join()
+        assert results == [True]
+
+    def test_fork_reinit_striped_and_cow_locks(self):
+        """测试 fork 时被其他线程持有的 StripedThreadSafeDict、CopyOnWriteDict 锁在子进程中可以使用"""
+        import contextlib
+        import threading
+
+        from zoo_framework.utils.thread_safe_dict import CopyOnWriteDict, StripedThreadSafeDict
+
+        striped = StripedThreadSafeDict({"a": 1}, stripes=2)
+        cow = CopyOnWriteDict({"a": 1})
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with contextlib.ExitStack() as stack:
+                for lock in (*striped._locks, cow._lock):
+                    stack.enter_context(lock)
+                locked.set()
+                release.wait(5)
+
+        def save():
+            # copy 逐个分片加锁，持久化时经 __getstate__ 调用
+            return striped.copy() == {"a": 1} and cow.setdefault("b", 2) == 2
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        assert locked.wait(5)
+        results = []
+        snapshotter = ForkSnapshotter(timeout=2)
+        try:
+            assert snapshotter.start(save, results.append)
+            assert snapshotter.wait(5)
+        finally:
+            release.set()
+            holder.join()
+        assert results == [True]
+
+    def test_fork_holds_lock(self):
+        """测试 fork 期间持有数据的修改锁"""
+        import threading
+        import time
+
+        lock = threading.Lock()
+        lock.acquire()
+        released_at = []
+
+        def release():
+            time.sleep(0.1)
+            released_at.append(time.monotonic())
+            lock.release()
+
+        releaser = threading.Thread(target=release)
+        releaser.start()
+        snapshotter = ForkSnapshotter()
+        assert snapshotter.start(lambda: True, lock=lock)
+        started_at = time.monotonic()
+        releaser.join()
+        assert snapshotter.wait(5)
+        assert started_at >= released_at[0]
+        assert not lock.locked()
+
+    def test_scheduler_background_save(self, tmp_path):
+        """测试后台保存 fork 时刻的数据，之后的修改由 flush 保存"""
+        filepath = str(tmp_path / "data.bin")
+        scheduler = PersistenceScheduler(
+            filepath=filepath,
+            strategy=StructPersistenceStrategy(),
+            auto_save_interval=0,
+            enable_backup=False,
+            background_save=True,
+        )
+        data = {"count": 1}
+        scheduler.update_data(data)
+        assert scheduler.save()
+        # 父进程继续修改，不影响子进程中的快照
+        data["count"] = 2
+        scheduler.mark_dirty()
+        scheduler._snapshotter.wait(5)
+
+        strategy = StructPersistenceStrategy()
+        assert strategy.load(filepath) == {"count": 1}
+        assert scheduler.is_dirty()
+
+        assert scheduler.flush()
+        assert strategy.load(filepath) == {"count": 2}
+        assert not scheduler.is_dirty()
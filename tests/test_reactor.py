@@ -3,6 +3,8 @@
 测试事件响应器功能
 """
 
+import time
+
 import pytest
 
 from zoo_framework.reactor.event_reactor_req import (
@@ -132,3 +134,284 @@ class TestChannelManager:
         assert "topic1" in topics
         assert "topic2" in topics
         assert "topic3" in topics
+
+
+class TestEventReactorManagerRouting:
+    """EventReactorManager 路由表测试类"""
+
+    @staticmethod
+    def _make_reactor(name, received):
+        from zoo_framework.reactor import EventReactor
+
+        reactor = EventReactor(name)
+        reactor.set_event_callback(lambda req: received.append((req.reactor_name, req.content)))
+        return reactor
+
+    def test_dispatch_by_channel(self):
+        """测试按通道分发只执行监听该通道的响应器"""
+        from zoo_framework.reactor import EventReactorManager
+
+        received = []
+        manager = EventReactorManager()
+        manager.bind_topic_reactor("routing.order", self._make_reactor("routing_default", received))
+        manager.bind_topic_reactor("routing.order", self._make_reactor("routing_business", received))
+        manager.register_reactor_channels("routing_business", [ChannelType.BUSINESS.value])
+
+        manager.dispatch_by_channel("routing.order", "paid", ChannelType.BUSINESS.value)
+        assert received == [("routing_business", "paid")]
+
+        received.clear()
+        manager.dispatch_by_channel("routing.order", "created")
+        assert received == [("routing_default", "created")]
+
+        assert manager.get_routes("routing.unknown", ChannelType.BUSINESS.value) == ()
+
+    def test_routing_rebuilt_on_channel_change(self):
+        """测试直接修改通道管理器后路由表自动重建"""
+        from zoo_framework.reactor import EventReactorManager
+        from zoo_framework.reactor.event_reactor_req import get_channel_manager
+
+        received = []
+        manager = EventReactorManager()
+        manager.bind_topic_reactor("routing.log", self._make_reactor("routing_log", received))
+        assert len(manager.get_routes("routing.log", ChannelType.DEFAULT.value)) == 1
+
+        get_channel_manager().register_reactor_channels("routing_log", [ChannelType.LOG.value])
+        assert manager.get_routes("routing.log", ChannelType.DEFAULT.value) == ()
+        assert len(manager.get_routes("routing.log", ChannelType.LOG.value)) == 1
+        assert manager.get_reactor("routing.log", ["routing_log"], ChannelType.LOG.value)
+
+
+class TestTopicTrie:
+    """TopicTrie 测试类"""
+
+    def test_wildcard_match(self):
+        """测试 * 和 # 通配符匹配"""
+        from zoo_framework.reactor import TopicTrie
+
+        trie = TopicTrie()
+        trie.insert("sensor.*.temp", "single")
+        trie.insert("sensor.#", "multi")
+        trie.insert("sensor.kitchen.temp", "exact")
+        trie.insert("#", "all")
+
+        assert trie.match("sensor.kitchen.temp") == ["single", "multi", "exact", "all"]
+        assert trie.match("sensor.kitchen.humidity") == ["multi", "all"]
+        assert trie.match("sensor") == ["multi", "all"]
+        assert trie.match("device.kitchen.temp") == ["all"]
+        assert len(trie) == 4
+
+    def test_invalid_multi_level_wildcard(self):
+        """测试 # 不在最后一层时报错"""
+        from zoo_framework.reactor import TopicTrie
+
+        with pytest.raises(ValueError):
+            TopicTrie().insert("sensor.#.temp", "invalid")
+
+    def test_manager_wildcard_routes(self):
+        """测试响应器管理器按通配订阅分发事件"""
+        from zoo_framework.reactor import EventReactor, EventReactorManager
+
+        received = []
+        reactor = EventReactor("wildcard_temp")
+        reactor.set_event_callback(lambda req: received.append(req.content))
+
+        manager = EventReactorManager()
+        manager.bind_topic_reactor("wildcard.*.temp", reactor)
+
+        manager.dispatch_by_channel("wildcard.kitchen.temp", 21)
+        manager.dispatch_by_channel("wildcard.kitchen.humidity", 40)
+        assert received == [21]
+        assert manager.get_reactor("wildcard.bedroom.temp") == [reactor]
+        # 重复匹配命中缓存
+        assert manager.get_routes("wildcard.kitchen.temp") is manager.get_routes(
+            "wildcard.kitchen.temp"
+        )
+
+    def test_overlapping_wildcards_dispatch_once(self):
+        """测试同一个响应器订阅多个重叠的通配主题时，每个事件只执行一次"""
+        from zoo_framework.reactor import EventReactor, EventReactorManager
+
+        received = []
+        reactor = EventReactor("overlap_sensor")
+        reactor.set_event_callback(lambda req: received.append(req.content))
+
+        manager = EventReactorManager()
+        manager.bind_topic_reactor("overlap.*", reactor)
+        manager.bind_topic_reactor("overlap.#", reactor)
+
+        assert manager.get_routes("overlap.kitchen") == (reactor,)
+        manager.dispatch_by_channel("overlap.kitchen", 21)
+        assert received == [21]
+
+    def test_match_cache_concurrent_eviction(self, monkeypatch):
+        """测试多个线程同时匹配不同主题时，缓存淘汰不出错且不超过上限"""
+        import threading
+
+        from zoo_framework.reactor import EventReactor, EventReactorManager
+
+        manager = EventReactorManager()
+        manager.bind_topic_reactor("evict.*.temp", EventReactor("evict_temp"))
+        monkeypatch.setattr(type(manager), "MATCH_CACHE_SIZE", 8)
+        errors = []
+
+        def match(worker_id):
+            try:
+                for i in range(2000):
+                    manager.get_routes(f"evict.{worker_id}_{i}.temp")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=match, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(type(manager)._match_cache) <= 8
+
+
+class TestReactorExecutor:
+    """反应器执行器测试类"""
+
+    @staticmethod
+    def _make_reactor(name, max_concurrency=0):
+        from zoo_framework.reactor import EventReactor
+
+        reactor = EventReactor(name)
+        reactor.set_max_concurrency(max_concurrency)
+        return reactor
+
+    def test_base_executor_is_abstract(self):
+        """测试没有实现 _start 的执行器不能实例化"""
+        from zoo_framework.reactor.reactor_executor import BaseReactorExecutor
+
+        with pytest.raises(TypeError):
+            BaseReactorExecutor()
+
+    def test_inline_executor(self):
+        """测试 inline 模式在调用线程中执行"""
+        import threading
+
+        from zoo_framework.reactor import create_reactor_executor
+
+        executor = create_reactor_executor("inline")
+        future = executor.submit(self._make_reactor("inline"), threading.get_ident)
+        assert future.done()
+        assert future.result() == threading.get_ident()
+        assert executor.in_flight() == 0
+
+    def test_thread_executor_overlaps(self):
+        """测试 thread 模式下阻塞的反应器重叠执行，join 等待全部完成"""
+        import time
+
+        from zoo_framework.reactor import create_reactor_executor
+
+        executor = create_reactor_executor("thread", max_workers=4, max_in_flight=4)
+        reactors = [self._make_reactor(f"io_{i}") for i in range(4)]
+
+        start = time.monotonic()
+        for reactor in reactors:
+            executor.submit(reactor, time.sleep, 0.2)
+        assert executor.join(timeout=2) is True
+        assert time.monotonic() - start < 0.6
+        assert executor.in_flight() == 0
+        executor.shutdown()
+
+    def test_reactor_concurrency_cap(self):
+        """测试每个反应器的并发上限和 join 超时"""
+        import threading
+
+        from zoo_framework.reactor import ReactorExecutorFullError, create_reactor_executor
+
+        executor = create_reactor_executor("thread", max_workers=4, submit_timeout=0.05)
+        reactor = self._make_reactor("capped", max_concurrency=1)
+        release = threading.Event()
+
+        executor.submit(reactor, release.wait, 2)
+        with pytest.raises(ReactorExecutorFullError):
+            executor.submit(reactor, release.wait, 2)
+        # 其他反应器不受影响
+        executor.submit(self._make_reactor("other"), lambda: None).result(timeout=1)
+
+        assert executor.join(timeout=0.05) is False
+        release.set()
+        assert executor.join(timeout=2) is True
+        executor.shutdown()
+
+    def test_asyncio_executor(self):
+        """测试 asyncio 模式执行协程和同步函数"""
+        import asyncio
+
+        from zoo_framework.reactor import create_reactor_executor
+
+        async def handle_async(value):
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        executor = create_reactor_executor("asyncio", max_workers=2)
+        reactor = self._make_reactor("asyncio")
+        assert executor.submit(reactor, handle_async, 2).result(timeout=2) == 4
+        assert executor.submit(reactor, lambda value: value + 1, 2).result(timeout=2) == 3
+        assert executor.join(timeout=2) is True
+        executor.shutdown()
+
+    def test_asyncio_executor_awaits_async_reactor(self):
+        """测试 asyncio 模式下事件工作者直接 await 协程处理方法，等待中的处理方法不占用线程"""
+        import asyncio
+
+        from zoo_framework.fifo.node import EventNode
+        from zoo_framework.reactor import EventReactor, EventReactorManager, create_reactor_executor
+        from zoo_framework.utils.loop_thread import get_event_loop_thread
+        from zoo_framework.workers import EventWorker
+
+        waiting = []
+        release = asyncio.Event()
+
+        async def handle_async(req):
+            waiting.append(req.content)
+            await release.wait()
+
+        reactor = EventReactor("asyncio_native")
+        reactor.set_event_callback(handle_async)
+        EventReactorManager().bind_topic_reactor("asyncio_native_event", reactor)
+
+        worker = EventWorker()
+        # 只有一个线程，同步执行时两个处理方法不能同时等待
+        executor = create_reactor_executor("asyncio", max_workers=1)
+        previous, worker._reactor_executor = worker._reactor_executor, executor
+        loop_thread = get_event_loop_thread()
+        try:
+            for i in range(2):
+                worker.handle_event(EventNode(topic="asyncio_native_event", content=i))
+            deadline = time.monotonic() + 2
+            while len(waiting) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert sorted(waiting) == [0, 1]
+        finally:
+            loop_thread.call_soon(release.set)
+            assert executor.join(timeout=2) is True
+            worker._reactor_executor = previous
+            executor.shutdown()
+
+        # 关闭执行器不会停止共享事件循环
+        assert loop_thread.is_running()
+
+
+class TestReactorLatency:
+    """反应器耗时统计测试类"""
+
+    def test_reactor_latency(self):
+        """测试反应器执行后记录耗时"""
+        from zoo_framework.reactor import EventReactor, EventReactorManager
+
+        reactor = EventReactor("latency_recorder")
+        reactor.set_event_callback(lambda _req: time.sleep(0.01))
+        EventReactorManager().bind_topic_reactor("latency_topic", reactor)
+
+        reactor.execute("latency_topic", {})
+
+        latency = EventReactorManager().get_reactor_latency()[reactor.reactor_name]
+        assert latency["1m"]["count"] == 1
+        assert latency["1m"]["max"] >= 0.01
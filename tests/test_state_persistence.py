@@ -0,0 +1,540 @@
+"""状态机持久化测试
+
+测试预写日志、增量保存和加载回放，以及内存映射快照
+"""
+
+import os
+
+import pytest
+
+from zoo_framework.params import StateMachineParams
+from zoo_framework.statemachine import StateMachineManager
+from zoo_framework.statemachine.state_snapshot import MmapSnapshotPersistenceStrategy
+from zoo_framework.statemachine.state_wal import WAL_OP_REMOVE, WAL_OP_SET, StateWriteAheadLog
+
+
+def new_manager():
+    """创建独立于全局单例的状态机管理器"""
+    return type(StateMachineManager())()
+
+
+@pytest.fixture
+def state_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "states.pic")
+    monkeypatch.setattr(StateMachineParams, "PICKLE_PATH", path)
+    monkeypatch.setattr(StateMachineParams, "STORAGE_MODE", "single")
+    monkeypatch.setattr(StateMachineParams, "WAL_ENABLE", True)
+    monkeypatch.setattr(StateMachineParams, "WAL_FSYNC_INTERVAL", 0)
+    return path
+
+
+def run_worker(monkeypatch, manager):
+    """用指定的管理器执行一次 StateMachineWorker"""
+    from zoo_framework.workers import state_machine_work
+
+    monkeypatch.setattr(state_machine_work, "StateMachineManager", lambda: manager)
+    worker = state_machine_work.StateMachineWorker()
+    worker._execute()
+    return worker
+
+
+class TestStateWriteAheadLog:
+    """StateWriteAheadLog 测试类"""
+
+    def test_append_and_replay(self, tmp_path):
+        """测试追加的记录按顺序回放"""
+        wal = StateWriteAheadLog(str(tmp_path / "states.wal"), fsync_interval=0)
+        wal.append(WAL_OP_SET, "scope", "scope.a", 1)
+        wal.append(WAL_OP_REMOVE, "scope", "scope.a")
+        wal.close()
+
+        assert list(wal.replay()) == [
+            (WAL_OP_SET, "scope", "scope.a", 1),
+            (WAL_OP_REMOVE, "scope", "scope.a", None),
+        ]
+
+    def test_stop_at_torn_frame(self, tmp_path):
+        """测试回放在没有写完的最后一帧处停止"""
+        path = str(tmp_path / "states.wal")
+        wal = StateWriteAheadLog(path, fsync_interval=0)
+        wal.append(WAL_OP_SET, "scope", "scope.a", 1)
+        wal.append(WAL_OP_SET, "scope", "scope.b", 2)
+        wal.close()
+
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 3)
+
+        assert list(wal.replay()) == [(WAL_OP_SET, "scope", "scope.a", 1)]
+
+    def test_append_after_torn_frame(self, tmp_path):
+        """测试回放截断残帧，之后追加的记录在下一次回放中不会丢失"""
+        path = str(tmp_path / "states.wal")
+        wal = StateWriteAheadLog(path, fsync_interval=0)
+        wal.append(WAL_OP_SET, "scope", "scope.a", 1)
+        wal.close()
+
+        # 压缩后的第一次追加没有写完
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 3)
+
+        assert list(wal.replay()) == []
+        assert os.path.getsize(path) == 0
+        wal.append(WAL_OP_SET, "scope", "scope.b", 2)
+        wal.close()
+
+        assert list(wal.replay()) == [(WAL_OP_SET, "scope", "scope.b", 2)]
+
+    def test_rotate(self, tmp_path):
+        """测试轮转后旧日志先于新日志回放，删除后只剩新日志"""
+        wal = StateWriteAheadLog(str(tmp_path / "states.wal"), fsync_interval=0)
+        wal.append(WAL_OP_SET, "scope", "scope.a", 1)
+        wal.rotate()
+        wal.append(WAL_OP_SET, "scope", "scope.a", 2)
+
+        assert [record[3] for record in wal.replay()] == [1, 2]
+        wal.discard_old()
+        assert [record[3] for record in wal.replay()] == [2]
+        wal.close()
+
+
+    def test_unpicklable_value(self, tmp_path):
+        """测试无法序列化的值记录错误后跳过，不向调用方抛出"""
+        wal = StateWriteAheadLog(str(tmp_path / "states.wal"), fsync_interval=0)
+        wal.append(WAL_OP_SET, "scope", "scope.a", lambda: None)
+        wal.append(WAL_OP_SET, "scope", "scope.b", 2)
+        wal.close()
+
+        assert wal.error_count == 1
+        assert list(wal.replay()) == [(WAL_OP_SET, "scope", "scope.b", 2)]
+
+    def test_sync_thread(self, tmp_path, monkeypatch):
+        """测试同步线程在 fsync_interval 后写入磁盘，fsync 期间不阻塞追加"""
+        import threading
+        import time
+
+        wal = StateWriteAheadLog(str(tmp_path / "states.wal"), fsync_interval=0.05)
+        fsync_threads = []
+        fsyncing = threading.Event()
+        release = threading.Event()
+        real_fsync = os.fsync
+
+        def slow_fsync(fd):
+            fsync_threads.append(threading.current_thread().name)
+            fsyncing.set()
+            release.wait(2)
+            real_fsync(fd)
+
+        monkeypatch.setattr(os, "fsync", slow_fsync)
+        try:
+            wal.append(WAL_OP_SET, "scope", "scope.a", 1)
+            assert fsyncing.wait(2)
+
+            # fsync 进行中仍可以追加
+            start = time.monotonic()
+            wal.append(WAL_OP_SET, "scope", "scope.b", 2)
+            assert time.monotonic() - start < 1
+        finally:
+            release.set()
+        wal.close()
+
+        assert fsync_threads[0] == "StateWALSync"
+        assert [record[2] for record in wal.replay()] == ["scope.a", "scope.b"]
+
+
+class TestStateMachineWal:
+    """StateMachineWorker 增量持久化测试类"""
+
+    def test_save_only_changes(self, state_path, monkeypatch):
+        """测试周期保存只写预写日志，不重写快照"""
+        manager = new_manager()
+        worker = run_worker(monkeypatch, manager)
+
+        manager.set_state("wal", "wal.count", 1)
+        manager.set_state("wal", "wal.name", "zoo")
+        worker._execute()
+
+        assert not os.path.exists(state_path)
+        assert worker._wal.record_count == 2
+        worker._wal.close()
+
+    def test_set_during_scope_removal(self):
+        """测试移除作用域与 set_state 并发时，内存中的状态与修改记录的回放结果一致"""
+        import threading
+
+        manager = new_manager()
+        manager.set_state("race", "race.value", 1)
+        mutations = []
+        manager.add_mutation_listener(lambda *args: mutations.append(args))
+
+        get_and_create_scope = manager.get_and_create_scope
+        remover = threading.Thread(target=manager.remove_state, args=("race", "race"))
+
+        def get_scope_then_remove(scope):
+            state_scope = get_and_create_scope(scope)
+            # 获取作用域之后，其他线程移除整个作用域
+            remover.start()
+            remover.join(0.2)
+            return state_scope
+
+        manager.get_and_create_scope = get_scope_then_remove
+        manager.set_state("race", "race.value", 2)
+        remover.join(2)
+
+        replayed = new_manager()
+        for op, scope, key, value in mutations:
+            if op == WAL_OP_SET:
+                replayed.set_state(scope, key, value)
+            else:
+                replayed.remove_state(scope, key)
+        assert manager.get_state("race", "race.value") == replayed.get_state("race", "race.value")
+
+    def test_replay_on_load(self, state_path, monkeypatch):
+        """测试重启后回放预写日志并压缩为快照"""
+        manager = new_manager()
+        worker = run_worker(monkeypatch, manager)
+        manager.set_state("wal", "wal.count", 1)
+        manager.set_state("wal", "wal.count", 2)
+        manager.set_state("wal", "wal.temp", 3)
+        manager.remove_state("wal", "wal.temp")
+        # 模拟崩溃：不压缩，只关闭文件
+        worker._wal.close()
+
+        restored = new_manager()
+        worker = run_worker(monkeypatch, restored)
+
+        assert restored.get_state("wal", "wal.count") == 2
+        assert restored.get_state("wal", "wal.temp") is None
+        assert os.path.exists(state_path)
+        assert not os.path.exists(state_path + ".wal.old")
+        assert worker._wal.record_count == 0
+        worker._wal.close()
+
+    def test_compact(self, state_path, monkeypatch):
+        """测试日志超过阈值后压缩为快照"""
+        monkeypatch.setattr(StateMachineParams, "WAL_COMPACT_SIZE", 1)
+        manager = new_manager()
+        worker = run_worker(monkeypatch, manager)
+        manager.set_state("wal", "wal.count", 1)
+        worker._execute()
+
+        assert os.path.exists(state_path)
+        assert worker._wal.size == 0
+        worker._wal.close()
+
+
+class TestStateScopeStore:
+    """按作用域分文件存储测试类"""
+
+    @pytest.fixture
+    def scope_path(self, state_path, monkeypatch):
+        monkeypatch.setattr(StateMachineParams, "STORAGE_MODE", "scope")
+        monkeypatch.setattr(StateMachineParams, "WAL_ENABLE", False)
+        return state_path + ".scopes"
+
+    def test_dirty_flag(self):
+        """测试修改作用域后标记为已修改"""
+        from zoo_framework.statemachine.state_scope import StateScope
+
+        scope = StateScope()
+        assert scope.is_dirty() is False
+        scope.set_state_node("a.b", 1)
+        assert scope.is_dirty() is True
+        scope.mark_clean()
+        scope.remove_state_node("a.b")
+        assert scope.is_dirty() is True
+
+    def test_write_only_dirty_scopes(self, scope_path, monkeypatch):
+        """测试只写入修改过的作用域，每个作用域一个文件"""
+        manager = new_manager()
+        worker = run_worker(monkeypatch, manager)
+        manager.set_state("first", "first.value", 1)
+        manager.set_state("second", "second.value", 2)
+        worker._execute()
+
+        store = worker._scope_store
+        assert sorted(store.scope_names()) == ["first", "second"]
+        second_mtime = os.stat(store.path_for("second")).st_mtime_ns
+
+        manager.set_state("first", "first.value", 3)
+        worker._execute()
+        assert os.stat(store.path_for("second")).st_mtime_ns == second_mtime
+        assert not manager.get_and_create_scope("first").is_dirty()
+
+        manager.remove_state("second", "second")
+        worker._execute()
+        assert store.scope_names() == ["first"]
+        store.shutdown()
+
+    def test_write_copy_of_scope(self, tmp_path):
+        """测试写入线程序列化的是保存开始时的副本，写入期间的修改在下次保存时写入"""
+        import threading
+
+        from zoo_framework.statemachine.state_scope import StateScope
+        from zoo_framework.statemachine.state_scope_store import StateScopeStore
+
+        scope = StateScope()
+        scope.set_state_node("scope.a", 1)
+        store = StateScopeStore(str(tmp_path / "scopes"))
+        write = store._write
+
+        def write_while_mutating(name, state_scope):
+            scope.set_state_node("scope.b", 2)
+            write(name, state_scope)
+
+        store._write = write_while_mutating
+        try:
+            assert store.save({"scope": scope}, lock=threading.RLock())
+        finally:
+            store.shutdown()
+
+        saved = store.load("scope")
+        assert saved.get_state_node("scope.a").get_value() == 1
+        assert saved.get_state_node("scope.b") is None
+        assert scope.is_dirty() is True
+
+    def test_lazy_load(self, scope_path, monkeypatch):
+        """测试重启后作用域在第一次访问时才加载"""
+        manager = new_manager()
+        worker = run_worker(monkeypatch, manager)
+        for i in range(20):
+            manager.set_state(f"scope{i}", f"scope{i}.value", i)
+        worker._execute()
+        worker._scope_store.shutdown()
+
+        restored = new_manager()
+        worker = run_worker(monkeypatch, restored)
+        assert len(restored.get_state_machines()) == 0
+
+        assert restored.get_state("scope7", "scope7.value") == 7
+        assert list(restored.get_state_machines().keys()) == ["scope7"]
+        assert restored.get_state("missing", "missing.value") is None
+        worker._scope_store.shutdown()
+
+    def test_removed_scope_not_reloaded(self, scope_path, monkeypatch):
+        """测试移除的作用域在文件删除前不会从过时的文件重新加载"""
+        manager = new_manager()
+        worker = run_worker(monkeypatch, manager)
+        manager.set_state("a", "x", 1)
+        worker._execute()
+        assert worker._scope_store.scope_names() == ["a"]
+
+        manager.remove_state("a", "x")
+        assert manager.get_state("a", "x") is None
+        worker._execute()
+        assert worker._scope_store.scope_names() == []
+        assert manager.get_state("a", "x") is None
+        worker._scope_store.shutdown()
+
+    def test_recreated_scope_drops_removed_keys(self, scope_path, monkeypatch):
+        """测试移除后重新创建的作用域不会合并旧的键，也不会写回磁盘"""
+        manager = new_manager()
+        worker = run_worker(monkeypatch, manager)
+        manager.set_state("a", "x", 1)
+        worker._execute()
+
+        manager.remove_state("a", "x")
+        manager.set_state("a", "y", 2)
+        assert manager.get_state("a", "x") is None
+        worker._execute()
+        worker._scope_store.shutdown()
+
+        restored = new_manager()
+        worker = run_worker(monkeypatch, restored)
+        assert restored.get_state("a", "x") is None
+        assert restored.get_state("a", "y") == 2
+        worker._scope_store.shutdown()
+
+    def test_migrate_single_file(self, scope_path, state_path, monkeypatch):
+        """测试从单文件迁移到按作用域分文件"""
+        monkeypatch.setattr(StateMachineParams, "STORAGE_MODE", "single")
+        manager = new_manager()
+        worker = run_worker(monkeypatch, manager)
+        manager.set_state("legacy", "legacy.value", 1)
+        worker._execute()
+        assert os.path.exists(state_path)
+
+        monkeypatch.setattr(StateMachineParams, "STORAGE_MODE", "scope")
+        restored = new_manager()
+        worker = run_worker(monkeypatch, restored)
+        assert worker._scope_store.scope_names() == ["legacy"]
+        assert restored.get_state("legacy", "legacy.value") == 1
+        worker._scope_store.shutdown()
+
+
+class TestMmapSnapshot:
+    """内存映射快照测试类"""
+
+    @staticmethod
+    def build_scopes():
+        manager = new_manager()
+        manager.load_state_machines()
+        manager.set_state("device", "device.name", "sensor")
+        manager.set_state("device", "device.config.rate", 10)
+        manager.set_state("device", "device.config.tags", ["a", "b"])
+        manager.set_state("任务", "任务.状态", "运行")
+        return manager.get_state_machines()
+
+    def test_lazy_load(self, tmp_path):
+        """测试加载时不反序列化节点，访问时只加载用到的节点"""
+        path = str(tmp_path / "states.snap")
+        strategy = MmapSnapshotPersistenceStrategy()
+        assert strategy.save(self.build_scopes(), path)
+        assert strategy.validate(path)
+
+        scopes = strategy.load(path)
+        device = scopes["device"]
+        assert device.get_loaded_nodes() == {}
+
+        assert device.get_state_value("device.name") == "sensor"
+        assert list(device.get_loaded_nodes()) == ["device.name"]
+
+        assert device.get_state_value("device.config") == {
+            "device.config.rate": 10,
+            "device.config.tags": ["a", "b"],
+        }
+        assert device.get_state_node("device").is_top()
+        assert device.get_state_value("device.missing") is None
+        assert scopes["任务"].get_state_value("任务.状态") == "运行"
+
+    def test_resave_partially_loaded(self, tmp_path):
+        """测试部分加载后再次保存，未加载的节点原样写入"""
+        path = str(tmp_path / "states.snap")
+        strategy = MmapSnapshotPersistenceStrategy()
+        strategy.save(self.build_scopes(), path)
+
+        scopes = strategy.load(path)
+        device = scopes["device"]
+        version = device.get_state_node("device.name").get_version()
+        device.set_state_node("device.config.rate", 20)
+        assert strategy.save(scopes, path)
+
+        restored = strategy.load(path)["device"]
+        assert restored.get_state_value("device.config.rate") == 20
+        assert restored.get_state_value("device.config.tags") == ["a", "b"]
+        assert restored.get_state_node("device.name").get_version() == version
+        assert set(restored.get_all_nodes()) == {
+            "device",
+            "device.name",
+            "device.config",
+            "device.config.rate",
+            "device.config.tags",
+        }
+        assert restored.get_snapshot() is None
+
+    def test_validate(self, tmp_path):
+        """测试只检查文件头即可识别截断或非快照文件"""
+        path = str(tmp_path / "states.snap")
+        strategy = MmapSnapshotPersistenceStrategy()
+        strategy.save(self.build_scopes(), path)
+        with open(path, "rb") as f:
+            content = f.read()
+
+        with open(path, "wb") as f:
+            f.write(content[:-1])
+        assert not strategy.validate(path)
+        assert strategy.load(path) is None
+
+        with open(path, "wb") as f:
+            f.write(b"not a snapshot")
+        assert not strategy.validate(path)
+
+    def test_pickle_snapshot_scope(self, tmp_path):
+        """测试由快照支持的作用域可以深拷贝"""
+        import copy
+
+        path = str(tmp_path / "states.snap")
+        strategy = MmapSnapshotPersistenceStrategy()
+        strategy.save(self.build_scopes(), path)
+
+        device = copy.deepcopy(strategy.load(path)["device"])
+        assert device.get_snapshot() is None
+        assert device.get_state_value("device.config.rate") == 10
+
+    def test_worker_mmap_mode(self, state_path, monkeypatch):
+        """测试 mmap 模式从 pickle 文件迁移，重启后映射快照"""
+        monkeypatch.setattr(StateMachineParams, "WAL_ENABLE", False)
+        manager = new_manager()
+        worker = run_worker(monkeypatch, manager)
+        manager.set_state("scope", "scope.value", 1)
+        worker._execute()
+
+        monkeypatch.setattr(StateMachineParams, "STORAGE_MODE", "mmap")
+        migrated = new_manager()
+        worker = run_worker(monkeypatch, migrated)
+        assert migrated.get_state("scope", "scope.value") == 1
+        worker._execute()
+        assert MmapSnapshotPersistenceStrategy().validate(state_path)
+
+        restored = new_manager()
+        run_worker(monkeypatch, restored)
+        scope = restored.get_state_machines()["scope"]
+        assert scope.get_snapshot() is not None
+        assert restored.get_state("scope", "scope.value") == 1
+
+    def test_mmap_unavailable(self, state_path, monkeypatch):
+        """测试不支持替换映射文件的平台拒绝保存快照，状态机按 single 保存"""
+        import pickle
+
+        monkeypatch.setattr(
+            MmapSnapshotPersistenceStrategy, "available", staticmethod(lambda: False)
+        )
+        assert not MmapSnapshotPersistenceStrategy().save(self.build_scopes(), state_path)
+
+        monkeypatch.setattr(StateMachineParams, "WAL_ENABLE", False)
+        monkeypatch.setattr(StateMachineParams, "STORAGE_MODE", "mmap")
+        manager = new_manager()
+        worker = run_worker(monkeypatch, manager)
+        manager.set_state("scope", "scope.value", 1)
+        worker._execute()
+
+        assert not MmapSnapshotPersistenceStrategy().validate(state_path)
+        with open(state_path, "rb") as f:
+            assert pickle.load(f)["scope"].get_state_value("scope.value") == 1
+
+    def test_collect_copies_nodes_under_lock(self, tmp_path):
+        """测试保存时在快照锁内复制已加载的节点"""
+        import threading
+
+        path = str(tmp_path / "states.snap")
+        strategy = MmapSnapshotPersistenceStrategy()
+        strategy.save(self.build_scopes(), path)
+        device = strategy.load(path)["device"]
+        device.get_state_node("device.name")
+
+        collected = []
+        with device._snapshot_lock:
+            collector = threading.Thread(
+                target=lambda: collected.append(strategy._collect(device))
+            )
+            collector.start()
+            collector.join(0.1)
+            # 节点正在从快照加载时等待加载完成
+            assert collected == []
+        collector.join(2)
+
+        keys = [key.decode("utf-8") for key, _ in collected[0]]
+        assert keys == sorted(keys)
+        assert "device.name" in keys and "device.config.rate" in keys
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork is not available")
+class TestStateMachineBackgroundSave:
+    """状态机后台保存测试类"""
+
+    def test_background_compact(self, state_path, monkeypatch):
+        """测试在子进程中压缩预写日志，完成后才删除旧日志"""
+        monkeypatch.setattr(StateMachineParams, "BACKGROUND_SAVE", True)
+        manager = new_manager()
+        worker = run_worker(monkeypatch, manager)
+        assert worker._snapshotter is not None
+
+        manager.set_state("scope", "scope.value", 1)
+        worker._compact(manager)
+        assert worker._snapshotter.wait(5)
+        assert os.path.exists(state_path)
+        assert not os.path.exists(worker._wal.old_path)
+        assert worker.get_persistence_metrics()["save_count"] == 1
+
+        restored = new_manager()
+        run_worker(monkeypatch, restored)
+        assert restored.get_state("scope", "scope.value") == 1
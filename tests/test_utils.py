@@ -191,3 +191,155 @@ class TestThreadSafeDict:
 
         items = d.items()
         assert ("key", "value") in items
+
+
+    def test_thread_safe_dict_instance_lock(self):
+        """测试每个实例使用自己的锁，一个字典被锁住时其他字典不受影响"""
+        first, second = ThreadSafeDict(), ThreadSafeDict()
+        assert first._lock is not second._lock
+
+        with first._lock:
+            second["key"] = "value"
+            # 读取不加锁
+            assert first.get("missing") is None
+        assert second["key"] == "value"
+
+    def test_thread_safe_dict_pickle(self):
+        """测试 pickle 和深拷贝时丢弃锁并重建"""
+        import copy
+        import pickle
+
+        d = ThreadSafeDict()
+        d["key"] = [1, 2]
+        copied = pickle.loads(pickle.dumps(d))
+        assert copied.items() == [("key", [1, 2])]
+        assert copied._lock is not d._lock
+        assert copy.deepcopy(d)["key"] == [1, 2]
+
+    def test_striped_dict_concurrent_writes(self):
+        """测试分片字典并发写入和遍历"""
+        import threading
+
+        from zoo_framework.utils.thread_safe_dict import StripedThreadSafeDict
+
+        d = StripedThreadSafeDict(stripes=4)
+
+        def write(offset):
+            for i in range(1000):
+                d[offset + i] = i
+
+        threads = [threading.Thread(target=write, args=(n * 1000,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(d) == 8000
+        assert sorted(d.keys()) == list(range(8000))
+        assert d.pop(5) == 5
+        assert d.pop(5, None) is None
+        assert d.setdefault("new", 1) == 1
+        assert "new" in d
+
+class TestCopyOnWriteDict:
+    """CopyOnWriteDict 测试类"""
+
+    def test_snapshot_isolation(self):
+        """测试读取到的快照不受之后写入的影响"""
+        from zoo_framework.utils.thread_safe_dict import CopyOnWriteDict
+
+        d = CopyOnWriteDict({"a": 1})
+        snapshot = d.snapshot()
+        keys = d.keys()
+
+        d["b"] = 2
+        del d["a"]
+
+        assert dict(snapshot) == {"a": 1}
+        assert list(keys) == ["a"]
+        assert d.copy() == {"b": 2}
+        with pytest.raises(TypeError):
+            snapshot["c"] = 3
+
+    def test_read_without_copy(self):
+        """测试连续读取返回同一份数据，不复制"""
+        from collections.abc import KeysView, ValuesView
+
+        from zoo_framework.utils.thread_safe_dict import CopyOnWriteDict
+
+        d = CopyOnWriteDict({"a": 1})
+        assert isinstance(d.get_keys(), KeysView)
+        assert isinstance(d.get_values(), ValuesView)
+        assert d.get_values().mapping == d.snapshot()
+
+    def test_update_value(self):
+        """测试并发 update_value 不丢失写入"""
+        import threading
+
+        from zoo_framework.utils.thread_safe_dict import CopyOnWriteDict
+
+        d = CopyOnWriteDict()
+
+        def append(n):
+            for i in range(200):
+                d.update_value("items", lambda items, v=(n, i): (*items, v), ())
+
+        threads = [threading.Thread(target=append, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(d["items"]) == 800
+        assert d.setdefault("items", ()) is d["items"]
+        assert d.pop("missing", None) is None
+
+class TestLatencyHistogram:
+    """LatencyHistogram 测试类"""
+
+    def test_percentiles(self):
+        """测试分位数的相对误差在分桶精度内"""
+        from zoo_framework.utils.latency_histogram import LatencyHistogram
+
+        histogram = LatencyHistogram()
+        for i in range(1, 10001):
+            histogram.record(i / 10000)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 10000
+        assert abs(snapshot["p50"] - 0.5) <= 0.5 / 16
+        assert abs(snapshot["p99"] - 0.99) <= 0.99 / 16
+        assert abs(snapshot["p999"] - 0.999) <= 0.999 / 16
+        assert snapshot["max"] == 1.0
+
+    def test_merge(self):
+        """测试合并后与直接记录全部数据的结果相同"""
+        from zoo_framework.utils.latency_histogram import LatencyHistogram
+
+        left, right, whole = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i in range(1000):
+            (left if i % 2 else right).record(i / 1000)
+            whole.record(i / 1000)
+
+        merged = LatencyHistogram().merge(left).merge(right)
+        snapshot, expected = merged.snapshot(), whole.snapshot()
+        assert snapshot.pop("mean") == pytest.approx(expected.pop("mean"))
+        assert snapshot == expected
+
+    def test_sliding_window(self):
+        """测试超出窗口的槽不计入统计"""
+        from zoo_framework.utils.latency_histogram import WindowedHistogram
+
+        histogram = WindowedHistogram(slot_seconds=15, max_window=900)
+        histogram.record(5.0, now=0)
+        histogram.record(0.01, now=600)
+
+        assert histogram.window(60, now=610).count == 1
+        assert histogram.window(60, now=610).max == 0.01
+        assert histogram.window(900, now=610).count == 2
+        assert histogram.window(None).count == 2
+
+        # 环形复用的槽会先清空旧数据
+        histogram.record(0.02, now=915)
+        assert histogram.window(900, now=915).count == 2
+        assert histogram.snapshot(now=915)["1m"]["max"] == 0.02
@@ -0,0 +1,512 @@
+"""Waiter 测试
+
+测试 Waiter 的调度与唤醒机制
+"""
+
+import threading
+import time
+
+from zoo_framework.core.waiter import SimpleWaiter, WorkerTimer
+from zoo_framework.workers import BaseWorker
+
+
+class TestWaiterWakeup:
+    """Waiter 唤醒机制测试类"""
+
+    def test_wakeup_on_worker_done(self):
+        """测试 Worker 执行完成后唤醒调度循环"""
+        waiter = SimpleWaiter()
+        wakeups = []
+        waiter.add_wakeup_listener(lambda: wakeups.append(time.time()))
+
+        worker = BaseWorker({"name": "WakeupWorker"})
+        waiter.call_workers([worker])
+        waiter.execute_service()
+
+        deadline = time.time() + 2
+        while not wakeups and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert len(wakeups) >= 1
+        assert waiter.worker_props.get(worker.name) is None
+
+    def test_wakeup_on_add_worker(self):
+        """测试新增 Worker 时唤醒调度循环"""
+        waiter = SimpleWaiter()
+        wakeups = []
+        waiter.add_wakeup_listener(lambda: wakeups.append(True))
+
+        waiter.add_worker(BaseWorker({"name": "NewWorker"}))
+
+        assert wakeups == [True]
+        waiter._merge_added_workers()
+        assert len(waiter.workers) == 1
+
+    def test_add_worker_during_execute(self):
+        """测试调度循环替换 worker 列表前并发加入的 Worker 不会丢失"""
+        added = BaseWorker({"name": "ConcurrentWorker", "is_loop": True})
+
+        class RacingWaiter(SimpleWaiter):
+            @property
+            def workers(self):
+                return self._workers
+
+            @workers.setter
+            def workers(self, value):
+                # 模拟其他线程在调度循环替换列表之前加入 worker
+                if getattr(self, "_racing", False):
+                    self._racing = False
+                    self.add_worker(added)
+                self._workers = value
+
+        waiter = RacingWaiter()
+        waiter.call_workers([])
+        waiter._racing = True
+        waiter.execute_service()
+        waiter._merge_added_workers()
+
+        assert added in waiter.workers
+
+    def test_safe_waiter_keeps_added_worker(self):
+        """测试 SafeWaiter 重建 worker 列表后保留新增的 Worker"""
+        from zoo_framework.core.waiter import SafeWaiter
+
+        waiter = SafeWaiter()
+        waiter.call_workers([BaseWorker({"name": "SourceWorker", "is_loop": True})])
+        # 第一次重建后 worker 列表不再是传入的列表
+        waiter.rebuild_worker = True
+        waiter.rebuild_workers()
+
+        worker = BaseWorker({"name": "AddedWorker", "is_loop": True})
+        waiter.add_worker(worker)
+
+        waiter.rebuild_worker = True
+        waiter.rebuild_workers()
+        assert worker in waiter.workers
+
+        waiter.rebuild_worker = True
+        waiter.rebuild_workers()
+        assert [item.name for item in waiter.workers].count(worker.name) == 1
+
+    def test_next_timeout(self):
+        """测试根据运行超时计算下一个截止时间"""
+        waiter = SimpleWaiter()
+        assert waiter.get_next_timeout() is None
+
+        worker = BaseWorker({"name": "TimeoutWorker", "run_timeout": 10})
+        waiter.register_worker(worker, None)
+
+        timeout = waiter.get_next_timeout()
+        assert timeout is not None
+        assert 0 < timeout <= 10
+
+
+class TestWorkerTimer:
+    """WorkerTimer 测试类"""
+
+    def test_schedule_in_deadline_order(self):
+        """测试按截止时间顺序执行"""
+        timer = WorkerTimer()
+        fired = []
+        done = threading.Event()
+
+        timer.schedule(0.05, fired.append, "late")
+        timer.schedule(0.01, fired.append, "early")
+        timer.schedule(0.08, lambda: done.set())
+
+        assert done.wait(2)
+        assert fired == ["early", "late"]
+        timer.stop()
+
+    def test_cancel(self):
+        """测试取消定时任务"""
+        timer = WorkerTimer()
+        fired = []
+        done = threading.Event()
+
+        handle = timer.schedule(0.01, fired.append, "cancelled")
+        handle.cancel()
+        timer.schedule(0.03, lambda: done.set())
+
+        assert done.wait(2)
+        assert fired == []
+        timer.stop()
+
+
+class TestWaiterDelay:
+    """Waiter 延迟调度测试类"""
+
+    def test_delayed_worker_not_redispatched(self):
+        """测试延迟中的 Worker 不会被重复派遣，截止时间到达后唤醒"""
+        waiter = SimpleWaiter()
+        wakeups = []
+        waiter.add_wakeup_listener(lambda: wakeups.append(time.time()))
+
+        worker = BaseWorker({"name": "DelayWorker", "is_loop": True, "delay_time": 0.1})
+        waiter.call_workers([worker])
+        waiter.execute_service()
+
+        deadline = time.time() + 2
+        while not waiter.is_worker_delayed(worker.name) and time.time() < deadline:
+            time.sleep(0.005)
+        assert waiter.is_worker_delayed(worker.name)
+        assert waiter.worker_props.get(worker.name) is None
+
+        # 延迟期间不会被派遣
+        waiter.execute_service()
+        assert waiter.worker_props.get(worker.name) is None
+
+        deadline = time.time() + 2
+        while waiter.is_worker_delayed(worker.name) and time.time() < deadline:
+            time.sleep(0.01)
+        assert not waiter.is_worker_delayed(worker.name)
+        assert len(wakeups) >= 2
+
+
+class CooperativeWorker(BaseWorker):
+    """会检查取消令牌的 Worker"""
+
+    def __init__(self):
+        BaseWorker.__init__(self, {"name": "CooperativeWorker", "run_timeout": 0.05})
+        self.cancelled = threading.Event()
+
+    def _execute(self):
+        while not self.cancel_token.wait(0.01):
+            pass
+        self.cancelled.set()
+
+
+class HungWorker(BaseWorker):
+    """不检查取消令牌的 Worker"""
+
+    def __init__(self):
+        BaseWorker.__init__(self, {"name": "HungWorker", "run_timeout": 0.05})
+        self.finished = threading.Event()
+
+    def _execute(self):
+        try:
+            while True:
+                time.sleep(0.01)
+        finally:
+            self.finished.set()
+
+
+class TestWaiterTimeout:
+    """Waiter 运行超时测试类"""
+
+    def _wait_for(self, predicate, timeout=2):
+        deadline = time.time() + timeout
+        while not predicate() and time.time() < deadline:
+            time.sleep(0.01)
+        return predicate()
+
+    def test_cooperative_cancel(self):
+        """测试超时后通过取消令牌结束协作式 Worker，并按超时记录、发出超时事件"""
+        from zoo_framework.constant import WaiterConstant
+        from zoo_framework.reactor import EventReactor, EventReactorManager
+        from zoo_framework.workers.worker_metrics import OUTCOME_TIMEOUT, get_worker_metrics
+
+        timeouts = []
+        reactor = EventReactor("cooperative_timeout_recorder")
+        reactor.set_event_callback(lambda req: timeouts.append(req.content))
+        EventReactorManager().bind_topic_reactor(WaiterConstant.WORKER_TIMEOUT_TOPIC, reactor)
+
+        metrics = get_worker_metrics()
+        pending = metrics.subscribe()
+
+        waiter = SimpleWaiter()
+        worker = CooperativeWorker()
+        waiter.call_workers([worker])
+        waiter.execute_service()
+
+        time.sleep(0.1)
+        waiter.check_worker_timeouts()
+
+        try:
+            assert worker.cancelled.wait(2)
+            assert self._wait_for(lambda: waiter.worker_props.get(worker.name) is None)
+            assert self._wait_for(lambda: any(item["worker"] == worker.name for item in timeouts))
+            assert any(
+                record.worker_name == worker.name and record.outcome == OUTCOME_TIMEOUT
+                for record in list(pending)
+            )
+        finally:
+            metrics.unsubscribe(pending)
+
+    def test_kill_hung_worker(self):
+        """测试宽限时间后强制中断并释放槽位、发出超时事件"""
+        from zoo_framework.constant import WaiterConstant
+        from zoo_framework.reactor import EventReactor, EventReactorManager
+
+        timeouts = []
+        reactor = EventReactor("timeout_recorder")
+        reactor.set_event_callback(lambda req: timeouts.append(req.content))
+        EventReactorManager().bind_topic_reactor(WaiterConstant.WORKER_TIMEOUT_TOPIC, reactor)
+
+        waiter = SimpleWaiter()
+        waiter.timeout_grace = 0.05
+        worker = HungWorker()
+        waiter.call_workers([worker])
+        waiter.execute_service()
+
+        time.sleep(0.1)
+        waiter.check_worker_timeouts()
+        assert waiter.worker_props.get(worker.name) is not None
+
+        time.sleep(0.1)
+        waiter.check_worker_timeouts()
+
+        assert waiter.worker_props.get(worker.name) is None
+        assert worker.finished.wait(2)
+        assert any(item["worker"] == worker.name for item in timeouts)
+
+    def test_kill_without_thread_keeps_slot(self):
+        """测试不知道 worker 所在线程时不释放槽位，等待下一次检查重试"""
+        from concurrent.futures import Future
+
+        waiter = SimpleWaiter()
+        waiter.timeout_grace = 0.05
+        worker = HungWorker()
+        # 池中已开始执行、尚未回调 start_callback 的 worker
+        future = Future()
+        assert future.set_running_or_notify_cancel()
+        waiter.register_worker(worker, future, 1)
+        worker_prop = waiter.worker_props[worker.name]
+        worker_prop["run_time"] = time.time() - worker.run_timeout - 1
+        worker_prop["cancel_time"] = time.time() - 1
+
+        waiter.check_worker_timeouts()
+
+        assert waiter.worker_props.get(worker.name) is worker_prop
+        assert time.time() - worker_prop["cancel_time"] < 1
+
+
+class SquareWorker(BaseWorker):
+    """CPU 密集型 Worker，在子进程中执行"""
+
+    def __init__(self):
+        BaseWorker.__init__(self, {"name": "SquareWorker"})
+
+    def _execute(self):
+        return sum(i * i for i in range(1000))
+
+
+class TestProcessWaiter:
+    """ProcessWaiter 测试类"""
+
+    def test_worker_pickle(self):
+        """测试 Worker 可以被 pickle，取消令牌在反序列化后重建"""
+        import pickle
+
+        worker = SquareWorker()
+        copied = pickle.loads(pickle.dumps(worker))
+        assert copied.name == worker.name
+        assert copied.cancel_token is not worker.cancel_token
+        assert copied.is_cancelled() is False
+
+    def test_factory(self):
+        """测试通过 runPolicy 选择 ProcessWaiter"""
+        from zoo_framework.core.waiter import ProcessWaiter, WaiterFactory
+
+        assert isinstance(WaiterFactory.get_waiter("process"), ProcessWaiter)
+
+    def test_process_result_dispatch(self):
+        """测试子进程执行结果回到主进程并分发"""
+        from zoo_framework.core.waiter import ProcessWaiter
+        from zoo_framework.reactor import EventReactor, EventReactorManager
+
+        results = []
+        done = threading.Event()
+
+        def _on_result(req):
+            results.append(req.content)
+            done.set()
+
+        reactor = EventReactor("square_result_recorder")
+        reactor.set_event_callback(_on_result)
+        EventReactorManager().bind_topic_reactor("squareworker_result", reactor)
+
+        waiter = ProcessWaiter()
+        worker = SquareWorker()
+        waiter.call_workers([worker])
+        try:
+            waiter.execute_service()
+            assert done.wait(30)
+            assert results == [sum(i * i for i in range(1000))]
+            assert waiter.worker_props.get(worker.name) is None
+        finally:
+            waiter.resource_pool.shutdown(wait=True)
+
+
+    def test_stale_report_ignored(self):
+        """测试超时被释放后才返回的执行不修改当前的派遣时间，也不分发结果"""
+        from concurrent.futures import Future
+
+        from zoo_framework.core.waiter import ProcessWaiter
+        from zoo_framework.reactor import EventReactor, EventReactorManager
+        from zoo_framework.workers import WorkerResult
+
+        results = []
+        reactor = EventReactor("stale_result_recorder")
+        reactor.set_event_callback(lambda req: results.append(req.content))
+        EventReactorManager().bind_topic_reactor("stale_result", reactor)
+
+        waiter = ProcessWaiter()
+        worker = SquareWorker()
+        waiter.register_worker(worker, None, 2)
+        worker.dispatch_time = 123.0
+
+        future = Future()
+        future.set_result(WorkerResult("stale_result", 1, worker.name))
+        waiter.process_report(worker, 1, future)
+
+        assert worker.dispatch_time == 123.0
+        assert waiter.worker_props.get(worker.name) is not None
+        assert results == []
+
+    def test_timeout_is_advisory(self):
+        """测试超时不强制中断子进程中的执行，槽位在执行结束后按超时释放"""
+        from concurrent.futures import Future
+
+        from zoo_framework.core.waiter import ProcessWaiter
+        from zoo_framework.workers import WorkerResult
+        from zoo_framework.workers.worker_metrics import OUTCOME_TIMEOUT, get_worker_metrics
+
+        metrics = get_worker_metrics()
+        pending = metrics.subscribe()
+        waiter = ProcessWaiter()
+        waiter.timeout_grace = 0
+        worker = SquareWorker()
+        future = Future()
+        assert future.set_running_or_notify_cancel()
+        waiter.register_worker(worker, future, 1)
+        waiter.worker_props[worker.name].update(run_time=time.time() - 1, run_timeout=0.01)
+
+        try:
+            waiter.check_worker_timeouts()
+            waiter.check_worker_timeouts()
+            assert waiter.worker_props.get(worker.name) is not None
+            assert waiter.get_next_timeout() is None
+
+            future.set_result(WorkerResult("square_result", 1, worker.name))
+            waiter.process_report(worker, 1, future)
+            assert waiter.worker_props.get(worker.name) is None
+            outcomes = [
+                record.outcome for record in list(pending) if record.worker_name == worker.name
+            ]
+            assert outcomes == [OUTCOME_TIMEOUT]
+        finally:
+            metrics.unsubscribe(pending)
+
+
+class FailingWorker(BaseWorker):
+    """执行时抛出异常的 Worker"""
+
+    def __init__(self):
+        BaseWorker.__init__(self, {"name": "FailingWorker"})
+
+    def _execute(self):
+        raise ValueError("boom")
+
+
+class TestWorkerMetrics:
+    """Worker 运行指标测试类"""
+
+    def test_run_record(self):
+        """测试运行结束后记录耗时、结果和排队时间"""
+        from zoo_framework.workers import get_worker_metrics
+
+        metrics = get_worker_metrics()
+        pending = metrics.subscribe()
+        try:
+            worker = BaseWorker({"name": "RecordWorker"})
+            worker.dispatch_time = time.monotonic() - 0.05
+            result = worker.run()
+            FailingWorker().run()
+        finally:
+            metrics.unsubscribe(pending)
+
+        records = {record.worker_name: record for record in pending}
+        failing_name = FailingWorker().name
+        assert records[worker.name].success
+        assert records[worker.name].queue_wait >= 0.05
+        assert records[worker.name].duration >= 0
+        assert records[failing_name].outcome == "error"
+        assert records[failing_name].queue_wait is None
+        assert result.outcome == "success"
+        assert worker.dispatch_time is None
+
+    def test_svm_collects_records(self):
+        """测试 SVMWorker 自动汇总 Waiter 派遣的运行记录"""
+        from zoo_framework.core.master import SVMWorker
+
+        svm = SVMWorker()
+        worker = BaseWorker({"name": "SvmWorker"})
+        failing = FailingWorker()
+        svm.register_worker("svm_worker", worker)
+        svm.register_worker("failing", failing)
+
+        waiter = SimpleWaiter()
+        waiter.call_workers([worker, failing])
+        try:
+            waiter.execute_service()
+
+            def collected():
+                health = svm.get_all_workers_health()
+                return all(item["execute_count"] == 1 for item in health.values())
+
+            assert TestWaiterTimeout()._wait_for(collected)
+            health = svm.get_worker_health("svm_worker")
+            assert health["last_outcome"] == "success"
+            assert health["pool_size"] == waiter.pool_size
+            assert health["last_queue_wait"] >= 0
+            assert svm.get_worker_health("failing")["error_count"] == 1
+        finally:
+            svm.stop_monitoring()
+
+    def test_timeout_record(self):
+        """测试超时释放的 Worker 按 timeout 记录"""
+        from zoo_framework.core.master import SVMWorker
+
+        svm = SVMWorker()
+        waiter = SimpleWaiter()
+        waiter.timeout_grace = 0.05
+        worker = HungWorker()
+        svm.register_worker(worker.name, worker)
+        waiter.call_workers([worker])
+        try:
+            waiter.execute_service()
+            time.sleep(0.1)
+            waiter.check_worker_timeouts()
+            time.sleep(0.1)
+            waiter.check_worker_timeouts()
+
+            assert worker.finished.wait(2)
+            health = svm.get_worker_health(worker.name)
+            assert health["timeout_count"] == 1
+            assert health["error_rate"] > 0
+        finally:
+            svm.stop_monitoring()
+
+    def test_latency_slo(self):
+        """测试耗时分位数超过 SLO 时健康状态为 warning"""
+        from zoo_framework.core.master import SVMWorker
+
+        svm = SVMWorker()
+        try:
+            svm.register_worker("slow", BaseWorker({"name": "Slow"}))
+            svm.register_worker("fast", BaseWorker({"name": "Fast"}))
+            svm.set_latency_slo("slow", 0.1, percentile=99)
+            svm.set_latency_slo("fast", 0.1, percentile=99)
+            for _ in range(100):
+                svm.record_execute("slow", 0.5)
+                svm.record_execute("fast", 0.01)
+
+            svm._check_workers_health()
+
+            assert svm.get_worker_health("slow")["status"] == "warning"
+            assert svm.get_worker_health("fast")["status"] == "running"
+            assert svm.get_worker_health("slow")["latency"]["1m"]["p99"] >= 0.5 * 15 / 16
+            assert svm.get_aggregate_latency().count == 200
+        finally:
+            svm.stop_monitoring()
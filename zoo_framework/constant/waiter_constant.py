@@ -3,3 +3,6 @@ class WaiterConstant:
     WORKER_MODE_THREAD_POOL = "thread_pool"
     WORKER_MODE_PROCESS = "process"
     WORKER_MODE_PROCESS_POOL = "process_pool"
+
+    # worker 运行超时事件主题
+    WORKER_TIMEOUT_TOPIC = "worker_timeout"
@@ -12,3 +12,4 @@ class WorkerConstant:
     RUN_POLICY_SAFE = "safe"
     RUN_POLICY_SIMPLE = "simple"
     RUN_POLICY_STABLE = "stable"
+    RUN_POLICY_PROCESS = "process"
@@ -1,14 +1,16 @@
-from zoo_framework.utils.thread_safe_dict import ThreadSafeDict
+from zoo_framework.utils.thread_safe_dict import CopyOnWriteDict
 
-# 单例对象注册器
-cage_register_map = ThreadSafeDict()
+# 单例对象注册器，只在第一次创建单例时写入
+cage_register_map = CopyOnWriteDict()
 
 
 def cage(cls):
     def _cage():
         """用于单例模式的装饰器."""
-        if cage_register_map.get(cls.__name__) is None:
-            cage_register_map[cls.__name__] = cls()
-        return cage_register_map[cls.__name__]
+        instance = cage_register_map.get(cls.__name__)
+        if instance is None:
+            # 并发创建时以先写入的实例为准
+            instance = cage_register_map.setdefault(cls.__name__, cls())
+        return instance
 
     return _cage
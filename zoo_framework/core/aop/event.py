@@ -15,6 +15,9 @@ from zoo_framework.reactor.event_retry_strategy import EventRetryStrategy
 #   done_callback: 事件完成后的回调函数，默认为None
 #   error_callback: 事件出错时的回调函数，默认为None
 #   success_callback: 事件成功时的回调函数，默认为None
+#   batch_size: 批量模式每批最多的事件数，大于0时处理函数接收 EventReactorReq 列表，默认为0（关闭）
+#   max_linger_ms: 批量模式下第一个事件最多等待的毫秒数，默认为0（只按数量触发）
+#   max_concurrency: 该反应器同时执行的上限，默认为0（使用执行器的默认值）
 # 返回值：返回一个装饰器函数，用于包装目标函数
 def event(
     topic: str,
@@ -25,6 +28,9 @@ def event(
     done_callback=None,
     error_callback=None,
     success_callback=None,
+    batch_size: int = 0,
+    max_linger_ms: float = 0,
+    max_concurrency: int = 0,
 ):
     # 内部装饰器函数，接收被装饰的目标函数
     def _event(func: callable):
@@ -36,6 +42,8 @@ def event(
         reactor.set_error_callback(error_callback)  # 设置错误回调函数
         reactor.set_success_callback(success_callback)  # 设置成功回调函数
         reactor.set_done_callback(done_callback)  # 设置完成回调函数
+        reactor.set_batch(batch_size, max_linger_ms)  # 设置批量模式
+        reactor.set_max_concurrency(max_concurrency)  # 设置并发上限
 
         # 检查并刷新事件通道，将当前反应器与指定主题和通道关联
         EventChannelManager().refresh_channel(channel, topic, reactor)
@@ -8,13 +8,27 @@ P2 优化：
 """
 
 import asyncio
+import contextlib
 import threading
 from typing import Any
 
 from zoo_framework.utils import LogUtils
+from zoo_framework.utils.latency_histogram import (
+    LATENCY_WINDOWS,
+    LatencyHistogram,
+    WindowedHistogram,
+)
 from zoo_framework.workers import EventWorker, StateMachineWorker
+from zoo_framework.workers.worker_metrics import (
+    OUTCOME_CANCELLED,
+    OUTCOME_ERROR,
+    OUTCOME_SUCCESS,
+    OUTCOME_TIMEOUT,
+    get_worker_metrics,
+)
 
 from .aop import config_funcs
+from .metrics_server import MetricsServer
 from .params_factory import ParamsFactory
 from .worker_registry import get_worker_registry
 
@@ -29,50 +43,164 @@ class SVMWorker:
         self._lock = threading.RLock()
         self._running = False
         self._monitor_thread: threading.Thread | None = None
+        # Worker 运行记录由运行线程无锁追加，统计时在锁内取出
+        self._pending = get_worker_metrics().subscribe()
+        self._subscribed = True
+        # id(worker) -> 注册名，注册名可以和 worker.name 不同
+        self._names_by_id: dict[int, str] = {}
+        # 每个 Worker 的执行耗时直方图
+        self._latency: dict[str, WindowedHistogram] = {}
+        # 延迟 SLO：注册名 -> (阈值秒数, 百分位, 窗口名称)
+        self._latency_slos: dict[str, tuple[float, float, str]] = {}
 
     def register_worker(self, name: str, worker: Any) -> None:
         """注册 Worker 到 SVM 管理."""
         with self._lock:
             self._workers[name] = worker
+            self._names_by_id[id(worker)] = name
             self._metrics[name] = {
                 "execute_count": 0,
                 "error_count": 0,
+                "cancelled_count": 0,
+                "timeout_count": 0,
                 "total_execute_time": 0.0,
                 "last_execute_time": 0.0,
+                "queue_wait_count": 0,
+                "total_queue_wait": 0.0,
+                "last_queue_wait": 0.0,
+                "last_outcome": None,
+                "pool_active": 0,
+                "pool_size": 0,
                 "status": "running",
             }
+            self._latency[name] = WindowedHistogram()
             LogUtils.info(f"✅ Worker '{name}' registered to SVM")
 
     def unregister_worker(self, name: str) -> None:
         """从 SVM 管理移除 Worker."""
         with self._lock:
-            self._workers.pop(name, None)
+            worker = self._workers.pop(name, None)
+            if worker is not None:
+                self._names_by_id.pop(id(worker), None)
             self._metrics.pop(name, None)
+            self._latency.pop(name, None)
+            self._latency_slos.pop(name, None)
             LogUtils.info(f"🗑️ Worker '{name}' unregistered from SVM")
 
     def record_execute(self, name: str, duration: float, success: bool = True) -> None:
         """记录 Worker 执行指标."""
         with self._lock:
-            if name not in self._metrics:
-                return
+            self._apply(name, duration, OUTCOME_SUCCESS if success else OUTCOME_ERROR)
 
-            metrics = self._metrics[name]
-            metrics["execute_count"] += 1
-            metrics["total_execute_time"] += duration
-            metrics["last_execute_time"] = duration
+    def _apply(
+        self,
+        name: str,
+        duration: float,
+        outcome: str,
+        queue_wait: float | None = None,
+        pool_active: int | None = None,
+        pool_size: int | None = None,
+        finished_at: float | None = None,
+    ) -> None:
+        """把一次运行计入指标，调用方持有锁."""
+        metrics = self._metrics.get(name)
+        if metrics is None:
+            return
+        self._latency[name].record(duration, finished_at)
+
+        metrics["execute_count"] += 1
+        metrics["total_execute_time"] += duration
+        metrics["last_execute_time"] = duration
+        metrics["last_outcome"] = outcome
+
+        if outcome == OUTCOME_ERROR:
+            metrics["error_count"] += 1
+        elif outcome == OUTCOME_CANCELLED:
+            metrics["cancelled_count"] += 1
+        elif outcome == OUTCOME_TIMEOUT:
+            metrics["timeout_count"] += 1
+
+        if queue_wait is not None:
+            metrics["queue_wait_count"] += 1
+            metrics["total_queue_wait"] += queue_wait
+            metrics["last_queue_wait"] = queue_wait
+        if pool_active is not None:
+            metrics["pool_active"] = pool_active
+        if pool_size is not None:
+            metrics["pool_size"] = pool_size
+
+    def _collect(self) -> None:
+        """取出 Worker 运行记录并计入指标，调用方持有锁."""
+        pending = self._pending
+        while pending:
+            try:
+                record = pending.popleft()
+            except IndexError:
+                break
+            name = self._names_by_id.get(record.worker_id, record.worker_name)
+            self._apply(
+                name,
+                record.duration,
+                record.outcome,
+                record.queue_wait,
+                record.pool_active,
+                record.pool_size,
+                record.finished_at,
+            )
+
+    def set_latency_slo(
+        self, name: str, threshold: float, percentile: float = 99.0, window: str = "1m"
+    ) -> None:
+        """设置 Worker 的延迟 SLO，健康检查时窗口内的分位数超过阈值会被标记.
+
+        Args:
+            name: Worker 注册名
+            threshold: 耗时阈值（秒）
+            percentile: 百分位，例如 99.9
+            window: 窗口名称：1m / 5m / 15m
+        """
+        if window not in LATENCY_WINDOWS:
+            raise ValueError(f"Unknown latency window: {window}")
+        with self._lock:
+            self._latency_slos[name] = (threshold, percentile, window)
 
-            if not success:
-                metrics["error_count"] += 1
+    def get_worker_latency(self, name: str, window: str | None = "1m") -> LatencyHistogram:
+        """获取 Worker 在窗口内的耗时直方图.
+
+        Args:
+            name: Worker 注册名
+            window: 窗口名称，None 表示启动以来的全部记录
+        """
+        with self._lock:
+            self._collect()
+            histogram = self._latency.get(name)
+        seconds = None if window is None else LATENCY_WINDOWS[window]
+        if histogram is None:
+            return LatencyHistogram()
+        return histogram.window(seconds)
+
+    def get_aggregate_latency(self, window: str | None = "1m") -> LatencyHistogram:
+        """合并所有 Worker 在窗口内的耗时直方图."""
+        with self._lock:
+            self._collect()
+            histograms = list(self._latency.values())
+        seconds = None if window is None else LATENCY_WINDOWS[window]
+        merged = LatencyHistogram()
+        for histogram in histograms:
+            merged.merge(histogram.window(seconds))
+        return merged
 
     def get_worker_health(self, name: str) -> dict:
         """获取 Worker 健康状态."""
         with self._lock:
+            self._collect()
             if name not in self._metrics:
                 return {"status": "unknown"}
 
             metrics = self._metrics[name]
             execute_count = metrics["execute_count"]
-            error_count = metrics["error_count"]
+            # 超时也计为失败
+            error_count = metrics["error_count"] + metrics["timeout_count"]
 
             if execute_count == 0:
                 health_score = 100
@@ -81,20 +209,33 @@ class SVMWorker:
                 health_score = max(0, int((1 - error_rate) * 100))
 
             avg_time = metrics["total_execute_time"] / execute_count if execute_count > 0 else 0
+            queue_wait_count = metrics["queue_wait_count"]
+            avg_queue_wait = (
+                metrics["total_queue_wait"] / queue_wait_count if queue_wait_count > 0 else 0
+            )
 
             return {
                 "status": metrics["status"],
                 "health_score": health_score,
                 "execute_count": execute_count,
-                "error_count": error_count,
+                "error_count": metrics["error_count"],
+                "cancelled_count": metrics["cancelled_count"],
+                "timeout_count": metrics["timeout_count"],
                 "error_rate": error_count / execute_count if execute_count > 0 else 0,
                 "avg_execute_time": avg_time,
                 "last_execute_time": metrics["last_execute_time"],
+                "avg_queue_wait": avg_queue_wait,
+                "last_queue_wait": metrics["last_queue_wait"],
+                "last_outcome": metrics["last_outcome"],
+                "pool_active": metrics["pool_active"],
+                "pool_size": metrics["pool_size"],
+                "latency": self._latency[name].snapshot(),
             }
 
     def get_all_workers_health(self) -> dict[str, dict]:
         """获取所有 Worker 健康状态."""
         with self._lock:
+            self._collect()
             return {name: self.get_worker_health(name) for name in self._workers}
 
     def start_monitoring(self) -> None:
@@ -103,6 +244,9 @@ class SVMWorker:
             return
 
         self._running = True
+        if not self._subscribed:
+            self._pending = get_worker_metrics().subscribe()
+            self._subscribed = True
         self._monitor_thread = threading.Thread(target=self._monitor_loop)
         self._monitor_thread.daemon = True
         self._monitor_thread.start()
@@ -113,6 +257,8 @@ class SVMWorker:
         self._running = False
         if self._monitor_thread:
             self._monitor_thread.join(timeout=5)
+        get_worker_metrics().unsubscribe(self._pending)
+        self._subscribed = False
         LogUtils.info("🛑 SVM monitoring stopped")
 
     def _monitor_loop(self) -> None:
@@ -130,9 +276,10 @@ class SVMWorker:
     def _check_workers_health(self) -> None:
         """检查所有 Worker 健康状态."""
         with self._lock:
+            self._collect()
             for name, metrics in self._metrics.items():
                 execute_count = metrics["execute_count"]
-                error_count = metrics["error_count"]
+                error_count = metrics["error_count"] + metrics["timeout_count"]
 
                 if execute_count == 0:
                     continue
@@ -145,9 +292,21 @@ class SVMWorker:
                 elif error_rate > 0.2 and execute_count > 10:
                     metrics["status"] = "warning"
                     LogUtils.warning(f"⚠️ Worker '{name}' has warnings")
+                elif self._is_latency_slo_breached(name):
+                    metrics["status"] = "warning"
+                    LogUtils.warning(f"⚠️ Worker '{name}' breaches latency SLO")
                 else:
                     metrics["status"] = "running"
 
+    def _is_latency_slo_breached(self, name: str) -> bool:
+        """窗口内的耗时分位数是否超过 SLO 阈值，调用方持有锁."""
+        slo = self._latency_slos.get(name)
+        if slo is None:
+            return False
+        threshold, percentile, window = slo
+        histogram = self._latency[name].window(LATENCY_WINDOWS[window])
+        return histogram.count > 0 and histogram.percentile(percentile) > threshold
+
 
 class MasterConfig:
     """Master 配置类.
@@ -161,11 +320,16 @@ class MasterConfig:
         enable_svm: bool = True,
         svm_check_interval: int = 10,
         auto_save_interval: int = 60,
+        metrics_port: int | None = None,
+        metrics_host: str = "127.0.0.1",
     ):
         self.config_path = config_path
         self.enable_svm = enable_svm
         self.svm_check_interval = svm_check_interval
         self.auto_save_interval = auto_save_interval
+        # 指标端点端口，None 表示不启动
+        self.metrics_port = metrics_port
+        self.metrics_host = metrics_host
 
 
 class Master:
@@ -181,6 +345,7 @@ class Master:
         config: Master 配置
         worker_registry: Worker 注册表
         svm_worker: SVM 监控 Worker
+        metrics_server: 指标端点，未启用时为 None
         waiter: Waiter 调度器
     """
 
@@ -210,6 +375,14 @@ class Master:
         if self.svm_worker:
             self._setup_svm()
 
+        # 指标端点
+        self.metrics_server: MetricsServer | None = None
+        if self.config.metrics_port is not None:
+            self.start_metrics_server(self.config.metrics_port, self.config.metrics_host)
+
+        # 主循环唤醒事件，在 perform 中创建
+        self._wakeup_event: asyncio.Event | None = None
+
         # 创建 Waiter
         self._create_waiter()
 
@@ -243,6 +416,25 @@ class Master:
         self.svm_worker.start_monitoring()
         LogUtils.info("✅ SVM Worker setup completed")
 
+    def start_metrics_server(self, port: int = 9464, host: str = "127.0.0.1") -> int:
+        """启动 Prometheus / OpenMetrics 指标端点.
+
+        Args:
+            port: 监听端口，0 表示由系统分配
+            host: 监听地址
+
+        Returns:
+            实际监听的端口
+        """
+        if self.metrics_server is None:
+            self.metrics_server = MetricsServer(
+                svm_worker=self.svm_worker,
+                get_workers=self.worker_registry.get_all_workers,
+                host=host,
+                port=port,
+            )
+        return self.metrics_server.start()
+
     def _create_waiter(self) -> None:
         """创建 Waiter."""
         from zoo_framework.core.waiter import WaiterFactory
@@ -277,18 +469,42 @@ class Master:
         """
         self.worker_registry.register_class(name, worker_class, metadata)
 
+        worker = self.worker_registry.get_worker(name)
+
         # 如果 SVM 已启用，注册到 SVM
-        if self.svm_worker:
-            worker = self.worker_registry.get_worker(name)
-            if worker:
-                self.svm_worker.register_worker(name, worker)
+        if self.svm_worker and worker:
+            self.svm_worker.register_worker(name, worker)
+
+        # 交给 Waiter 调度，并唤醒主循环立即派遣
+        if worker and self.waiter is not None:
+            self.waiter.add_worker(worker)
 
     async def perform(self) -> None:
-        """执行任务主循环."""
-        while True:
-            self.waiter.execute_service()
-            # P2 优化：使用配置中的间隔
-            await asyncio.sleep(1)
+        """执行任务主循环.
+
+        不再固定间隔轮询：Worker 完成、新 Worker 注册时由 Waiter 唤醒，
+        存在超时截止时间时在截止时间到达时唤醒，空闲时不占用 CPU。
+        """
+        loop = asyncio.get_running_loop()
+        self._wakeup_event = asyncio.Event()
+
+        def _wakeup() -> None:
+            # Waiter 的回调来自 Worker 线程，需要线程安全地切换到事件循环
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._wakeup_event.set)
+
+        self.waiter.add_wakeup_listener(_wakeup)
+        try:
+            while True:
+                self._wakeup_event.clear()
+                self.waiter.execute_service()
+
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._wakeup_event.wait(), self.waiter.get_next_timeout()
+                    )
+        finally:
+            self.waiter.remove_wakeup_listener(_wakeup)
 
     def run(self) -> None:
         """运行 Master."""
@@ -310,6 +526,9 @@ class Master:
         if self.svm_worker:
             self.svm_worker.stop_monitoring()
 
+        if self.metrics_server:
+            self.metrics_server.stop()
+
         LogUtils.info("👋 Master stopped")
 
     def get_health_report(self) -> dict[str, dict]:
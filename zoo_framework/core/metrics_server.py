@@ -0,0 +1,409 @@
+"""Prometheus / OpenMetrics 指标端点.
+
+在守护线程中运行标准库 http.server，按 Accept 头以 OpenMetrics 或 Prometheus 0.0.4
+文本格式输出 Worker、事件通道、反应器和持久化指标。指标文本由刷新线程按固定间隔生成并整体替换，
+抓取请求只读取缓存好的快照，不会进入 Worker、通道等运行路径上的锁。
+"""
+
+import threading
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from zoo_framework.utils import LogUtils
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class MetricFamily:
+    """一个指标族：TYPE、HELP 和若干样本."""
+
+    def __init__(self, name: str, metric_type: str, documentation: str, unit: str = ""):
+        self.name = name
+        self.metric_type = metric_type
+        self.documentation = documentation
+        self.unit = unit
+        self._samples: list[str] = []
+
+    def add(self, labels: dict, value: Any, suffix: str = "") -> "MetricFamily":
+        """加入一个样本.
+
+        Args:
+            labels: 标签
+            value: 样本值
+            suffix: 样本名后缀，例如 _total、_count、_sum
+        """
+        label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+        if label_text:
+            label_text = "{" + label_text + "}"
+        self._samples.append(f"{self.name}{suffix}{label_text} {_format_value(value)}")
+        return self
+
+    def render(self, openmetrics: bool = True) -> list[str]:
+        """生成指标族的文本行.
+
+        Args:
+            openmetrics: True 时按 OpenMetrics 输出；False 时按 Prometheus 0.0.4 文本格式输出，
+                不输出 UNIT 行，counter 的 TYPE/HELP 使用带 _total 的样本名
+
+        Returns:
+            文本行
+        """
+        name = self.name
+        if not openmetrics and self.metric_type == "counter":
+            name += "_total"
+        lines = [
+            f"# TYPE {name} {self.metric_type}",
+            f"# HELP {name} {_escape(self.documentation)}",
+        ]
+        if openmetrics and self.unit:
+            lines.append(f"# UNIT {name} {self.unit}")
+        return lines + self._samples
+
+
+class MetricsServer:
+    """指标 HTTP 端点.
+
+    GET /metrics 返回最近一次生成的指标快照，其他路径返回 404
+    """
+
+    def __init__(
+        self,
+        svm_worker=None,
+        get_workers: Callable[[], dict[str, Any]] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 9464,
+        refresh_interval: float = 5.0,
+    ):
+        """初始化指标端点.
+
+        Args:
+            svm_worker: SVMWorker，提供 Worker 运行指标，为 None 时不输出
+            get_workers: 获取 Worker 的函数，实现了 get_persistence_metrics 的 Worker
+                会输出持久化指标
+            host: 监听地址
+            port: 监听端口，0 表示由系统分配
+            refresh_interval: 指标快照的刷新间隔（秒）
+        """
+        self.svm_worker = svm_worker
+        self.get_workers = get_workers
+        self.host = host
+        self.port = port
+        self.refresh_interval = refresh_interval
+
+        # (OpenMetrics 文本, Prometheus 0.0.4 文本)，整体替换
+        self._snapshots = (b"# EOF\n", b"")
+        self._server: ThreadingHTTPServer | None = None
+        self._threads: list[threading.Thread] = []
+        self._stop_event = threading.Event()
+
+    @property
+    def snapshot(self) -> bytes:
+        """最近一次生成的 OpenMetrics 指标文本."""
+        return self._snapshots[0]
+
+    @property
+    def prometheus_snapshot(self) -> bytes:
+        """最近一次生成的 Prometheus 0.0.4 指标文本."""
+        return self._snapshots[1]
+
+    def start(self) -> int:
+        """启动刷新线程和 HTTP 服务.
+
+        Returns:
+            实际监听的端口
+        """
+        if self._server is not None:
+            return self.port
+
+        self.refresh()
+        self._stop_event.clear()
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True),
+            threading.Thread(target=self._refresh_loop, name="MetricsRefresh", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        LogUtils.info(f"📈 Metrics server listening on {self.host}:{self.port}")
+        return self.port
+
+    def stop(self) -> None:
+        """停止 HTTP 服务和刷新线程."""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        self._stop_event.set()
+        server.shutdown()
+        server.server_close()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        LogUtils.info("🛑 Metrics server stopped")
+
+    def _refresh_loop(self) -> None:
+        while not self._stop_event.wait(self.refresh_interval):
+            self.refresh()
+
+    def refresh(self) -> None:
+        """重新生成指标快照."""
+        try:
+            families = self._collect()
+            self._snapshots = (
+                self._render(families, openmetrics=True).encode("utf-8"),
+                self._render(families, openmetrics=False).encode("utf-8"),
+            )
+        except Exception as e:
+            LogUtils.error(f"❌ Render metrics failed: {e}", MetricsServer.__name__)
+
+    def render(self, openmetrics: bool = True) -> str:
+        """生成指标文本.
+
+        Args:
+            openmetrics: True 时生成以 # EOF 结尾的 OpenMetrics 文本，
+                False 时生成 Prometheus 0.0.4 文本
+
+        Returns:
+            指标文本
+        """
+        return self._render(self._collect(), openmetrics)
+
+    def _collect(self) -> list[MetricFamily]:
+        return [
+            *self._collect_workers(),
+            *self._collect_pool(),
+            *self._collect_channels(),
+            *self._collect_reactors(),
+            *self._collect_persistence(),
+        ]
+
+    @staticmethod
+    def _render(families: list[MetricFamily], openmetrics: bool) -> str:
+        lines = []
+        for family in families:
+            lines.extend(family.render(openmetrics))
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    @staticmethod
+    def _latency_families(name: str, documentation: str) -> tuple[MetricFamily, MetricFamily]:
+        """创建延迟的 summary 指标族和分窗口分位数的 gauge 指标族."""
+        return (
+            MetricFamily(name, "summary", documentation, "seconds"),
+            MetricFamily(
+                name.removesuffix("_seconds") + "_quantile_seconds",
+                "gauge",
+                f"{documentation} quantiles per sliding window",
+                "seconds",
+            ),
+        )
+
+    @staticmethod
+    def _add_latency(
+        summary: MetricFamily, quantiles: MetricFamily, labels: dict, latency: dict, total
+    ) -> None:
+        """加入延迟指标.
+
+        summary 的 _count/_sum 取自启动以来的直方图，只增不减；
+        滑动窗口的分位数会随窗口滑动变小，作为 gauge 输出
+
+        Args:
+            summary: summary 指标族
+            quantiles: 分位数 gauge 指标族
+            labels: 标签
+            latency: 窗口名称 -> 统计快照
+            total: 启动以来的 LatencyHistogram
+        """
+        from zoo_framework.utils.latency_histogram import LATENCY_PERCENTILES
+
+        summary.add(labels, total.count, "_count")
+        summary.add(labels, total.total, "_sum")
+        for window, snapshot in latency.items():
+            window_labels = {**labels, "window": window}
+            for name, percent in LATENCY_PERCENTILES.items():
+                quantiles.add({**window_labels, "quantile": percent / 100}, snapshot[name])
+
+    def _collect_workers(self) -> list[MetricFamily]:
+        if self.svm_worker is None:
+            return []
+
+        counters = {
+            "execute_count": ("zoo_worker_executions", "Worker runs"),
+            "error_count": ("zoo_worker_errors", "Worker runs that raised"),
+            "cancelled_count": ("zoo_worker_cancellations", "Worker runs cancelled"),
+            "timeout_count": ("zoo_worker_timeouts", "Worker runs released on timeout"),
+        }
+        families = {
+            key: MetricFamily(name, "counter", doc) for key, (name, doc) in counters.items()
+        }
+        health_score = MetricFamily("zoo_worker_health_score", "gauge", "Worker health score")
+        status = MetricFamily("zoo_worker_status", "gauge", "Worker health status, 1 if current")
+        queue_wait = MetricFamily(
+            "zoo_worker_queue_wait_seconds",
+            "gauge",
+            "Average wait from dispatch to start",
+            "seconds",
+        )
+        latency, latency_quantiles = self._latency_families(
+            "zoo_worker_latency_seconds", "Worker run duration"
+        )
+
+        for name, health in self.svm_worker.get_all_workers_health().items():
+            labels = {"worker": name}
+            for key, family in families.items():
+                family.add(labels, health[key], "_total")
+            health_score.add(labels, health["health_score"])
+            for state in ("running", "warning", "unhealthy"):
+                status.add({**labels, "status": state}, health["status"] == state)
+            queue_wait.add(labels, health["avg_queue_wait"])
+            self._add_latency(
+                latency,
+                latency_quantiles,
+                labels,
+                health["latency"],
+                self.svm_worker.get_worker_latency(name, None),
+            )
+
+        return [
+            *families.values(),
+            health_score,
+            status,
+            queue_wait,
+            latency,
+            latency_quantiles,
+        ]
+
+    @staticmethod
+    def _collect_pool() -> list[MetricFamily]:
+        from zoo_framework.workers import get_worker_metrics
+
+        worker_metrics = get_worker_metrics()
+        return [
+            MetricFamily("zoo_worker_pool_active", "gauge", "Workers running in the pool").add(
+                {}, worker_metrics.pool_active
+            ),
+            MetricFamily("zoo_worker_pool_size", "gauge", "Worker pool size").add(
+                {}, worker_metrics.pool_size
+            ),
+        ]
+
+    @staticmethod
+    def _collect_channels() -> list[MetricFamily]:
+        from zoo_framework.event.event_channel_manager import EventChannelManager
+
+        counters = {
+            "pushed_count": ("zoo_event_channel_pushed", "Events pushed"),
+            "rejected_count": ("zoo_event_channel_rejected", "Events rejected when full"),
+            "dropped_count": ("zoo_event_channel_dropped", "Events dropped by backpressure"),
+            "popped_count": ("zoo_event_channel_popped", "Events popped"),
+            "processed_count": ("zoo_event_channel_processed", "Events processed"),
+            "error_count": ("zoo_event_channel_errors", "Events failed"),
+        }
+        gauges = {
+            "size": ("zoo_event_channel_size", "Events queued"),
+            "capacity": ("zoo_event_channel_capacity", "Queue capacity, 0 means unbounded"),
+            "active": ("zoo_event_channel_active", "Drain loops or handlers running"),
+            "concurrency": ("zoo_event_channel_concurrency", "Channel concurrency limit"),
+        }
+        families = {
+            key: MetricFamily(name, "counter", doc) for key, (name, doc) in counters.items()
+        }
+        families.update(
+            {key: MetricFamily(name, "gauge", doc) for key, (name, doc) in gauges.items()}
+        )
+
+        for name, metrics in EventChannelManager().get_channel_metrics().items():
+            labels = {"channel": name}
+            for key, family in families.items():
+                suffix = "_total" if family.metric_type == "counter" else ""
+                family.add(labels, metrics.get(key, 0), suffix)
+        return list(families.values())
+
+    def _collect_reactors(self) -> list[MetricFamily]:
+        from zoo_framework.reactor import EventReactorManager
+
+        latency, latency_quantiles = self._latency_families(
+            "zoo_reactor_latency_seconds", "Reactor handling duration"
+        )
+        manager = EventReactorManager()
+        totals = manager.get_reactor_total_latency()
+        for name, snapshot in manager.get_reactor_latency().items():
+            total = totals.get(name)
+            if total is not None:
+                self._add_latency(latency, latency_quantiles, {"reactor": name}, snapshot, total)
+        return [latency, latency_quantiles]
+
+    def _collect_persistence(self) -> list[MetricFamily]:
+        if self.get_workers is None:
+            return []
+
+        saves = MetricFamily("zoo_persistence_saves", "counter", "Successful saves")
+        errors = MetricFamily("zoo_persistence_save_errors", "counter", "Failed saves")
+        duration = MetricFamily(
+            "zoo_persistence_last_save_duration_seconds",
+            "gauge",
+            "Duration of the last successful save",
+            "seconds",
+        )
+        timestamp = MetricFamily(
+            "zoo_persistence_last_save_timestamp_seconds",
+            "gauge",
+            "Unix time of the last successful save",
+            "seconds",
+        )
+        for name, worker in self.get_workers().items():
+            get_metrics = getattr(worker, "get_persistence_metrics", None)
+            if get_metrics is None:
+                continue
+            metrics = get_metrics()
+            labels = {"worker": name}
+            saves.add(labels, metrics["save_count"], "_total")
+            errors.add(labels, metrics["save_error_count"], "_total")
+            duration.add(labels, metrics["last_save_duration"])
+            timestamp.add(labels, metrics["last_save_time"])
+        return [saves, errors, duration, timestamp]
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                accept = self.headers.get("Accept", "")
+                if "application/openmetrics-text" in accept:
+                    body, content_type = server.snapshot, OPENMETRICS_CONTENT_TYPE
+                else:
+                    body, content_type = server.prometheus_snapshot, PROMETHEUS_CONTENT_TYPE
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # noqa: A002
+                LogUtils.debug(format % args, MetricsServer.__name__)
+
+        return MetricsHandler
+
+
+# 导出公共 API
+__all__ = ["MetricFamily", "MetricsServer"]
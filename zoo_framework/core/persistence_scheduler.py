@@ -1,18 +1,40 @@
 """持久化调度器 - 解耦持久化逻辑.
 
 P1 任务：将 StateMachineWorker 中的持久化逻辑移到独立的调度器中
+
+除 Pickle 外还提供不依赖 pickle 的策略（JSON Lines、msgpack、struct 紧凑二进制），
+文件带有长度和 CRC32 文件头：校验只检查文件头并流式计算校验和，不反序列化，
+每次加载只解码一次，读取不受信任的文件也不会执行任意代码。
+
+后台保存（类似 Redis BGSAVE）：fork 出的子进程拥有 fork 时刻内存的写时复制副本，
+在子进程中序列化和写文件，父进程只在 fork 期间持有锁，之后的修改不受影响。
 """
 
+import contextlib
+import json
 import os
 import pickle
 import shutil
+import signal
+import struct
 import threading
+import time
+import warnings
+import zlib
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
 from typing import Any
 
 from zoo_framework.utils import FileUtils, LogUtils
 
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 
 class PersistenceStrategy(ABC):
     """持久化策略基类.
@@ -81,6 +103,269 @@ class PicklePersistenceStrategy(PersistenceStrategy):
             return False
 
 
+class FramedPersistenceStrategy(PersistenceStrategy):
+    """带文件头的持久化策略基类.
+
+    文件格式：魔数、格式版本、编码、保留、数据长度、数据 CRC32，之后是编码后的数据。
+    子类只需实现 encode / decode
+    """
+
+    MAGIC = b"ZPSF"
+    FORMAT_VERSION = 1
+    # 编码编号，写入文件头，防止用错误的策略读取
+    ENCODING = 0
+
+    _HEADER = struct.Struct("<4sBBHQI")
+    _CHUNK_SIZE = 1024 * 1024
+
+    @abstractmethod
+    def encode(self, data: Any) -> Iterable[bytes]:
+        """把数据编码为若干字节块，按顺序写入文件."""
+        pass
+
+    @abstractmethod
+    def decode(self, payload: bytes) -> Any:
+        """从完整的数据解码."""
+        pass
+
+    def save(self, data: Any, filepath: str) -> bool:
+        """流式写入数据，写完后回填文件头."""
+        temp_path = filepath + ".tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(bytes(self._HEADER.size))
+                length = 0
+                checksum = 0
+                for chunk in self.encode(data):
+                    f.write(chunk)
+                    length += len(chunk)
+                    checksum = zlib.crc32(chunk, checksum)
+                f.seek(0)
+                f.write(
+                    self._HEADER.pack(
+                        self.MAGIC, self.FORMAT_VERSION, self.ENCODING, 0, length, checksum
+                    )
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, filepath)
+            return True
+        except Exception as e:
+            LogUtils.error(f"❌ {self.__class__.__name__} save failed: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+    def _read_header(self, f) -> tuple[int, int] | None:
+        """读取并检查文件头.
+
+        Returns:
+            (数据长度, CRC32)，文件头无效或长度与文件大小不符时返回 None
+        """
+        header = f.read(self._HEADER.size)
+        if len(header) < self._HEADER.size:
+            return None
+        magic, version, encoding, _, length, checksum = self._HEADER.unpack(header)
+        if magic != self.MAGIC or version != self.FORMAT_VERSION or encoding != self.ENCODING:
+            return None
+        if os.fstat(f.fileno()).st_size != self._HEADER.size + length:
+            return None
+        return length, checksum
+
+    def load(self, filepath: str) -> Any | None:
+        """读取数据，校验 CRC32 后解码一次."""
+        try:
+            with open(filepath, "rb") as f:
+                header = self._read_header(f)
+                if header is None:
+                    LogUtils.error(f"❌ Invalid persistence file header: {filepath}")
+                    return None
+                payload = f.read()
+            if zlib.crc32(payload) != header[1]:
+                LogUtils.error(f"❌ Persistence file checksum mismatch: {filepath}")
+                return None
+            return self.decode(payload)
+        except Exception as e:
+            LogUtils.error(f"❌ {self.__class__.__name__} load failed: {e}")
+            return None
+
+    def validate(self, filepath: str) -> bool:
+        """检查文件头，并分块计算 CRC32，不解码数据."""
+        try:
+            with open(filepath, "rb") as f:
+                header = self._read_header(f)
+                if header is None:
+                    return False
+                checksum = 0
+                for chunk in iter(lambda: f.read(self._CHUNK_SIZE), b""):
+                    checksum = zlib.crc32(chunk, checksum)
+                return checksum == header[1]
+        except OSError:
+            return False
+
+
+class JsonLinesPersistenceStrategy(FramedPersistenceStrategy):
+    """JSON Lines 持久化策略.
+
+    第一行记录数据类型；字典每行一个 [键, 值]，列表每行一个元素，其他数据为一行。
+    只支持 JSON 可以表示的数据，元组会读取为列表
+    """
+
+    ENCODING = 1
+
+    @staticmethod
+    def _line(value: Any) -> bytes:
+        return (json.dumps(value, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def encode(self, data: Any) -> Iterator[bytes]:
+        if isinstance(data, dict):
+            yield self._line({"type": "dict"})
+            for key, value in data.items():
+                yield self._line([key, value])
+        elif isinstance(data, list):
+            yield self._line({"type": "list"})
+            for value in data:
+                yield self._line(value)
+        else:
+            yield self._line({"type": "value"})
+            yield self._line(data)
+
+    def decode(self, payload: bytes) -> Any:
+        # 字符串中的换行会被转义，按换行拆分是安全的
+        lines = payload.split(b"\n")
+        data_type = json.loads(lines[0])["type"]
+        values = (json.loads(line) for line in lines[1:] if line)
+        if data_type == "dict":
+            return dict(values)
+        if data_type == "list":
+            return list(values)
+        return next(values)
+
+
+class MsgpackPersistenceStrategy(FramedPersistenceStrategy):
+    """msgpack 持久化策略，需要安装 msgpack."""
+
+    ENCODING = 2
+
+    def __init__(self):
+        if not MSGPACK_AVAILABLE:
+            raise ImportError(
+                "MsgpackPersistenceStrategy requires msgpack, install it with: "
+                "pip install zoo-framework[msgpack]"
+            )
+
+    def encode(self, data: Any) -> Iterator[bytes]:
+        yield msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+class StructPersistenceStrategy(FramedPersistenceStrategy):
+    """struct 紧凑二进制持久化策略.
+
+    每个值为 1 字节类型标记加定长或带长度前缀的内容，支持 None、bool、int、float、
+    str、bytes、list、tuple、dict，不依赖第三方库
+    """
+
+    ENCODING = 3
+
+    _INT64 = struct.Struct("<q")
+    _FLOAT64 = struct.Struct("<d")
+    _LENGTH = struct.Struct("<I")
+    _INT64_RANGE = range(-(1 << 63), 1 << 63)
+    # 编码缓冲区超过该大小时输出一块
+    _FLUSH_SIZE = 64 * 1024
+
+    def encode(self, data: Any) -> Iterator[bytes]:
+        buffer = bytearray()
+        stack = [data]
+        while stack:
+            value = stack.pop()
+            self._encode_value(value, buffer, stack)
+            if len(buffer) >= self._FLUSH_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+    def _encode_value(self, value: Any, buffer: bytearray, stack: list) -> None:
+        """写入一个值，容器的元素压入栈中，按原顺序依次写入."""
+        if value is None:
+            buffer += b"N"
+        elif value is True:
+            buffer += b"T"
+        elif value is False:
+            buffer += b"F"
+        elif isinstance(value, int):
+            if value in self._INT64_RANGE:
+                buffer += b"i" + self._INT64.pack(value)
+            else:
+                raw = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+                buffer += b"I" + self._LENGTH.pack(len(raw)) + raw
+        elif isinstance(value, float):
+            buffer += b"d" + self._FLOAT64.pack(value)
+        elif isinstance(value, str):
+            raw = value.encode("utf-8")
+            buffer += b"s" + self._LENGTH.pack(len(raw)) + raw
+        elif isinstance(value, (bytes, bytearray)):
+            buffer += b"b" + self._LENGTH.pack(len(value)) + value
+        elif isinstance(value, (list, tuple)):
+            buffer += (b"t" if isinstance(value, tuple) else b"l") + self._LENGTH.pack(len(value))
+            stack.extend(reversed(value))
+        elif isinstance(value, dict):
+            buffer += b"m" + self._LENGTH.pack(len(value))
+            for key, item in reversed(value.items()):
+                stack.append(item)
+                stack.append(key)
+        else:
+            raise TypeError(f"Unsupported type for struct persistence: {type(value).__name__}")
+
+    def decode(self, payload: bytes) -> Any:
+        view = memoryview(payload)
+        value, offset = self._decode_value(view, 0)
+        if offset != len(view):
+            raise ValueError("Trailing data after struct payload")
+        return value
+
+    def _decode_value(self, view: memoryview, offset: int) -> tuple[Any, int]:
+        tag = view[offset]
+        offset += 1
+        if tag == 0x4E:  # N
+            return None, offset
+        if tag == 0x54:  # T
+            return True, offset
+        if tag == 0x46:  # F
+            return False, offset
+        if tag == 0x69:  # i
+            return self._INT64.unpack_from(view, offset)[0], offset + 8
+        if tag == 0x64:  # d
+            return self._FLOAT64.unpack_from(view, offset)[0], offset + 8
+
+        length = self._LENGTH.unpack_from(view, offset)[0]
+        offset += 4
+        if tag == 0x73:  # s
+            return str(view[offset : offset + length], "utf-8"), offset + length
+        if tag == 0x62:  # b
+            return bytes(view[offset : offset + length]), offset + length
+        if tag == 0x49:  # I
+            raw = view[offset : offset + length]
+            return int.from_bytes(raw, "little", signed=True), offset + length
+        if tag in (0x6C, 0x74):  # l / t
+            items = []
+            for _ in range(length):
+                item, offset = self._decode_value(view, offset)
+                items.append(item)
+            return (tuple(items) if tag == 0x74 else items), offset
+        if tag == 0x6D:  # m
+            result = {}
+            for _ in range(length):
+                key, offset = self._decode_value(view, offset)
+                result[key], offset = self._decode_value(view, offset)
+            return result, offset
+        raise ValueError(f"Unknown struct persistence tag: {tag:#x}")
+
+
 class FileChecksumValidator:
     """文件校验和验证器.
 
@@ -275,6 +560,112 @@ class BackupManager:
                 LogUtils.warning(f"⚠️ Failed to remove old backup: {e}")
 
 
+class ForkSnapshotter:
+    """在 fork 出的子进程中保存快照.
+
+    同一时间只有一个子进程；子进程退出后由回收线程调用完成回调。
+    ThreadSafeDict、StripedThreadSafeDict、CopyOnWriteDict 和快照状态域的锁在子进程中重新创建
+    （logging 的锁由标准库重新创建），其他线程在 fork 时持有的其他锁在子进程中仍不会释放，
+    子进程超过 timeout 未退出时会被强制结束，视为保存失败
+    """
+
+    def __init__(self, timeout: float = 60):
+        """初始化.
+
+        Args:
+            timeout: 子进程保存的最长时间（秒）
+        """
+        self.timeout = timeout
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+
+    @staticmethod
+    def available() -> bool:
+        """当前平台是否支持 fork."""
+        return hasattr(os, "fork")
+
+    def is_running(self) -> bool:
+        """是否有正在保存的子进程."""
+        return not self._idle.is_set()
+
+    def start(
+        self,
+        save: Callable[[], bool],
+        on_done: Callable[[bool], None] | None = None,
+        lock: Any = None,
+    ) -> bool:
+        """在 fork 出的子进程中执行 save.
+
+        Args:
+            save: 在子进程中执行，返回是否保存成功，抛出异常视为失败
+            on_done: 子进程退出后在回收线程中调用，参数为是否保存成功
+            lock: 修改数据时持有的锁，fork 期间持有，子进程不会看到只完成一半的修改
+
+        Returns:
+            是否已开始保存，上一次保存尚未完成时返回 False
+        """
+        with self._lock:
+            if self._pid is not None:
+                return False
+            with (
+                lock if lock is not None else contextlib.nullcontext(),
+                warnings.catch_warnings(),
+            ):
+                # 多线程进程 fork 的警告：子进程只做序列化和写文件，然后直接退出
+                warnings.simplefilter("ignore", DeprecationWarning)
+                pid = os.fork()
+            if pid == 0:
+                code = 1
+                try:
+                    code = 0 if save() else 1
+                except Exception as e:
+                    LogUtils.error(f"❌ Background snapshot failed: {e}")
+                finally:
+                    os._exit(code)
+            self._pid = pid
+            self._idle.clear()
+
+        threading.Thread(
+            target=self._reap, args=(pid, on_done), name="SnapshotReaper", daemon=True
+        ).start()
+        return True
+
+    def _reap(self, pid: int, on_done: Callable[[bool], None] | None) -> None:
+        deadline = time.monotonic() + self.timeout
+        try:
+            while True:
+                done_pid, status = os.waitpid(pid, os.WNOHANG)
+                if done_pid:
+                    success = os.waitstatus_to_exitcode(status) == 0
+                    break
+                if time.monotonic() >= deadline:
+                    LogUtils.error(f"❌ Background snapshot timed out, killing process {pid}")
+                    os.kill(pid, signal.SIGKILL)
+                    os.waitpid(pid, 0)
+                    success = False
+                    break
+                time.sleep(0.01)
+            if on_done is not None:
+                on_done(success)
+        except Exception as e:
+            LogUtils.error(f"❌ Background snapshot reaper failed: {e}")
+        finally:
+            # 完成回调执行完后才允许下一次保存
+            with self._lock:
+                self._pid = None
+                self._idle.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """等待正在进行的保存完成.
+
+        Returns:
+            是否已没有正在保存的子进程
+        """
+        return self._idle.wait(timeout)
+
+
 class PersistenceScheduler:
     """持久化调度器.
 
@@ -294,7 +685,20 @@ class PersistenceScheduler:
         auto_save_interval: int = 60,  # 自动保存间隔（秒）
         enable_backup: bool = True,
         max_backups: int = 5,
+        background_save: bool = False,
+        snapshot_timeout: float = 60,
     ):
+        """初始化调度器.
+
+        Args:
+            filepath: 持久化文件路径
+            strategy: 持久化策略，默认为 Pickle
+            auto_save_interval: 自动保存间隔（秒），0 表示不自动保存
+            enable_backup: 保存前是否备份
+            max_backups: 保留的备份数量
+            background_save: 是否在 fork 出的子进程中保存，不支持 fork 的平台仍同步保存
+            snapshot_timeout: 后台保存的最长时间（秒）
+        """
         self.filepath = filepath
         self.strategy = strategy or PicklePersistenceStrategy()
         self.auto_save_interval = auto_save_interval
@@ -308,6 +712,13 @@ class PersistenceScheduler:
         self._running = False
         self._scheduler_thread: threading.Thread | None = None
 
+        self._snapshotter: ForkSnapshotter | None = None
+        if background_save:
+            if ForkSnapshotter.available():
+                self._snapshotter = ForkSnapshotter(snapshot_timeout)
+            else:
+                LogUtils.warning("⚠️ os.fork is not available, saving in the foreground")
+
     def start(self) -> None:
         """启动持久化调度器."""
         if self._running:
@@ -326,8 +737,7 @@ class PersistenceScheduler:
         self._running = False
 
         # 最后保存一次
-        if self._dirty:
-            self.save(force=True)
+        self.flush()
 
         if self._scheduler_thread:
             self._scheduler_thread.join(timeout=5)
@@ -379,11 +789,13 @@ class PersistenceScheduler:
     def save(self, force: bool = False) -> bool:
         """保存数据.
 
+        启用后台保存时只 fork 子进程，在子进程中写入，立即返回
+
         Args:
             force: 是否强制保存（忽略 dirty 标记）
 
         Returns:
-            是否保存成功
+            是否保存成功；后台保存时为是否已开始保存
         """
         with self._file_lock:
             if not force and not self._dirty:
@@ -392,26 +804,67 @@ class PersistenceScheduler:
             if self._data is None:
                 return False
 
-            # 创建备份
-            if self.enable_backup and self._backup_manager:
-                self._backup_manager.create_backup(self.filepath)
+            if self._snapshotter is not None:
+                return self._save_in_background()
+            return self._save_now()
 
-            # 保存数据
-            success = self.strategy.save(self._data, self.filepath)
+    def flush(self) -> bool:
+        """等待后台保存完成，再同步保存尚未保存的修改.
 
-            if success:
-                self._dirty = False
-                self._last_save_time = datetime.now().timestamp()
+        Returns:
+            是否保存成功
+        """
+        if self._snapshotter is not None:
+            self._snapshotter.wait()
+
+        with self._file_lock:
+            if not self._dirty or self._data is None:
+                return True
+            return self._save_now()
+
+    def _save_now(self) -> bool:
+        """在当前线程中保存数据."""
+        success = self._write(self._data)
+        if success:
+            self._dirty = False
+            self._last_save_time = datetime.now().timestamp()
+        return success
+
+    def _save_in_background(self) -> bool:
+        """在子进程中写入当前数据，之后的修改重新标记为 dirty."""
+        self._dirty = False
+        if not self._snapshotter.start(lambda: self._write(self._data), self._on_snapshot_done):
+            # 上一次后台保存尚未完成，下次再保存
+            self._dirty = True
+            return False
+        return True
 
-                # 保存校验和
-                checksum = FileChecksumValidator.calculate_checksum(self.filepath)
-                FileChecksumValidator.save_checksum(self.filepath, checksum)
+    def _on_snapshot_done(self, success: bool) -> None:
+        if success:
+            self._last_save_time = datetime.now().timestamp()
+        else:
+            self._dirty = True
+            LogUtils.error("❌ Background save failed")
 
-                LogUtils.debug("💾 Data saved successfully")
-            else:
-                LogUtils.error("❌ Failed to save data")
+    def _write(self, data: Any) -> bool:
+        """备份后写入数据和校验和."""
+        # 创建备份
+        if self.enable_backup and self._backup_manager:
+            self._backup_manager.create_backup(self.filepath)
 
-            return success
+        # 保存数据
+        success = self.strategy.save(data, self.filepath)
+
+        if success:
+            # 保存校验和
+            checksum = FileChecksumValidator.calculate_checksum(self.filepath)
+            FileChecksumValidator.save_checksum(self.filepath, checksum)
+
+            LogUtils.debug("💾 Data saved successfully")
+        else:
+            LogUtils.error("❌ Failed to save data")
+
+        return success
 
     def mark_dirty(self) -> None:
         """标记数据为已修改."""
@@ -424,8 +877,10 @@ class PersistenceScheduler:
             data: 新数据
             auto_save: 是否立即保存
         """
-        self._data = data
-        self._dirty = True
+        # 与 fork 互斥，后台保存的子进程看到的数据和 dirty 标记一致
+        with self._file_lock:
+            self._data = data
+            self._dirty = True
 
         if auto_save:
             self.save()
@@ -441,9 +896,15 @@ class PersistenceScheduler:
 
 # 导出公共 API
 __all__ = [
+    "MSGPACK_AVAILABLE",
     "BackupManager",
     "FileChecksumValidator",
+    "ForkSnapshotter",
+    "FramedPersistenceStrategy",
+    "JsonLinesPersistenceStrategy",
+    "MsgpackPersistenceStrategy",
     "PersistenceScheduler",
     "PersistenceStrategy",
     "PicklePersistenceStrategy",
+    "StructPersistenceStrategy",
 ]
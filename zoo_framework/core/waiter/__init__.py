@@ -1,7 +1,19 @@
 from .base_waiter import BaseWaiter
+from .process_waiter import ProcessWaiter
 from .safe_waiter import SafeWaiter
 from .simple_waiter import SimpleWaiter
 from .stable_waiter import StableWaiter
 from .waiter_factory import WaiterFactory
+from .worker_timer import TimerHandle, WorkerTimer, get_worker_timer
 
-__all__ = ["BaseWaiter", "SafeWaiter", "SimpleWaiter", "StableWaiter", "WaiterFactory"]
+__all__ = [
+    "BaseWaiter",
+    "ProcessWaiter",
+    "SafeWaiter",
+    "SimpleWaiter",
+    "StableWaiter",
+    "TimerHandle",
+    "WaiterFactory",
+    "WorkerTimer",
+    "get_worker_timer",
+]
@@ -1,10 +1,19 @@
+import functools
+import itertools
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from zoo_framework.constant import WaiterConstant
 from zoo_framework.reactor.event_reactor_manager import EventReactorManager
 from zoo_framework.reactor.waiter_result_reactor import WaiterResultReactor
+from zoo_framework.utils import LogUtils
 from zoo_framework.workers import BaseWorker
+from zoo_framework.workers.worker_metrics import OUTCOME_TIMEOUT, get_worker_metrics
+
+from ..zoo_thread import ZooThread
+from .worker_timer import get_worker_timer
 
 
 class BaseWaiter:
@@ -12,6 +21,9 @@ class BaseWaiter:
 
     _lock = None
 
+    # 宽限时间后是否强制中断超时的 worker，无法中断 worker 的 waiter 只发出取消通知
+    kill_on_timeout = True
+
     def __init__(self):
         from zoo_framework.params import WorkerParams
 
@@ -19,12 +31,27 @@ class BaseWaiter:
         self.worker_mode, self.pool_enable = self.get_worker_mode(WorkerParams.WORKER_POOL_ENABLE)
         # 获得资源池的大小
         self.pool_size = WorkerParams.WORKER_POOL_SIZE
+        # 超时后等待协作式取消的宽限时间
+        self.timeout_grace = WorkerParams.WORKER_TIMEOUT_GRACE
         # 资源池初始化
         self.resource_pool = None
 
         # TODO：将 worker 使用register的方式注册，并且属性和方法都可以通过register的方式注册
         self.workers = []
+        # 运行中新加入的 worker，调度循环在下一次执行前合并进 workers，
+        # 调度循环整体替换 workers 时不会丢失并发加入的 worker
+        self._added_workers = []
+        self._added_workers_lock = threading.Lock()
         self.worker_props = {}
+        # 保护 worker 登记信息的检查与修改，完成回调、超时释放和强制中断互斥
+        self._props_lock = threading.RLock()
+        # 每次派遣的编号，用于识别超时后才返回的过期执行
+        self._run_ids = itertools.count(1)
+        # 唤醒监听器，worker 完成、新 worker 注册时通知调度循环立即执行
+        self._wakeup_listeners: list[Callable[[], None]] = []
+        # 处于延迟中的 worker，由定时器在截止时间到达时移除
+        self._delayed_workers = {}
+        self.timer = get_worker_timer()
         self.register_handler()
 
     def get_worker_mode(self, pool_enable):
@@ -43,6 +70,64 @@ class BaseWaiter:
     def init_lock(self):
         pass
 
+    def add_wakeup_listener(self, listener: Callable[[], None]):
+        """添加唤醒监听器.
+
+        调度循环通过监听器得知有新的工作可以派遣，而不是固定间隔轮询
+        """
+        self._wakeup_listeners.append(listener)
+
+    def remove_wakeup_listener(self, listener: Callable[[], None]):
+        """移除唤醒监听器."""
+        if listener in self._wakeup_listeners:
+            self._wakeup_listeners.remove(listener)
+
+    def wakeup(self):
+        """唤醒调度循环."""
+        for listener in list(self._wakeup_listeners):
+            try:
+                listener()
+            except Exception as e:
+                LogUtils.error(f"Wakeup listener failed: {e}", self.__class__.__name__)
+
+    def get_next_timeout(self) -> float | None:
+        """获得距离下一个截止时间的秒数.
+
+        :return: 没有需要关注的截止时间时返回 None，调度循环将一直等待到被唤醒
+        """
+        next_timeout = None
+        now_time = time.time()
+        for worker_prop in list(self.worker_props.values()):
+            run_timeout = worker_prop.get("run_timeout")
+            if run_timeout is None or run_timeout <= 0:
+                continue
+            cancel_time = worker_prop.get("cancel_time")
+            if cancel_time is None:
+                deadline = worker_prop.get("run_time") + run_timeout
+            elif not self.kill_on_timeout:
+                # 已取消且不会强制中断，等待 worker 自己结束
+                continue
+            else:
+                deadline = cancel_time + self.timeout_grace
+            remain = max(0.0, deadline - now_time)
+            if next_timeout is None or remain < next_timeout:
+                next_timeout = remain
+        return next_timeout
+
+    def add_worker(self, worker):
+        """加入新的 worker，并唤醒调度循环."""
+        with self._added_workers_lock:
+            self._added_workers.append(worker)
+        self.wakeup()
+
+    def _merge_added_workers(self):
+        """把新加入的 worker 合并进 workers，只在调度循环中调用."""
+        with self._added_workers_lock:
+            added, self._added_workers = self._added_workers, []
+        for worker in added:
+            if worker not in self.workers:
+                self.workers.append(worker)
+
     # 集结worker们
     def call_workers(self, worker_list: list):
         """集结worker们."""
@@ -53,6 +138,8 @@ class BaseWaiter:
             self.resource_pool = ThreadPoolExecutor(max_workers=self.pool_size)
 
     def __del__(self):
+        for handle in list(getattr(self, "_delayed_workers", {}).values()):
+            handle.cancel()
         if self.resource_pool is not None:
             self.resource_pool.shutdown(wait=True)
 
@@ -61,19 +148,21 @@ class BaseWaiter:
         """执行服务."""
         # 参与下次循环的worker
         next_loop_workers = []
-        for worker in self.workers:
-            self.worker_band(worker.name)
+        self._merge_added_workers()
+
+        # 判定是否超时
+        self.check_worker_timeouts()
 
+        for worker in self.workers:
             if worker is None:
                 continue
 
             if worker.is_loop:
                 next_loop_workers.append(worker)
 
-            # 判定是否超时
-            self.worker_band(worker.name)
-
-            if self.worker_props.get(worker.name) is None:
+            if self.worker_props.get(worker.name) is None and not self.is_worker_delayed(
+                worker.name
+            ):
                 self._dispatch_worker(worker)
 
         self.workers = next_loop_workers
@@ -83,16 +172,32 @@ class BaseWaiter:
         :param worker:
         :return:
         """
+        if isinstance(worker, BaseWorker):
+            worker.cancel_token.reset()
+            worker.dispatch_time = time.monotonic()
+
+        run_id = next(self._run_ids)
+        callback = functools.partial(self.worker_running_callback, run_id=run_id)
+        start_callback = functools.partial(self.worker_started_callback, run_id=run_id)
+
+        # 先登记再启动，避免 worker 过快完成时回调早于登记，导致槽位无法释放
         if self.worker_mode is WaiterConstant.WORKER_MODE_THREAD_POOL:
-            t = self.resource_pool.submit(self.worker_running, worker, self.worker_running_callback)
+            self.register_worker(worker, None, run_id)
+            t = self.resource_pool.submit(self.worker_running, worker, callback, start_callback)
+            self._set_worker_container(worker, t)
             t.add_done_callback(self.worker_report)
-            self.register_worker(worker, t)
         elif self.worker_mode is WaiterConstant.WORKER_MODE_THREAD:
-            from threading import Thread
-
-            t = Thread(target=self.worker_running, args=(worker, self.worker_running_callback))
+            t = ZooThread(
+                worker.name, target=self.worker_running, args=(worker, callback, start_callback)
+            )
+            t.daemon = True
+            self.register_worker(worker, t, run_id)
             t.start()
-            self.register_worker(worker, t)
+
+    def check_worker_timeouts(self):
+        """检查所有运行中的 worker 是否超时."""
+        for worker_name in list(self.worker_props.keys()):
+            self.worker_band(worker_name)
 
     def worker_band(self, worker_name):
         """绑定worker
@@ -103,10 +208,10 @@ class BaseWaiter:
         if worker_prop is None:
             return
 
-        worker_prop.get("worker")
+        worker = worker_prop.get("worker")
         run_time = worker_prop.get("run_time")
         run_timeout = worker_prop.get("run_timeout")
-        worker_prop.get("container")
+        container = worker_prop.get("container")
 
         now_time = time.time()
 
@@ -116,19 +221,79 @@ class BaseWaiter:
         if (now_time - run_time) < run_timeout:
             return
 
-        #
-        # if self.worker_mode is WaiterConstant.WORKER_MODE_THREAD_POOL:
-        #     if container.cancel() is False:
-        #         return
-        # elif self.worker_mode is WaiterConstant.WORKER_MODE_THREAD:
-        #     container.kill()
-        #
-        # self.unregister_worker(worker)
+        cancel_time = worker_prop.get("cancel_time")
+        if cancel_time is None:
+            worker_prop["cancel_time"] = now_time
+
+            # 1. 还在池中排队的 worker 直接取消
+            if isinstance(container, Future) and container.cancel():
+                self.release_timeout_worker(worker_prop)
+                return
+
+            # 2. 通过取消令牌通知协作式 worker 退出
+            if isinstance(worker, BaseWorker):
+                worker.cancel_token.cancel()
+            LogUtils.warning(f"{worker_name} run timeout, cancelling", self.__class__.__name__)
+            return
+
+        if not self.kill_on_timeout or (now_time - cancel_time) < self.timeout_grace:
+            return
 
-    def register_worker(self, worker, worker_container):
+        # 3. 宽限时间内仍未退出，向 worker 所在线程引发异常
+        # 与完成回调互斥：线程已结束本次执行时不再引发，避免中断它正在执行的其他任务
+        with self._props_lock:
+            if self.worker_props.get(worker_name) is not worker_prop:
+                return
+            if isinstance(container, ZooThread):
+                killed = container.raise_exception()
+            else:
+                killed = ZooThread.raise_exception_by_id(worker_prop.get("thread_id"))
+            if not killed:
+                # 还不知道 worker 所在的线程（池中的 worker 尚未开始执行）或引发失败，
+                # 保留登记，继续占用槽位，再等待一个宽限时间后重试
+                worker_prop["cancel_time"] = now_time
+        if not killed:
+            LogUtils.warning(
+                f"{worker_name} run timeout, kill failed, retrying", self.__class__.__name__
+            )
+            return
+        LogUtils.error(f"{worker_name} run timeout, killed", self.__class__.__name__)
+        self.release_timeout_worker(worker_prop)
+
+    def release_timeout_worker(self, worker_prop) -> bool:
+        """释放超时 worker 的槽位，并发出超时事件.
+
+        :param worker_prop: worker 的登记信息
+        :return: 是否释放，同一次执行已被释放时返回 False
+        """
+        worker = worker_prop.get("worker")
+        with self._props_lock:
+            # 强制中断与取消后的协作退出可能同时到达，同一次执行只释放一次
+            if self.worker_props.get(worker.name) is not worker_prop:
+                return False
+            self.delay_worker(worker)
+            self.unregister_worker(worker)
+
+        elapsed = time.time() - worker_prop.get("run_time")
+        get_worker_metrics().record(worker, elapsed, OUTCOME_TIMEOUT)
+
+        EventReactorManager().dispatch(
+            WaiterConstant.WORKER_TIMEOUT_TOPIC,
+            {
+                "worker": worker.name,
+                "run_time": worker_prop.get("run_time"),
+                "run_timeout": worker_prop.get("run_timeout"),
+                "elapsed": elapsed,
+            },
+        )
+        self.wakeup()
+        return True
+
+    def register_worker(self, worker, worker_container, run_id=None):
         """Register the worker to self.worker_props
         :param worker: worker
         :param worker_container: worker running thread or process
+        :param run_id: 本次派遣的编号
         :return:
         """
         self.worker_props[worker.name] = {
@@ -136,22 +301,99 @@ class BaseWaiter:
             "run_time": time.time(),
             "run_timeout": worker.run_timeout,
             "container": worker_container,
+            "run_id": run_id,
+            "thread_id": None,
+            "cancel_time": None,
         }
+        self._update_pool_occupancy()
+
+    def _get_worker_prop(self, worker_name, run_id=None):
+        """获得 worker 的登记信息，run_id 不匹配时说明是已被释放的过期执行."""
+        worker_prop = self.worker_props.get(worker_name)
+        if worker_prop is None:
+            return None
+        if run_id is not None and worker_prop.get("run_id") != run_id:
+            return None
+        return worker_prop
+
+    def _set_worker_container(self, worker, worker_container):
+        worker_prop = self.worker_props.get(worker.name)
+        if worker_prop is not None:
+            worker_prop["container"] = worker_container
 
     def unregister_worker(self, worker):
         if self.worker_props.get(worker.name) is not None:
             del self.worker_props[worker.name]
+            self._update_pool_occupancy()
 
-    def worker_running_callback(self, worker):
-        self.unregister_worker(worker)
+    def _update_pool_occupancy(self):
+        """把资源池占用同步给 Worker 运行指标."""
+        get_worker_metrics().set_pool_occupancy(len(self.worker_props), self.pool_size)
+
+    def is_worker_delayed(self, worker_name) -> bool:
+        """Worker 是否处于延迟等待中."""
+        return worker_name in self._delayed_workers
+
+    def delay_worker(self, worker):
+        """将 worker 交给定时器延迟，截止时间到达前不会再次派遣.
+
+        :param worker: worker
+        """
+        delay_time = getattr(worker, "delay_time", None)
+        if not delay_time or delay_time <= 0:
+            return
+
+        self._delayed_workers[worker.name] = self.timer.schedule(
+            delay_time, self._on_worker_delay_done, worker.name
+        )
+
+    def _on_worker_delay_done(self, worker_name):
+        self._delayed_workers.pop(worker_name, None)
+        self.wakeup()
+
+    def worker_started_callback(self, worker, run_id=None):
+        with self._props_lock:
+            worker_prop = self._get_worker_prop(worker.name, run_id)
+            if worker_prop is not None:
+                worker_prop["thread_id"] = threading.get_ident()
+
+    def worker_running_callback(self, worker, run_id=None) -> bool:
+        """Worker 执行完成，进入延迟并释放槽位.
+
+        Returns:
+            是否为当前的执行，超时被释放后才返回的执行返回 False
+        """
+        with self._props_lock:
+            worker_prop = self._get_worker_prop(worker.name, run_id)
+            # 超时被释放后才返回的执行不再处理
+            if run_id is not None and worker_prop is None:
+                return False
+
+            # 超时取消后协作退出的执行，同样按超时记录并发出超时事件
+            cancelled = worker_prop is not None and worker_prop.get("cancel_time") is not None
+            if not cancelled:
+                # 先进入延迟再释放槽位，避免调度循环在两者之间重复派遣
+                self.delay_worker(worker)
+                self.unregister_worker(worker)
+
+        if cancelled:
+            self.release_timeout_worker(worker_prop)
+            return True
+
+        # worker 执行完成，唤醒调度循环重新派遣
+        self.wakeup()
+        return True
 
     # 派遣worker
     @staticmethod
-    def worker_running(worker, callback=None):
+    def worker_running(worker, callback=None, start_callback=None):
         """派遣worker."""
         if not isinstance(worker, BaseWorker):
             return None
 
+        if start_callback is not None:
+            start_callback(worker)
+
         result = worker.run()
 
         if callback is not None:
@@ -162,5 +404,10 @@ class BaseWaiter:
     # worker汇报结果
     @staticmethod
     def worker_report(worker):
+        # 被取消或被强制中断的 worker 没有结果
+        if worker.cancelled() or worker.exception() is not None:
+            return
         result = worker.result()
+        if result is None:
+            return
         EventReactorManager().dispatch(result.topic, result.content)
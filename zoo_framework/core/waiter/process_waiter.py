@@ -0,0 +1,99 @@
+import functools
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from zoo_framework.constant import WaiterConstant
+from zoo_framework.reactor.event_reactor_manager import EventReactorManager
+from zoo_framework.utils import LogUtils
+from zoo_framework.workers.worker_metrics import OUTCOME_ERROR, get_worker_metrics
+
+from .base_waiter import BaseWaiter
+
+
+def process_worker_running(worker):
+    """在子进程中执行 worker，worker 以 pickle 的方式传入."""
+    return BaseWaiter.worker_running(worker)
+
+
+class ProcessWaiter(BaseWaiter):
+    """进程池 waiter.
+
+    CPU 密集型 worker 在进程池中执行，不受 GIL 限制。
+    worker 会被 pickle 到子进程执行，执行结果 WorkerResult 回到主进程后分发，
+    子进程中对 worker 状态的修改不会同步回主进程。
+
+    超时只是提示：取消令牌不会传到子进程，也没有可以中断的线程，
+    还在排队的 worker 会被取消，已经在执行的 worker 按超时记录，
+    但会一直占用槽位和池中的进程，直到子进程中的执行结束。
+    """
+
+    kill_on_timeout = False
+
+    def __init__(self):
+        BaseWaiter.__init__(self)
+        from zoo_framework.params import WorkerParams
+
+        self.start_method = WorkerParams.WORKER_PROCESS_START_METHOD
+
+    def get_worker_mode(self, pool_enable):
+        """进程 waiter 始终使用进程池."""
+        return WaiterConstant.WORKER_MODE_PROCESS_POOL, True
+
+    def call_workers(self, worker_list: list):
+        """集结worker们."""
+        self.workers = worker_list
+        self.resource_pool = ProcessPoolExecutor(
+            max_workers=self.pool_size, mp_context=self._get_mp_context()
+        )
+
+    def _get_mp_context(self):
+        # 主进程存在多个线程，fork 不安全，优先使用 forkserver
+        if self.start_method in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context(self.start_method)
+        return multiprocessing.get_context("spawn")
+
+    def _dispatch_worker(self, worker):
+        """派遣 worker 到进程池."""
+        run_id = next(self._run_ids)
+        worker.dispatch_time = time.monotonic()
+        self.register_worker(worker, None, run_id)
+        future = self.resource_pool.submit(process_worker_running, worker)
+        self._set_worker_container(worker, future)
+        future.add_done_callback(functools.partial(self.process_report, worker, run_id))
+
+    def process_report(self, worker, run_id, future):
+        """子进程执行完成，释放槽位并汇报结果.
+
+        子进程中记录的运行指标不会回到主进程，这里按返回的 WorkerResult 重新记录
+        """
+        worker_prop = self._get_worker_prop(worker.name, run_id)
+        # 超时后才结束的执行在释放槽位时按超时记录，不再按执行结果记录指标
+        timed_out = worker_prop is not None and worker_prop.get("cancel_time") is not None
+        # 超时被释放后才返回的执行已经按超时记录，不再修改派遣时间、记录指标或分发结果
+        if not self.worker_running_callback(worker, run_id=run_id):
+            return
+        dispatch_time, worker.dispatch_time = worker.dispatch_time, None
+
+        # 排队中被取消的 worker 已按超时记录
+        if future.cancelled():
+            return
+
+        exception = future.exception()
+        if exception is not None:
+            LogUtils.error(
+                f"{worker.name} process run failed: {exception}", self.__class__.__name__
+            )
+            if not timed_out:
+                elapsed = 0.0 if dispatch_time is None else time.monotonic() - dispatch_time
+                get_worker_metrics().record(worker, elapsed, OUTCOME_ERROR)
+            return
+
+        result = future.result()
+        if result is None:
+            return
+        if result.outcome is not None and not timed_out:
+            get_worker_metrics().record(
+                worker, result.duration or 0.0, result.outcome, result.queue_wait
+            )
+        EventReactorManager().dispatch(result.topic, result.content)
@@ -16,15 +16,28 @@ class SafeWaiter(BaseWaiter):
             raise Exception("Workers Number is too large")
 
         super().call_workers(worker_list)
-        self._src_worker_list = worker_list
+        self._src_worker_list = list(worker_list)
+
+    def add_worker(self, worker):
+        """加入新的 worker，重建 worker 列表时保留."""
+        if worker not in self._src_worker_list:
+            self._src_worker_list.append(worker)
+        super().add_worker(worker)
 
     # 执行服务
     def execute_service(self):
+        # 延迟中的 worker 保留到下次循环
+        delayed_workers = []
+        self._merge_added_workers()
+        self.check_worker_timeouts()
         for worker in self.workers:
+            if self.is_worker_delayed(worker.name):
+                delayed_workers.append(worker)
+                continue
             if self.worker_props.get(worker.name) is None:
                 self._dispatch_worker(worker)
 
-        self.workers = []
+        self.workers = delayed_workers
         self.rebuild_workers()
 
     def rebuild_workers(self):
@@ -33,13 +46,22 @@ class SafeWaiter(BaseWaiter):
             self.workers = [worker for worker in self._src_worker_list if worker.is_loop]
         self.rebuild_worker = False
 
+    def _check_rebuild(self):
+        if len(self.worker_props.keys()) == 0:
+            self.rebuild_worker = True
+            self.wakeup()
+
     # @staticmethod
     def worker_report(self, worker):
+        # 被取消或被强制中断的 worker 没有结果
+        if worker.cancelled() or worker.exception() is not None:
+            self._check_rebuild()
+            return
+
         result = worker.result()
         if result is None:
             raise Exception("Some worker run error")
 
-        if len(self.worker_props.keys()) == 0:
-            self.rebuild_worker = True
+        self._check_rebuild()
 
         EventReactorManager().dispatch(result.topic, result.content)
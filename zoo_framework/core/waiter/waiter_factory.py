@@ -1,4 +1,5 @@
 from .base_waiter import BaseWaiter
+from .process_waiter import ProcessWaiter
 from .safe_waiter import SafeWaiter
 from .simple_waiter import SimpleWaiter
 from .stable_waiter import StableWaiter
@@ -13,4 +14,6 @@ class WaiterFactory:
             return StableWaiter()
         if name == "safe":
             return SafeWaiter()
+        if name == "process":
+            return ProcessWaiter()
         return SimpleWaiter()
@@ -0,0 +1,149 @@
+"""Worker 定时器.
+
+统一管理 Worker 的延迟执行：Worker 执行完成后不再占用线程 sleep，
+而是由定时器在截止时间到达时通知 Waiter 重新派遣。
+所有延迟由一个定时线程和最小堆负责，插入与弹出均为 O(log n)。
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from zoo_framework.utils import LogUtils
+
+
+class TimerHandle:
+    """定时任务句柄，可用于取消定时任务."""
+
+    def __init__(self, deadline: float, callback: Callable[..., Any], args: tuple):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """取消定时任务（惰性删除，到期时跳过）."""
+        self.cancelled = True
+
+    def run(self) -> None:
+        """执行定时任务."""
+        if self.cancelled:
+            return
+        self.callback(*self.args)
+
+
+class WorkerTimer:
+    """Worker 定时器.
+
+    基于最小堆的定时调度器，所有截止时间由一个守护线程等待，
+    空闲时线程阻塞在条件变量上，不占用 CPU。
+    """
+
+    def __init__(self, name: str = "WorkerTimer"):
+        self.name = name
+        self._heap: list[tuple[float, int, TimerHandle]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args) -> TimerHandle:
+        """在 delay 秒后执行回调.
+
+        Args:
+            delay: 延迟时间（秒）
+            callback: 回调函数，在定时线程中执行，应尽快返回
+            *args: 回调参数
+
+        Returns:
+            定时任务句柄
+        """
+        deadline = time.monotonic() + max(0.0, delay)
+        handle = TimerHandle(deadline, callback, args)
+
+        with self._condition:
+            heapq.heappush(self._heap, (deadline, next(self._counter), handle))
+            self._ensure_started()
+            # 只有新任务成为最早的截止时间时才需要唤醒定时线程
+            if self._heap[0][2] is handle:
+                self._condition.notify()
+
+        return handle
+
+    def size(self) -> int:
+        """获取等待中的定时任务数量（包含已取消但未到期的任务）."""
+        with self._condition:
+            return len(self._heap)
+
+    def stop(self) -> None:
+        """停止定时线程，未到期的任务将被丢弃."""
+        with self._condition:
+            self._running = False
+            self._heap.clear()
+            self._condition.notify()
+
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _ensure_started(self) -> None:
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _pop_due(self) -> list[TimerHandle] | None:
+        """等待并弹出所有已到期的任务，定时器停止时返回 None."""
+        with self._condition:
+            while self._running:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                now = time.monotonic()
+                deadline = self._heap[0][0]
+                if deadline > now:
+                    self._condition.wait(deadline - now)
+                    continue
+
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[2])
+                return due
+            return None
+
+    def _run(self) -> None:
+        while True:
+            due = self._pop_due()
+            if due is None:
+                return
+
+            for handle in due:
+                try:
+                    handle.run()
+                except Exception as e:
+                    LogUtils.error(f"Timer callback failed: {e}", self.__class__.__name__)
+
+
+# 全局定时器
+_worker_timer: WorkerTimer | None = None
+_worker_timer_lock = threading.Lock()
+
+
+def get_worker_timer() -> WorkerTimer:
+    """获取全局 Worker 定时器."""
+    global _worker_timer
+    with _worker_timer_lock:
+        if _worker_timer is None:
+            _worker_timer = WorkerTimer()
+        return _worker_timer
+
+
+# 导出公共 API
+__all__ = ["TimerHandle", "WorkerTimer", "get_worker_timer"]
@@ -5,15 +5,21 @@ from zoo_framework.utils import LogUtils
 
 
 class ZooThread(threading.Thread):
-    def __init__(self, name):
-        threading.Thread.__init__(self)
+    def __init__(self, name, target=None, args=(), kwargs=None):
+        threading.Thread.__init__(self, target=target, args=args, kwargs=kwargs)
         self.name = name
 
     def run(self):
         # target function of the thread class
         try:  # 用try/finally 的方式处理exception，从而kill thread
+            if self._target is not None:
+                self._target(*self._args, **self._kwargs)
+                return
             while True:
                 LogUtils.debug("running " + self.name)
+        except SystemExit:
+            # raise_exception 引发的退出
+            LogUtils.debug("killed " + self.name)
         finally:
             LogUtils.debug("ended")
 
@@ -26,11 +32,26 @@ class ZooThread(threading.Thread):
                 return id
         return None
 
-    def raise_exception(self):
+    def raise_exception(self, exception=SystemExit):
         """引发异常."""
-        thread_id = self.get_id()
+        return self.raise_exception_by_id(self.get_id(), exception)
+
+    @staticmethod
+    def raise_exception_by_id(thread_id, exception=SystemExit) -> bool:
+        """向指定线程引发异常，线程执行到下一条字节码时响应.
+
+        :param thread_id: 线程 id
+        :param exception: 异常类型
+        :return: 是否成功
+        """
+        if thread_id is None:
+            return False
         # 精髓就是这句话，给线程发过去一个exceptions，线程就那边响应完就停了
-        res = ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id, ctypes.py_object(SystemExit))
+        res = ctypes.pythonapi.PyThreadState_SetAsyncExc(
+            ctypes.c_ulong(thread_id), ctypes.py_object(exception)
+        )
         if res > 1:
-            ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id, 0)
-            print("Exception raise failure")
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), None)
+            LogUtils.error("Exception raise failure", ZooThread.__name__)
+            return False
+        return res == 1
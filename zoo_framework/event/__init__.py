@@ -1,5 +1,6 @@
+from .async_event_channel import AsyncEventChannel
 from .event_channel import EventChannel
 from .event_channel_register import EventChannelRegister
 from .event_register import EventRegister
 
-__all__ = [EventRegister, EventChannelRegister, EventChannel]
+__all__ = [EventRegister, EventChannelRegister, EventChannel, AsyncEventChannel]
@@ -0,0 +1,218 @@
+import asyncio
+import threading
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Future
+
+from zoo_framework.fifo import BackpressurePolicy
+from zoo_framework.fifo.node import EventNode
+from zoo_framework.utils import LogUtils
+from zoo_framework.utils.loop_thread import get_event_loop_thread
+
+from .event_channel import EventChannel
+
+# 每个事件循环中所有异步通道共享的处理方法上限，在事件循环中第一次使用时创建
+_shared_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_shared_semaphore() -> asyncio.Semaphore:
+    """获取当前事件循环的共享处理方法上限，只能在事件循环中调用."""
+    loop = asyncio.get_running_loop()
+    semaphore = _shared_semaphores.get(loop)
+    if semaphore is None:
+        from zoo_framework.params import EventParams
+
+        semaphore = asyncio.Semaphore(EventParams.EVENT_ASYNC_MAX_HANDLERS)
+        _shared_semaphores[loop] = semaphore
+    return semaphore
+
+
+class AsyncEventChannel(EventChannel):
+    """异步事件通道.
+
+    事件队列与同步通道相同，按有效优先级（基础优先级加等待加成）出队，由通道自己的消费协程出队。
+    入队在共享事件循环中执行，队列满时按背压策略拒绝或丢弃最旧的事件；
+    事件循环不能阻塞，不支持 BLOCK 策略。
+    协程处理方法直接在事件循环中 await，等待中的处理方法不占用线程；
+    同步处理方法交给事件循环的默认线程池。
+    同时执行的处理方法数受通道并发数和同一事件循环中所有异步通道共享的上限共同限制。
+    """
+
+    def __init__(
+        self,
+        channel_name,
+        capacity: int | None = None,
+        concurrency: int | None = None,
+        policy: BackpressurePolicy = BackpressurePolicy.REJECT,
+    ):
+        from zoo_framework.params import EventParams
+
+        self._check_policy(policy)
+        if concurrency is None:
+            concurrency = EventParams.EVENT_ASYNC_CONCURRENCY
+        super().__init__(channel_name, capacity=capacity, concurrency=concurrency, policy=policy)
+
+        self._loop_thread = get_event_loop_thread()
+        # 队列中有事件时唤醒消费协程，在事件循环中第一次使用时创建
+        self._ready: asyncio.Event | None = None
+        # 通道并发数的信号量，并发数修改后在事件循环中重新创建
+        self._channel_slots: asyncio.Semaphore | None = None
+        self._start_lock = threading.Lock()
+        self._consumer: Future | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def capacity(self) -> int:
+        """队列容量，0 表示不限制."""
+        return self._event_fifo.capacity
+
+    @staticmethod
+    def _check_policy(policy: BackpressurePolicy | None):
+        if policy is BackpressurePolicy.BLOCK:
+            raise ValueError("AsyncEventChannel does not support BackpressurePolicy.BLOCK")
+
+    def configure(self, capacity=None, concurrency=None, policy=None):
+        """修改通道的容量、并发数和背压策略，正在执行的处理方法不受影响.
+
+        Raises:
+            ValueError: 背压策略为 BLOCK
+        """
+        self._check_policy(policy)
+        old_concurrency = self.concurrency
+        super().configure(capacity=capacity, concurrency=concurrency, policy=policy)
+        if self.concurrency != old_concurrency:
+            self._loop_thread.call_soon(self._reset_channel_slots)
+
+    def _reset_channel_slots(self):
+        self._channel_slots = None
+
+    def _get_channel_slots(self) -> asyncio.Semaphore:
+        if self._channel_slots is None:
+            self._channel_slots = asyncio.Semaphore(self.concurrency)
+        return self._channel_slots
+
+    def push_event(self, event: EventNode):
+        """将事件推入事件队列，可以在任意线程中调用.
+
+        入队在事件循环中执行，队列已满时按背压策略拒绝或丢弃最旧的事件
+        """
+        self._ensure_consumer()
+        self._loop_thread.call_soon(self._put, event)
+
+    def _put(self, event: EventNode):
+        super().push_event(event)
+        self._get_ready().set()
+
+    def _get_ready(self) -> asyncio.Event:
+        if self._ready is None:
+            self._ready = asyncio.Event()
+        return self._ready
+
+    def refresh_event(self, event):
+        """刷新事件，异步通道中已入队的事件不支持替换."""
+        LogUtils.debug(
+            f"Channel {self.channel_name} does not support refresh event",
+            AsyncEventChannel.__name__,
+        )
+
+    def _ensure_consumer(self):
+        if self._consumer is not None and not self._consumer.done():
+            return
+        with self._start_lock:
+            if self._consumer is None or self._consumer.done():
+                self._consumer = self._loop_thread.submit(self._consume())
+
+    def drain(self, handler: Callable[[EventNode], None]) -> list[Future]:
+        """异步通道由消费协程持续出队，这里只确保消费协程在运行."""
+        self._ensure_consumer()
+        return []
+
+    async def _consume(self):
+        """消费协程：出队并为每个事件创建处理任务，并发已满时等待空位."""
+        shared_slots = _get_shared_semaphore()
+        loop = asyncio.get_running_loop()
+        # 事件循环重新启动后消费协程也会重新启动，事件在当前的事件循环中创建
+        self._ready = ready = asyncio.Event()
+
+        while True:
+            event = self.pop_value()
+            if event is None:
+                ready.clear()
+                await ready.wait()
+                continue
+
+            channel_slots = self._get_channel_slots()
+            await channel_slots.acquire()
+            await shared_slots.acquire()
+            self._incr_active(1)
+
+            task = loop.create_task(self._handle(event, channel_slots, shared_slots))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _incr_active(self, value: int):
+        with self._metrics_lock:
+            self._active += value
+
+    async def _handle(
+        self,
+        event: EventNode,
+        channel_slots: asyncio.Semaphore,
+        shared_slots: asyncio.Semaphore,
+    ):
+        try:
+            await self._dispatch_event(event)
+            self._incr("processed_count")
+        except Exception as e:
+            self._incr("error_count")
+            LogUtils.error(
+                f"Channel {self.channel_name} handle event failed: {e}",
+                AsyncEventChannel.__name__,
+            )
+        finally:
+            self._incr_active(-1)
+            shared_slots.release()
+            channel_slots.release()
+
+    async def _dispatch_event(self, event: EventNode):
+        """执行事件的所有反应器，多个反应器并发执行."""
+        from .event_channel_manager import EventChannelManager
+
+        if event.is_expire():
+            event.expire_callback()
+            return
+
+        reactors = EventChannelManager().get_channel_reactors(event)
+        if not reactors:
+            return
+
+        loop = asyncio.get_running_loop()
+        coroutines = []
+        for reactor in reactors:
+            if reactor.is_async():
+                coroutines.append(
+                    reactor.execute_async(event.topic, event.content, event.channel_name)
+                )
+            else:
+                coroutines.append(
+                    loop.run_in_executor(
+                        None, reactor.submit, event.topic, event.content, event.channel_name
+                    )
+                )
+        await asyncio.gather(*coroutines)
+
+    def shutdown(self, wait: bool = False):
+        """停止消费协程并取消正在执行的处理任务."""
+        consumer, self._consumer = self._consumer, None
+        if consumer is not None:
+            consumer.cancel()
+
+        def cancel_tasks():
+            for task in list(self._tasks):
+                task.cancel()
+
+        if self._loop_thread.is_running():
+            self._loop_thread.call_soon(cancel_tasks)
+        super().shutdown(wait)
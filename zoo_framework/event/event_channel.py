@@ -1,26 +1,62 @@
-from zoo_framework.fifo import EventFIFO
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from zoo_framework.fifo import BackpressurePolicy, EventFIFO, FIFOFullError, PriorityEventFIFO
 from zoo_framework.fifo.node import EventNode
 from zoo_framework.reactor import EventReactor, EventReactorManager
 from zoo_framework.utils import LogUtils
 
 
 class EventChannel:
-    """事件通道."""
+    """事件通道.
 
-    # 事件队列
-    _event_fifo: EventFIFO = EventFIFO()
+    每个通道独立持有事件队列、处理线程和指标，
+    一个通道的事件堆积不会影响其他通道的出队和处理。
+    """
 
     # 事件反应器管理器
     _reactor_manager = EventReactorManager()
 
-    def __init__(self, channel_name):
+    def __init__(
+        self,
+        channel_name,
+        capacity: int | None = None,
+        concurrency: int | None = None,
+        policy: BackpressurePolicy = BackpressurePolicy.REJECT,
+    ):
+        from zoo_framework.params import EventParams
+
         # 是否公开, 通道不公开时, 只能通过事件反应器来触发事件,如果公开, 则可以通过事件通道来触发事件
         self.public = False
         # 通道名称
         self.channel_name = channel_name
 
+        if capacity is None:
+            capacity = EventParams.EVENT_CHANNEL_CAPACITY
+        if concurrency is None:
+            concurrency = EventParams.EVENT_CHANNEL_CONCURRENCY
+
+        # 事件队列，按有效优先级出队，同优先级保持先进先出
+        self._event_fifo: EventFIFO = PriorityEventFIFO(capacity=capacity, policy=policy)
+
+        # 同时处理事件的并发数
+        self.concurrency = max(1, int(concurrency))
+        self._executor: ThreadPoolExecutor | None = None
+        self._active = 0
+
+        # 通道指标
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "pushed_count": 0,
+            "rejected_count": 0,
+            "popped_count": 0,
+            "processed_count": 0,
+            "error_count": 0,
+        }
+
     def get_reactors(self, topic: str) -> list[EventReactor]:
-        """获取事件反应器."""
+        """获取事件反应器，支持通配订阅（sensor.*.temp、sensor.#）."""
         return self._reactor_manager.get_reactor(topic)
 
     def get_channel_name(self):
@@ -35,13 +71,46 @@ class EventChannel:
         """是否公开."""
         return self.public
 
+    def configure(
+        self,
+        capacity: int | None = None,
+        concurrency: int | None = None,
+        policy: BackpressurePolicy | None = None,
+    ):
+        """修改通道的容量、并发数和背压策略.
+
+        并发数变化时，新的处理线程池在下一次 drain 时生效，正在处理的事件不受影响。
+        线程池的替换和 drain 的计数、提交在同一把锁内完成，不会把处理循环提交到已关闭的线程池
+        """
+        if capacity is not None:
+            self._event_fifo.capacity = capacity
+        if policy is not None:
+            self._event_fifo.policy = policy
+        if concurrency is None:
+            return
+        executor = None
+        with self._metrics_lock:
+            concurrency = max(1, int(concurrency))
+            if concurrency != self.concurrency:
+                self.concurrency = concurrency
+                executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _incr(self, key: str, value: int = 1):
+        with self._metrics_lock:
+            self._metrics[key] += value
+
     def size(self):
         """获取事件队列大小."""
         return self._event_fifo.size()
 
     def pop_value(self) -> EventNode:
         """从事件队列中弹出事件."""
-        return self._event_fifo.pop_value()
+        event = self._event_fifo.pop_value()
+        if event is not None:
+            self._incr("popped_count")
+        return event
 
     def get_top(self) -> EventNode:
         """获取事件队列的第一个事件."""
@@ -51,12 +120,16 @@ class EventChannel:
         """将事件推入事件队列."""
         try:
             self._event_fifo.push_value(event)
+            self._incr("pushed_count")
+        except FIFOFullError as e:
+            self._incr("rejected_count")
+            LogUtils.error(str(e), EventFIFO.__name__)
         except Exception as e:
             LogUtils.error(str(e), EventFIFO.__name__)
 
     def dispatch(self, topic, content):
         """将事件推入事件队列."""
-        self._event_fifo.dispatch(topic, content, self.channel_name)
+        self.push_event(EventNode(topic=topic, content=content, channel_name=self.channel_name))
 
     def register_reactor(self, topic, reactor):
         """注册事件反应器."""
@@ -68,3 +141,69 @@ class EventChannel:
         if self._event_fifo.has_event(event):  # 如果存在
             # 替换事件
             self._event_fifo.replace(event)
+
+    def get_active_count(self) -> int:
+        """获取正在处理事件的线程数."""
+        with self._metrics_lock:
+            return self._active
+
+    def get_metrics(self) -> dict:
+        """获取通道指标."""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+            metrics["active"] = self._active
+        metrics["channel_name"] = self.channel_name
+        metrics["size"] = self._event_fifo.size()
+        metrics["capacity"] = self._event_fifo.capacity
+        metrics["concurrency"] = self.concurrency
+        metrics["dropped_count"] = self._event_fifo.dropped_count
+        return metrics
+
+    def drain(self, handler: Callable[[EventNode], None]) -> list[Future]:
+        """在通道自己的线程池中处理队列中的事件，不阻塞调用方.
+
+        按空闲的并发数启动处理循环，每个循环不断出队并调用 handler，直到队列为空。
+        已达到并发上限时不再启动新的循环，剩余事件由正在运行的循环继续处理。
+
+        :param handler: 事件处理函数
+        :return: 本次启动的处理循环
+        """
+        futures = []
+        with self._metrics_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.concurrency,
+                    thread_name_prefix=f"EventChannel-{self.channel_name}",
+                )
+            start_count = min(self.concurrency - self._active, self._event_fifo.size())
+            # 计数和提交在同一次加锁内完成，configure 不能在两者之间关闭线程池
+            for _ in range(start_count):
+                futures.append(self._executor.submit(self._drain_loop, handler))
+                self._active += 1
+        return futures
+
+    def _drain_loop(self, handler: Callable[[EventNode], None]):
+        try:
+            while True:
+                event = self.pop_value()
+                if event is None:
+                    return
+                try:
+                    handler(event)
+                    self._incr("processed_count")
+                except Exception as e:
+                    self._incr("error_count")
+                    LogUtils.error(
+                        f"Channel {self.channel_name} handle event failed: {e}",
+                        EventChannel.__name__,
+                    )
+        finally:
+            with self._metrics_lock:
+                self._active -= 1
+
+    def shutdown(self, wait: bool = False):
+        """关闭通道的处理线程池."""
+        with self._metrics_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
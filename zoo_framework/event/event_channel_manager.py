@@ -2,6 +2,7 @@ from zoo_framework.core.aop import cage
 from zoo_framework.reactor import EventReactor
 
 from ..fifo.node import EventNode
+from .async_event_channel import AsyncEventChannel
 from .event_channel import EventChannel
 from .event_channel_register import EventChannelRegister
 
@@ -14,10 +15,27 @@ class EventChannelManager:
 
     @classmethod
     def refresh_channel(cls, channel_name, topic, reactor: EventReactor):
-        """刷新事件频道."""
-        channel: EventChannel = cls._event_channel_register.register(channel_name)
+        """刷新事件频道.
+
+        协程处理方法的反应器会创建异步事件通道，通道已存在时沿用原通道
+        """
+        channel_class = AsyncEventChannel if reactor.is_async() else None
+        channel: EventChannel = cls._event_channel_register.register(channel_name, channel_class)
         channel.register_reactor(topic, reactor)
 
+    @classmethod
+    def configure_channel(cls, channel_name, **options) -> EventChannel:
+        """配置事件频道的容量、并发数和背压策略."""
+        return cls._event_channel_register.register(channel_name, **options)
+
+    @classmethod
+    def get_channel_metrics(cls) -> dict[str, dict]:
+        """获取所有事件频道的指标."""
+        return {
+            channel.get_channel_name(): channel.get_metrics()
+            for channel in cls._event_channel_register.get_all_channel()
+        }
+
     @classmethod
     def get_channel(cls, channel_name) -> EventChannel:
         """获取事件频道."""
@@ -86,24 +104,23 @@ class EventChannelManager:
             raise Exception("channel not found")
             return None
 
+        # 按主题匹配事件反应器（支持通配订阅），每个事件只匹配一次
+        reactors: list[EventReactor] = channel.get_reactors(event.topic)
+
         # 获得事件响应策略
         if event.response_mechanism == 1:
             # 获得第一个事件反应器
-            reactors: list[EventReactor] = channel.get_reactors(event.topic)
             if reactors is not None and len(reactors) > 0:
                 return [reactors[0]]
         elif event.response_mechanism == 2:
             # 根据事件优先级获得事件反应器
-            reactors: list[EventReactor] = channel.get_reactors(event.topic)
             if reactors is not None and len(reactors) > 0:
                 return reactors.sort(key=lambda x: x.priority)
         elif event.response_mechanism == 3:
             # 获得所有的事件反应器
-            reactors: list[EventReactor] = channel.get_reactors(event.topic)
             return reactors
         elif event.response_mechanism == 4:
             # 获得所有的事件反应器
-            reactors: list[EventReactor] = channel.get_reactors(event.topic)
             if reactors is not None and len(reactors) > 0:
                 # 根据名称获得事件反应器
                 for reactor in reactors:
@@ -1,5 +1,5 @@
 from zoo_framework.core.aop import cage
-from zoo_framework.utils.thread_safe_dict import ThreadSafeDict
+from zoo_framework.utils.thread_safe_dict import CopyOnWriteDict
 
 from .event_channel import EventChannel
 
@@ -11,15 +11,24 @@ class EventChannelRegister:
     _single = None
     _instance = None
 
-    # 事件通道字典
-    _channel_map: ThreadSafeDict = ThreadSafeDict()
+    # 事件通道字典，写时复制，每个周期获取通道列表时不复制
+    _channel_map: CopyOnWriteDict = CopyOnWriteDict()
 
     @classmethod
-    def register(cls, channel_name):
-        channel = cls.get_channel(channel_name)
+    def register(cls, channel_name, channel_class: type[EventChannel] | None = None, **options):
+        """注册事件通道.
+
+        :param channel_name: 通道名称
+        :param channel_class: 通道不存在时创建的通道类型，默认为 EventChannel
+        :param options: 通道配置（capacity/concurrency/policy），通道已存在时更新配置
+        """
+        channel = cls._channel_map.get(channel_name)
         if channel is None:
-            channel = EventChannel(channel_name)
-            cls._channel_map[channel_name] = channel
+            channel = cls._channel_map.setdefault(
+                channel_name, (channel_class or EventChannel)(channel_name, **options)
+            )
+        elif options:
+            channel.configure(**options)
         return channel
 
     @classmethod
@@ -28,13 +37,11 @@ class EventChannelRegister:
 
     @classmethod
     def get_channel(cls, channel_name) -> EventChannel:
-        if channel_name not in cls._channel_map:
+        channel = cls._channel_map.get(channel_name)
+        if channel is None:
             # 创建事件通道
-            from zoo_framework.event.event_channel import EventChannel
-
-            cls._channel_map[channel_name] = EventChannel(channel_name)
-            return cls._channel_map.get(channel_name)
-        return cls._channel_map.get(channel_name)
+            channel = cls._channel_map.setdefault(channel_name, EventChannel(channel_name))
+        return channel
 
     @classmethod
     def get_all_channel(cls):
@@ -1,6 +1,15 @@
-from .base_fifo import BaseFIFO
+from .base_fifo import BackpressurePolicy, BaseFIFO, FIFOFullError
 from .delay_fifo import DelayFIFO
 from .event_fifo import EventFIFO
+from .priority_event_fifo import PriorityEventFIFO
 from .single_fifo import SingleFIFO
 
-__all__ = ["BaseFIFO", "DelayFIFO", "EventFIFO", "SingleFIFO"]
+__all__ = [
+    "BackpressurePolicy",
+    "BaseFIFO",
+    "DelayFIFO",
+    "EventFIFO",
+    "FIFOFullError",
+    "PriorityEventFIFO",
+    "SingleFIFO",
+]
@@ -1,32 +1,136 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+
 from zoo_framework.fifo.node import EventNode
 
 
+class FIFOFullError(Exception):
+    """队列已满，拒绝入队."""
+
+
+class BackpressurePolicy(Enum):
+    """队列满时的背压策略."""
+
+    # 阻塞直到有空位（可设置超时时间）
+    BLOCK = "block"
+    # 丢弃最旧的值
+    DROP_OLDEST = "drop_oldest"
+    # 拒绝入队，抛出 FIFOFullError
+    REJECT = "reject"
+
+
 class BaseFIFO:
-    _fifo = []
+    """基础队列.
+
+    每个实例独立持有一个 deque，入队和出队均为 O(1)。
+    capacity 为 0 时不限制容量，否则按 policy 处理队列满的情况。
+    子类可以重写 _init_storage/_put/_get/_drop/_peek/_qsize/_contains 更换存储结构。
+    """
+
+    def __init__(
+        self,
+        capacity: int = 0,
+        policy: BackpressurePolicy = BackpressurePolicy.REJECT,
+        block_timeout: float | None = None,
+    ):
+        self._init_storage()
+        self.capacity = capacity
+        self.policy = policy
+        self.block_timeout = block_timeout
+        # 因 DROP_OLDEST 被丢弃的值的数量
+        self.dropped_count = 0
+
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def _init_storage(self):
+        self._fifo = deque()
+
+    def _put(self, value):
+        self._fifo.append(value)
+
+    def _get(self):
+        return self._fifo.popleft()
+
+    def _drop(self):
+        """队列满时丢弃一个值（DROP_OLDEST 策略）."""
+        self._fifo.popleft()
+
+    def _peek(self):
+        return self._fifo[0]
+
+    def _qsize(self) -> int:
+        return len(self._fifo)
+
+    def _contains(self, value) -> bool:
+        return value in self._fifo
+
+    def _is_full(self) -> bool:
+        return 0 < self.capacity <= self._qsize()
+
+    def _wait_not_full(self):
+        """在锁内等待队列出现空位."""
+        if self.block_timeout is None:
+            while self._is_full():
+                self._not_full.wait()
+            return
+
+        deadline = time.monotonic() + self.block_timeout
+        while self._is_full():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FIFOFullError(f"FIFO is full, capacity: {self.capacity}")
+            self._not_full.wait(remaining)
+
+    def push_value(self, value):
+        with self._lock:
+            self._push_locked(value)
+
+    def _push_locked(self, value):
+        """在锁内按背压策略入队."""
+        if self._is_full():
+            if self.policy is BackpressurePolicy.BLOCK:
+                self._wait_not_full()
+            elif self.policy is BackpressurePolicy.DROP_OLDEST:
+                self._drop()
+                self.dropped_count += 1
+            else:
+                raise FIFOFullError(f"FIFO is full, capacity: {self.capacity}")
+
+        self._put(value)
+        self._not_empty.notify()
 
-    def __init__(self):
-        pass
+    def pop_value(self, block: bool = False, timeout: float | None = None) -> EventNode or None:
+        """弹出队首的值.
 
-    @classmethod
-    def push_value(cls, value):
-        cls._fifo.append(value)
+        :param block: 队列为空时是否等待
+        :param timeout: 等待的超时时间（秒），None 表示一直等待
+        :return: 队首的值，队列为空时返回 None
+        """
+        with self._lock:
+            if block and self._qsize() == 0:
+                self._not_empty.wait_for(lambda: self._qsize() > 0, timeout)
 
-    @classmethod
-    def pop_value(cls) -> EventNode or None:
-        if len(cls._fifo) <= 0:
-            return None
+            if self._qsize() == 0:
+                return None
 
-        return cls._fifo.pop(0)
+            value = self._get()
+            self._not_full.notify()
+            return value
 
-    @classmethod
-    def push_values(cls, values: list):
-        cls._fifo.extend(values)
+    def push_values(self, values: list):
+        for value in values:
+            self.push_value(value)
 
-    @classmethod
-    def size(cls):
-        return len(cls._fifo)
+    def size(self):
+        return self._qsize()
 
-    @classmethod
-    def push_values_if_null(cls, value: EventNode):
-        if cls._fifo.index(value) == -1:
-            cls._fifo.append(value)
+    def push_values_if_null(self, value: EventNode):
+        """值不在队列中时入队，检查和入队在同一次加锁内完成."""
+        with self._lock:
+            if self._contains(value):
+                return
+            self._push_locked(value)
@@ -1,36 +1,124 @@
+import heapq
+import itertools
+import time
+
 from .base_fifo import BaseFIFO
 from .node import DelayFIFONode
 
 
 class DelayFIFO(BaseFIFO):
-    """延迟队列."""
+    """延迟队列.
+
+    以 expired_time 为键的最小堆，入队 O(log n)，
+    pop_expired 只处理已到期的 k 个节点，复杂度 O(k log n)。
+    """
+
+    def _init_storage(self):
+        self._heap: list[tuple[float, int, DelayFIFONode]] = []
+        self._counter = itertools.count()
 
-    def __init__(self):
-        super().__init__()
-        self._fifo = []
+    def _put(self, value: DelayFIFONode):
+        heapq.heappush(self._heap, (value.expired_time, next(self._counter), value))
 
-    def push_value(self, value: DelayFIFONode):
-        self._fifo.append(value)
+    def _get(self) -> DelayFIFONode:
+        return heapq.heappop(self._heap)[2]
 
-    def pop_value(self):
-        if len(self._fifo) <= 0:
-            return None
+    def _drop(self):
+        heapq.heappop(self._heap)
 
-        return self._fifo.pop(0)
+    def _peek(self) -> DelayFIFONode:
+        return self._heap[0][2]
+
+    def _qsize(self) -> int:
+        return len(self._heap)
+
+    def _contains(self, value) -> bool:
+        return any(node is value or node == value for _, _, node in self._heap)
 
     def is_exist(self, value):
-        return value in self._fifo
+        with self._lock:
+            return self._contains(value)
 
-    def size(self):
-        return len(self._fifo)
+    def get_next_expire_time(self) -> float | None:
+        """获取最早的到期时间，队列为空时返回 None."""
+        with self._lock:
+            if not self._heap:
+                return None
+            return self._heap[0][0]
 
-    def get_expire_values(self, current_time):
-        """获取过期的值
-        :param current_time:
-        :return:
+    def get_expire_values(self, current_time=None):
+        """获取过期的值（不出队）
+        :param current_time: 当前时间戳，默认为 time.time()
+        :return: 按到期时间排序的过期节点
         """
+        if current_time is None:
+            current_time = time.time()
+
         values = []
-        for node in self._fifo:
-            if node.is_expire(current_time):
-                values.append(node)
+        with self._lock:
+            # 只遍历堆中到期的部分，子节点未到期时其子树都未到期
+            stack = [0]
+            while stack:
+                index = stack.pop()
+                if index >= len(self._heap) or self._heap[index][0] > current_time:
+                    continue
+                values.append(self._heap[index])
+                stack.extend((2 * index + 1, 2 * index + 2))
+
+        values.sort(key=lambda item: (item[0], item[1]))
+        return [item[2] for item in values]
+
+    def _pop_expired(self, current_time) -> list[DelayFIFONode]:
+        """在锁内弹出所有到期的节点，需要重复触发的节点重新入队."""
+        values = []
+        rearm_nodes = []
+        while self._heap and self._heap[0][0] <= current_time:
+            node = heapq.heappop(self._heap)[2]
+            values.append(node)
+            if node.rearm():
+                rearm_nodes.append(node)
+
+        # 到期后再重新入队，避免间隔很短的节点在同一次调用中被重复弹出
+        for node in rearm_nodes:
+            self._put(node)
+
+        if values:
+            self._not_full.notify(len(values))
         return values
+
+    def pop_expired(self, current_time=None) -> list[DelayFIFONode]:
+        """弹出所有到期的节点.
+
+        设置了 interval 且还有剩余 loop_times 的节点会按下一次到期时间重新入队
+        :param current_time: 当前时间戳，默认为 time.time()
+        :return: 按到期时间排序的到期节点
+        """
+        if current_time is None:
+            current_time = time.time()
+
+        with self._lock:
+            return self._pop_expired(current_time)
+
+    def wait_next(self, timeout: float | None = None) -> list[DelayFIFONode]:
+        """阻塞直到最早的节点到期，并弹出所有到期的节点.
+
+        等待期间有更早到期的节点入队时会重新计算等待时间
+        :param timeout: 最长等待时间（秒），None 表示一直等待
+        :return: 到期的节点，超时返回空列表
+        """
+        end_time = None if timeout is None else time.monotonic() + timeout
+
+        with self._lock:
+            while True:
+                current_time = time.time()
+                if self._heap and self._heap[0][0] <= current_time:
+                    return self._pop_expired(current_time)
+
+                wait_time = self._heap[0][0] - current_time if self._heap else None
+                if end_time is not None:
+                    remaining = end_time - time.monotonic()
+                    if remaining <= 0:
+                        return []
+                    wait_time = remaining if wait_time is None else min(wait_time, remaining)
+
+                self._not_empty.wait(wait_time)
@@ -1,6 +1,6 @@
 from zoo_framework.utils import LogUtils
 
-from .base_fifo import BaseFIFO
+from .base_fifo import BaseFIFO, FIFOFullError
 from .node import EventNode
 
 
@@ -18,6 +18,8 @@ class EventFIFO(BaseFIFO):
                 # 对于非 dict 和非 EventNode 的值，创建一个默认事件节点
                 node = EventNode(topic="default", content=str(value))
             super().push_value(node)
+        except FIFOFullError:
+            raise
         except Exception as e:
             LogUtils.error(str(e), EventFIFO.__name__)
 
@@ -28,16 +30,24 @@ class EventFIFO(BaseFIFO):
 
     def get_top(self):
         """获取事件队列的第一个事件."""
-        if self.size() > 0:
-            return self._fifo[0]
-        return None
+        with self._lock:
+            if self._qsize() > 0:
+                return self._peek()
+            return None
 
     def has_event(self, event):
         """判断事件是否存在."""
-        return self._fifo.index(event) != -1
+        with self._lock:
+            return self._contains(event)
 
     def replace(self, event):
         """替换事件."""
-        index = self._fifo.index(event)
-        if index != -1:
-            self._fifo[index] = event
+        with self._lock:
+            self._replace(event)
+
+    def _replace(self, event):
+        try:
+            index = self._fifo.index(event)
+        except ValueError:
+            return
+        self._fifo[index] = event
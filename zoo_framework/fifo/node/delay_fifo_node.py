@@ -4,13 +4,43 @@ import time
 class DelayFIFONode:
     """延迟FIFO节点."""
 
-    def __init__(self, value, index, expired_time, loop_times=1):
+    def __init__(self, value, index, expired_time, loop_times=1, interval=0):
+        """初始化延迟节点.
+
+        :param value: 节点的值
+        :param index: 节点的索引
+        :param expired_time: 到期时间戳
+        :param loop_times: 触发次数，小于 0 表示无限次
+        :param interval: 重复触发的间隔（秒）
+        """
         self.value = value
         self.expired_time = expired_time
         self.loop_times = loop_times
+        self.interval = interval
         self.index = index
 
-    def is_expire(self):
-        if self.expired_time <= time.time():
+    def is_expire(self, current_time=None):
+        if current_time is None:
+            current_time = time.time()
+        if self.expired_time <= current_time:
             return True
         return None
+
+    def rearm(self) -> bool:
+        """消耗一次触发次数，还有剩余次数时设置下一次的到期时间.
+
+        :return: 是否需要再次入队
+        """
+        if self.interval <= 0:
+            return False
+
+        if self.loop_times < 0:
+            self.expired_time += self.interval
+            return True
+
+        if self.loop_times <= 1:
+            return False
+
+        self.loop_times -= 1
+        self.expired_time += self.interval
+        return True
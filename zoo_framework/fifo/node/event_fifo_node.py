@@ -29,6 +29,7 @@ class EventPriorityCalculator:
         create_time: float,
         wait_time_weight: float = 0.3,
         max_wait_time: float = 300.0,  # 5分钟
+        current_time: float | None = None,
     ) -> float:
         """计算综合优先级分数.
 
@@ -41,11 +42,13 @@ class EventPriorityCalculator:
             create_time: 创建时间戳
             wait_time_weight: 等待时间权重 (0-1)
             max_wait_time: 最大等待时间（秒）
+            current_time: 当前时间戳，默认为 time.time()，批量比较时传入同一时间保证一致
 
         Returns:
             综合优先级分数（越高越优先）
         """
-        current_time = time.time()
+        if current_time is None:
+            current_time = time.time()
         wait_time = max(0, current_time - create_time)
 
         # 计算等待时间加成（指数增长，但不超过 max_wait_time）
@@ -56,6 +59,22 @@ class EventPriorityCalculator:
         # 综合优先级 = 基础优先级 + 等待加成
         return priority + wait_bonus
 
+    @staticmethod
+    def max_wait_bonus(wait_time_weight: float = 0.3, max_wait_time: float = 300.0) -> float:
+        """等待时间加成的上限.
+
+        等待时间达到 max_wait_time 后加成不再增长，
+        基础优先级相差超过该值的事件之间顺序不会因等待而改变
+
+        Args:
+            wait_time_weight: 等待时间权重 (0-1)
+            max_wait_time: 最大等待时间（秒）
+
+        Returns:
+            最大加成
+        """
+        return max_wait_time * 2 * wait_time_weight
+
     @staticmethod
     def get_urgency_level(priority: int) -> str:
         """根据优先级获取紧急程度描述.
@@ -111,6 +130,11 @@ class EventNode:
     # 失败响应
     fail_response: Callable[..., Any] | None = None
 
+    # 有效优先级的等待时间权重
+    WAIT_TIME_WEIGHT: float = 0.3
+    # 有效优先级的最大等待时间（秒）
+    MAX_WAIT_TIME: float = 300.0
+
     def __init__(
         self,
         topic: str,
@@ -180,19 +204,23 @@ class EventNode:
         """
         return int(self.get_effective_priority())
 
-    def get_effective_priority(self) -> float:
+    def get_effective_priority(self, current_time: float | None = None) -> float:
         """获取有效优先级.
 
         P2 优化：使用 PriorityCalculator 计算
 
+        Args:
+            current_time: 当前时间戳，默认为 time.time()
+
         Returns:
             有效优先级分数
         """
         return EventPriorityCalculator.calculate(
             priority=self.priority,
             create_time=self.create_time,
-            wait_time_weight=0.3,
-            max_wait_time=300.0,
+            wait_time_weight=self.WAIT_TIME_WEIGHT,
+            max_wait_time=self.MAX_WAIT_TIME,
+            current_time=current_time,
         )
 
     def get_urgency(self) -> str:
@@ -0,0 +1,100 @@
+import bisect
+import time
+from collections import deque
+
+from .event_fifo import EventFIFO
+from .node import EventNode
+from .node.event_fifo_node import EventPriorityCalculator
+
+
+class PriorityEventFIFO(EventFIFO):
+    """优先级事件队列.
+
+    按基础优先级分桶存储事件，桶内保持先进先出。
+    同一个桶内越早入队的事件等待加成越大，因此桶头就是桶内有效优先级最高的事件，
+    随时间推移不需要重新计算整个队列，出队时只需比较各桶的桶头。
+    等待加成有上限，从高优先级的桶开始比较，基础优先级低到即使加满也追不上时提前结束，
+    所以 CRITICAL 事件总会排在大量 BACKGROUND 事件之前。
+    """
+
+    def _init_storage(self):
+        # 基础优先级 -> 事件桶
+        self._buckets: dict[int, deque] = {}
+        # 已存在的基础优先级，升序
+        self._priorities: list[int] = []
+        self._count = 0
+        self._max_bonus = EventPriorityCalculator.max_wait_bonus(
+            EventNode.WAIT_TIME_WEIGHT, EventNode.MAX_WAIT_TIME
+        )
+
+    def _put(self, value: EventNode):
+        bucket = self._buckets.get(value.priority)
+        if bucket is None:
+            bucket = deque()
+            self._buckets[value.priority] = bucket
+            bisect.insort(self._priorities, value.priority)
+        bucket.append(value)
+        self._count += 1
+
+    def _select_priority(self) -> int:
+        """选出桶头有效优先级最高的桶."""
+        current_time = time.time()
+        best_priority = None
+        best_score = None
+
+        for priority in reversed(self._priorities):
+            # 基础优先级加上最大等待加成也追不上时，后面的桶不需要再比较
+            if best_score is not None and priority + self._max_bonus < best_score:
+                break
+
+            node = self._buckets[priority][0]
+            score = node.get_effective_priority(current_time)
+            if best_score is None or score > best_score:
+                best_priority = priority
+                best_score = score
+
+        return best_priority
+
+    def _pop_bucket(self, priority: int) -> EventNode:
+        bucket = self._buckets[priority]
+        node = bucket.popleft()
+        if not bucket:
+            del self._buckets[priority]
+            self._priorities.remove(priority)
+        self._count -= 1
+        return node
+
+    def _get(self) -> EventNode:
+        return self._pop_bucket(self._select_priority())
+
+    def _drop(self):
+        """队列满时丢弃最低优先级桶中最旧的事件."""
+        self._pop_bucket(self._priorities[0])
+
+    def _peek(self) -> EventNode:
+        return self._buckets[self._select_priority()][0]
+
+    def _qsize(self) -> int:
+        return self._count
+
+    def _contains(self, value) -> bool:
+        return any(value in bucket for bucket in self._buckets.values())
+
+    def _replace(self, event):
+        for bucket in self._buckets.values():
+            try:
+                index = bucket.index(event)
+            except ValueError:
+                continue
+            old = bucket[index]
+            if old.priority == event.priority:
+                bucket[index] = event
+            else:
+                # 优先级变化时移动到新优先级的桶
+                del bucket[index]
+                self._count -= 1
+                if not bucket:
+                    del self._buckets[old.priority]
+                    self._priorities.remove(old.priority)
+                self._put(event)
+            return
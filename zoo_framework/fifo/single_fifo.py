@@ -8,6 +8,8 @@ class SingleFIFO(BaseFIFO):
 
     def __init__(self):
         BaseFIFO.__init__(self)
+        # 需要按下标访问，使用列表存储
+        self._fifo = []
         self.pop_pointer = 0
 
     def push_value(self, value):
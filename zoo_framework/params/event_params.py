@@ -6,3 +6,19 @@ from zoo_framework.core.aop import params
 class EventParams:
     EVENT_JOIN_TIMEOUT = ParamsPath(value="event:timeout", default=5)
     EVENT_SLEEP_TIME = ParamsPath(value="event:sleep", default=0.2)
+    # 每个事件通道的队列容量，0 表示不限制
+    EVENT_CHANNEL_CAPACITY = ParamsPath(value="event:channel:capacity", default=0)
+    # 每个事件通道同时处理事件的并发数
+    EVENT_CHANNEL_CONCURRENCY = ParamsPath(value="event:channel:concurrency", default=1)
+    # 反应器执行器：inline / thread / asyncio
+    EVENT_REACTOR_EXECUTOR = ParamsPath(value="event:reactor:executor", default="thread")
+    # 反应器执行器的线程数
+    EVENT_REACTOR_POOL_SIZE = ParamsPath(value="event:reactor:poolSize", default=8)
+    # 最多同时执行的反应器数，0 表示不限制
+    EVENT_REACTOR_MAX_IN_FLIGHT = ParamsPath(value="event:reactor:maxInFlight", default=64)
+    # 每个反应器默认的并发上限，0 表示不限制
+    EVENT_REACTOR_CONCURRENCY = ParamsPath(value="event:reactor:concurrency", default=0)
+    # 每个异步事件通道同时执行的处理方法数
+    EVENT_ASYNC_CONCURRENCY = ParamsPath(value="event:async:concurrency", default=1000)
+    # 所有异步事件通道共享的同时执行的处理方法上限
+    EVENT_ASYNC_MAX_HANDLERS = ParamsPath(value="event:async:maxHandlers", default=10000)
@@ -5,3 +5,20 @@ from zoo_framework.core.aop import params
 @params
 class StateMachineParams:
     PICKLE_PATH = ParamsPath(value="stateMachine:picklePath", default="./zooStates.pic")
+    # 存储方式，scope：每个作用域一个文件，保存在 PICKLE_PATH + ".scopes" 目录；
+    # single：所有作用域保存为一个文件；
+    # mmap：所有作用域保存为一个按列存储的快照文件，启动时内存映射，节点在访问时才加载；
+    # 只支持 POSIX 平台（Windows 不能替换正在映射的文件），其他平台按 single 保存
+    STORAGE_MODE = ParamsPath(value="stateMachine:storageMode", default="scope")
+    # 按作用域存储时并行写入的线程数
+    SCOPE_IO_WORKERS = ParamsPath(value="stateMachine:scopeIoWorkers", default=4)
+    # 是否使用预写日志增量持久化，关闭时每个周期保存完整快照
+    WAL_ENABLE = ParamsPath(value="stateMachine:wal:enable", default=True)
+    # 预写日志两次 fsync 的最长间隔（秒），崩溃时最多丢失这段时间内的修改
+    WAL_FSYNC_INTERVAL = ParamsPath(value="stateMachine:wal:fsyncInterval", default=1)
+    # 预写日志超过该大小（字节）时压缩为完整快照
+    WAL_COMPACT_SIZE = ParamsPath(value="stateMachine:wal:compactSize", default=16 * 1024 * 1024)
+    # 是否在 fork 出的子进程中保存完整快照（single / mmap 模式），不阻塞状态机的修改
+    BACKGROUND_SAVE = ParamsPath(value="stateMachine:backgroundSave", default=False)
+    # 后台保存的最长时间（秒），超时的子进程会被结束
+    BACKGROUND_SAVE_TIMEOUT = ParamsPath(value="stateMachine:backgroundSaveTimeout", default=60)
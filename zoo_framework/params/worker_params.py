@@ -8,5 +8,11 @@ class WorkerParams:
     WORKER_POOL_SIZE = ParamsPath(value="worker:pool:size", default=5)
     # worker 是否使用资源池
     WORKER_POOL_ENABLE = ParamsPath(value="worker:pool:enable", default=False)
-    # worker 运行策略，simple：直接运行；stable：稳定运行；safe：安全运行；
+    # worker 运行策略，simple：直接运行；stable：稳定运行；safe：安全运行；process：进程池运行；
     WORKER_RUN_POLICY = ParamsPath(value="worker:runPolicy", default="simple")
+    # worker 超时后等待协作式取消的宽限时间（秒），超过后强制中断线程
+    WORKER_TIMEOUT_GRACE = ParamsPath(value="worker:timeoutGrace", default=1)
+    # 进程池的启动方式，fork/forkserver/spawn
+    WORKER_PROCESS_START_METHOD = ParamsPath(
+        value="worker:process:startMethod", default="forkserver"
+    )
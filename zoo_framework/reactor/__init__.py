@@ -1,5 +1,25 @@
 from .event_reactor import EventReactor
 from .event_reactor_manager import EventReactorManager
+from .reactor_executor import (
+    AsyncioReactorExecutor,
+    BaseReactorExecutor,
+    InlineReactorExecutor,
+    ReactorExecutorFullError,
+    ThreadReactorExecutor,
+    create_reactor_executor,
+)
+from .topic_trie import TopicTrie
 from .waiter_result_reactor import WaiterResultReactor
 
-__all__ = ["EventReactor", "EventReactorManager", "WaiterResultReactor"]
+__all__ = [
+    "AsyncioReactorExecutor",
+    "BaseReactorExecutor",
+    "EventReactor",
+    "EventReactorManager",
+    "InlineReactorExecutor",
+    "ReactorExecutorFullError",
+    "ThreadReactorExecutor",
+    "TopicTrie",
+    "WaiterResultReactor",
+    "create_reactor_executor",
+]
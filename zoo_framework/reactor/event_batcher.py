@@ -0,0 +1,98 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from zoo_framework.utils import LogUtils
+
+from .event_reactor_req import EventReactorReq
+
+# 逗留超时后执行批次的线程池，定时线程只负责提交，不执行处理方法
+_flush_executor: ThreadPoolExecutor | None = None
+_flush_executor_lock = threading.Lock()
+
+
+def _get_flush_executor() -> ThreadPoolExecutor:
+    global _flush_executor
+    with _flush_executor_lock:
+        if _flush_executor is None:
+            _flush_executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="EventBatcherFlush"
+            )
+        return _flush_executor
+
+
+class EventBatcher:
+    """事件批次缓冲区.
+
+    按响应器合并事件请求，满足以下任一条件时把整批交给处理方法：
+    1. 缓冲的请求数达到 batch_size，在调用 add 的线程中直接执行
+    2. 第一个请求进入缓冲区后经过 max_linger_ms，由定时器触发并在线程池中执行
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        max_linger_ms: float,
+        handler: Callable[[list[EventReactorReq]], None],
+    ):
+        self.batch_size = max(1, int(batch_size))
+        self.max_linger_ms = max(0.0, float(max_linger_ms))
+        self._handler = handler
+        self._buffer: list[EventReactorReq] = []
+        self._lock = threading.Lock()
+        self._linger_handle = None
+        # 批次编号，每取出一批递增，用于忽略已过时的逗留定时器
+        self._generation = 0
+
+    def size(self) -> int:
+        """获取缓冲中的请求数."""
+        with self._lock:
+            return len(self._buffer)
+
+    def add(self, req: EventReactorReq) -> None:
+        """加入一个请求，批次已满时在当前线程执行."""
+        batch = None
+        with self._lock:
+            self._buffer.append(req)
+            if len(self._buffer) >= self.batch_size:
+                batch = self._take_batch()
+            elif len(self._buffer) == 1 and self.max_linger_ms > 0:
+                from zoo_framework.core.waiter.worker_timer import get_worker_timer
+
+                self._linger_handle = get_worker_timer().schedule(
+                    self.max_linger_ms / 1000, self._on_linger_timeout, self._generation
+                )
+
+        if batch:
+            self._handler(batch)
+
+    def flush(self) -> None:
+        """立即在当前线程执行缓冲中的请求."""
+        with self._lock:
+            batch = self._take_batch()
+        if batch:
+            self._handler(batch)
+
+    def _take_batch(self) -> list[EventReactorReq]:
+        """在锁内取出缓冲区并取消逗留定时器."""
+        batch, self._buffer = self._buffer, []
+        self._generation += 1
+        if self._linger_handle is not None:
+            self._linger_handle.cancel()
+            self._linger_handle = None
+        return batch
+
+    def _on_linger_timeout(self, generation: int) -> None:
+        with self._lock:
+            # 该批次已经因数量达到上限或 flush 被取出
+            if generation != self._generation:
+                return
+            batch = self._take_batch()
+        if batch:
+            _get_flush_executor().submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: list[EventReactorReq]) -> None:
+        try:
+            self._handler(batch)
+        except Exception as e:
+            LogUtils.error(f"Flush event batch failed: {e}", EventBatcher.__name__)
@@ -1,5 +1,12 @@
+import inspect
+import time
+
+from zoo_framework.utils.latency_histogram import WindowedHistogram
+from zoo_framework.utils.loop_thread import get_event_loop_thread
+
+from .event_batcher import EventBatcher
 from .event_priorities import EventPriorities
-from .event_reactor_req import EventReactorReq
+from .event_reactor_req import ChannelType, EventReactorReq
 from .event_retry_strategy import EventRetryStrategy
 
 
@@ -25,6 +32,35 @@ class EventReactor:
         self.retry_times = 0
         # 完成后的回调
         self.done_callback = None
+        # 批量模式：batch_size 大于 0 时处理方法接收 EventReactorReq 列表
+        self.batch_size = 0
+        self.max_linger_ms = 0
+        self._batcher: EventBatcher | None = None
+        # 反应器执行器中同时执行的上限，0 表示使用执行器的默认值
+        self.max_concurrency = 0
+        # 处理耗时直方图，批量模式下每批记录一次
+        self.latency = WindowedHistogram()
+
+    def set_max_concurrency(self, max_concurrency: int):
+        """设置反应器执行器中同时执行的上限."""
+        self.max_concurrency = max_concurrency
+
+    def set_batch(self, batch_size: int, max_linger_ms: float = 0):
+        """设置批量模式.
+
+        :param batch_size: 每批最多的事件数，0 表示关闭批量模式
+        :param max_linger_ms: 第一个事件进入批次后最多等待的毫秒数，0 表示只按数量触发
+        """
+        self.batch_size = batch_size
+        self.max_linger_ms = max_linger_ms
+        if batch_size > 0:
+            self._batcher = EventBatcher(batch_size, max_linger_ms, self.execute_batch)
+        else:
+            self._batcher = None
+
+    def is_batch(self) -> bool:
+        """是否为批量模式."""
+        return self._batcher is not None
 
     def set_done_callback(self, callback: callable):
         self.done_callback = callback
@@ -71,38 +107,76 @@ class EventReactor:
     # 根据重试策略，执行事件
     def _execute(self, topic, content):
         req = EventReactorReq(topic, content, self.reactor_name)
+        self._handle_with_retry(topic, content, req)
+
+    def _retry_attempts(self):
+        """按重试策略生成每一次尝试，调用方成功后停止迭代即可."""
         # 如果是失败后不再重试，直接执行
         if self.retry_strategy == EventRetryStrategy.RetryOnce:
             # 重试一次
             self.retry_times = 1
+        if self.retry_strategy in (EventRetryStrategy.RetryOnce, EventRetryStrategy.RetryTimes):
             while self.retry_times > 0:
-                try:
-                    self.handle_callback(req)
-                    return
-                except Exception as e:
-                    self.retry_times -= 1
-                    self._on_error(topic, content, e)
-        elif self.retry_strategy == EventRetryStrategy.RetryTimes:
-            while self.retry_times > 0:
-                try:
-                    self.handle_callback(req)
-                    return
-                except Exception as e:
-                    self.retry_times -= 1
-                    self._on_error(topic, content, e)
+                yield
+                self.retry_times -= 1
         elif (
             self.retry_strategy == EventRetryStrategy.RetryForever
             or self.retry_strategy == EventRetryStrategy.RetryNever
         ):
             while True:
-                try:
-                    self.handle_callback(req)
-                    return
-                except Exception as e:
-                    self._on_error(topic, content, e)
+                yield
         else:
             raise Exception("未知的事件重试策略")
 
+    def _call_handler(self, payload):
+        """调用处理方法，协程处理方法提交到共享事件循环并等待完成."""
+        result = self.handle_callback(payload)
+        if inspect.isawaitable(result):
+            return get_event_loop_thread().run(result)
+        return result
+
+    def _handle_with_retry(self, topic, content, payload):
+        """按重试策略调用处理方法，payload 为单个请求或批量模式下的请求列表."""
+        for _ in self._retry_attempts():
+            try:
+                self._call_handler(payload)
+                return
+            except Exception as e:
+                self._on_error(topic, content, e)
+
+    async def _async_handle_with_retry(self, topic, content, payload):
+        """按重试策略 await 处理方法."""
+        for _ in self._retry_attempts():
+            try:
+                result = self.handle_callback(payload)
+                if inspect.isawaitable(result):
+                    await result
+                return
+            except Exception as e:
+                self._on_error(topic, content, e)
+
+    def is_async(self) -> bool:
+        """处理方法是否为协程函数."""
+        return inspect.iscoroutinefunction(self.handle_callback)
+
+    async def execute_async(self, topic, content, channel: str = ChannelType.DEFAULT.value):
+        """在事件循环中执行事件，协程处理方法直接 await，不占用线程."""
+        if self.handle_callback is None:
+            return
+
+        start_time = time.monotonic()
+        try:
+            req = EventReactorReq(
+                topic, self._serialize_content(content), self.reactor_name, channel
+            )
+            await self._async_handle_with_retry(topic, content, req)
+            self._on_success(topic, content)
+        except Exception as e:
+            self._on_error(topic, content, e)
+        finally:
+            self.latency.record(time.monotonic() - start_time)
+            self._on_done(topic, content)
+
     def execute(self, topic, content):
         """执行事件."""
         # 获得执行方法
@@ -111,6 +185,7 @@ class EventReactor:
         if event_handler is None:
             return
 
+        start_time = time.monotonic()
         try:
             # 序列化事件内容
             _content = self._serialize_content(content)
@@ -122,5 +197,35 @@ class EventReactor:
             # 执行失败后的回调
             self._on_error(topic, content, e)
         finally:
+            self.latency.record(time.monotonic() - start_time)
             # 执行完成后的回调
             self._on_done(topic, content)
+
+    def submit(self, topic, content, channel: str = ChannelType.DEFAULT.value):
+        """提交事件，批量模式下先进入批次缓冲，否则直接执行."""
+        if self._batcher is None:
+            self.execute(topic, content)
+            return
+        self._batcher.add(EventReactorReq(topic, content, self.reactor_name, channel))
+
+    def flush(self):
+        """立即执行批次缓冲中的事件."""
+        if self._batcher is not None:
+            self._batcher.flush()
+
+    def execute_batch(self, reqs: list[EventReactorReq]):
+        """批量执行事件，回调中的 topic 和 content 为批次中所有事件的列表."""
+        if self.handle_callback is None or not reqs:
+            return
+
+        topics = [req.topic for req in reqs]
+        contents = [req.content for req in reqs]
+        start_time = time.monotonic()
+        try:
+            self._handle_with_retry(topics, contents, reqs)
+            self._on_success(topics, contents)
+        except Exception as e:
+            self._on_error(topics, contents, e)
+        finally:
+            self.latency.record(time.monotonic() - start_time)
+            self._on_done(topics, contents)
@@ -1,12 +1,15 @@
+import threading
 import uuid
 from typing import Any
 
 from zoo_framework.core.aop import cage
 from zoo_framework.utils import LogUtils
-from zoo_framework.utils.thread_safe_dict import ThreadSafeDict
+from zoo_framework.utils.latency_histogram import LatencyHistogram
+from zoo_framework.utils.thread_safe_dict import CopyOnWriteDict
 
 from .event_reactor import EventReactor
 from .event_reactor_req import ChannelType, EventReactorReq, get_channel_manager
+from .topic_trie import TopicTrie, is_wildcard_topic
 
 
 @cage
@@ -16,16 +19,34 @@ class EventReactorManager:
     P1 任务：支持事件通道隔离
     """
 
-    reactor_map = ThreadSafeDict()
+    # 主题 -> 响应器元组，写时复制，读取时不复制
+    reactor_map = CopyOnWriteDict()
+
+    # 路由表：(通道, 主题) -> 响应器元组，通道为 None 的条目包含所有通道的响应器
+    # 只在注册响应器或修改响应器通道时整体重建并替换，分发时无锁读取
+    _routing_table: dict[tuple[str | None, str], tuple[EventReactor, ...]] = {}
+    # 通配订阅：通道 -> 主题前缀树，通道为 None 的前缀树包含所有通道的通配订阅
+    _wildcard_tries: dict[str | None, TopicTrie] = {}
+    # 通配匹配结果缓存：(通道, 主题) -> 响应器元组，随路由表一起重建
+    _match_cache: dict[tuple[str | None, str], tuple[EventReactor, ...]] = {}
+    # 保护匹配结果缓存的淘汰和写入，读取不加锁
+    _match_cache_lock = threading.Lock()
+    # 构建路由表时通道管理器的版本号
+    _routing_version = -1
+    _routing_lock = threading.Lock()
+
+    # 通配匹配结果缓存的最大条目数
+    MATCH_CACHE_SIZE = 4096
 
     # 自动重命名
     auto_rename = True
 
     def __init__(self):
-        for value in self.reactor_map.values():
+        for reactors in self.reactor_map.values():
             from zoo_framework.params import EventParams
 
-            value.set_event_timeout(EventParams.EVENT_JOIN_TIMEOUT)
+            for reactor in reactors:
+                reactor.set_event_timeout(EventParams.EVENT_JOIN_TIMEOUT)
 
     @classmethod
     def dispatch(
@@ -41,19 +62,13 @@ class EventReactorManager:
             reactor_name: 响应器名称
             channel: 通道名称（P1 新增）
         """
-        reactor = cls.get_reactor(reactor_name)
+        reactor_names = None if reactor_name == "default" else [reactor_name]
 
-        # P1：创建带通道信息的事件请求
-        event_req = EventReactorReq(
-            topic=topic, content=content, reactor_name=reactor_name, channel=channel
-        )
-
-        # 验证通道权限
-        if not cls._validate_channel(reactor_name, event_req):
-            LogUtils.warning(f"⚠️ Reactor '{reactor_name}' cannot handle channel '{channel}'")
-            return
+        # P1：按主题获得响应器，并按名称和通道过滤
+        reactors = cls.get_reactor(topic, reactor_names, channel)
 
-        reactor.execute(topic, content)
+        for reactor in reactors:
+            reactor.execute(topic, content)
 
     @classmethod
     def get_reactor(
@@ -71,26 +86,88 @@ class EventReactorManager:
         Returns:
             响应器列表
         """
-        result = cls.reactor_map.get(topic)
+        # P1：指定通道时路由表中已经按通道过滤
+        result = cls.get_routes(topic, channel)
 
-        if result is None:
+        if not result:
             return []
 
-        filter_result = []
-        for reactor in result:
-            # P1：按名称过滤
-            if reactor_names is not None and reactor.reactor_name not in reactor_names:
-                continue
+        if reactor_names is None:
+            return list(result)
 
-            # P1：按通道过滤
-            if channel is not None and not cls._validate_channel(
-                reactor.reactor_name, EventReactorReq(topic, None, reactor.reactor_name, channel)
-            ):
-                continue
+        # P1：按名称过滤
+        return [reactor for reactor in result if reactor.reactor_name in reactor_names]
+
+    @classmethod
+    def get_routes(cls, topic: str, channel: str | None = None) -> tuple[EventReactor, ...]:
+        """从路由表中获取匹配该通道和主题的响应器.
 
-            filter_result.append(reactor)
+        精确订阅直接查路由表，存在通配订阅时再经主题前缀树匹配，匹配结果会被缓存
 
-        return filter_result
+        Args:
+            topic: 事件主题
+            channel: 通道名称，None 表示不按通道过滤
+
+        Returns:
+            响应器元组，精确订阅在前，通配订阅按注册顺序在后
+        """
+        # 通道配置可能绕过 register_reactor_channels 直接修改，版本号变化时重建
+        if cls._routing_version != get_channel_manager().version:
+            cls._rebuild_routing()
+
+        # 三者在重建时一起替换，先取出引用，避免把旧的匹配结果写入新的缓存
+        routing_table, wildcard_tries, match_cache = (
+            cls._routing_table,
+            cls._wildcard_tries,
+            cls._match_cache,
+        )
+        key = (channel, topic)
+        routes = routing_table.get(key, ())
+        if not wildcard_tries:
+            return routes
+
+        cached = match_cache.get(key)
+        if cached is not None:
+            return cached
+
+        trie = wildcard_tries.get(channel)
+        if trie is not None:
+            # 同一个响应器可能同时匹配精确订阅和多个通配订阅（如 sensor.* 与 sensor.#），只保留一次
+            routes = tuple(dict.fromkeys((*routes, *trie.match(topic))))
+
+        with cls._match_cache_lock:
+            if len(match_cache) >= cls.MATCH_CACHE_SIZE:
+                # 主题数量可能不受限（如带设备 id 的主题），超出上限时淘汰最早的缓存
+                match_cache.pop(next(iter(match_cache)), None)
+            match_cache[key] = routes
+        return routes
+
+    @classmethod
+    def _rebuild_routing(cls) -> None:
+        """重建 (通道, 主题) -> 响应器 的路由表和通配订阅前缀树."""
+        channel_manager = get_channel_manager()
+        with cls._routing_lock:
+            version = channel_manager.version
+            routing_table: dict[tuple[str | None, str], list[EventReactor]] = {}
+            wildcard_tries: dict[str | None, TopicTrie] = {}
+            for topic, reactors in cls.reactor_map.items():
+                wildcard = is_wildcard_topic(topic)
+                for reactor in reactors:
+                    channels = [None, *channel_manager.get_reactor_channels(reactor.reactor_name)]
+                    for channel in channels:
+                        if wildcard:
+                            trie = wildcard_tries.get(channel)
+                            if trie is None:
+                                trie = TopicTrie()
+                                wildcard_tries[channel] = trie
+                            trie.insert(topic, reactor)
+                        else:
+                            routing_table.setdefault((channel, topic), []).append(reactor)
+
+            cls._routing_table = {key: tuple(value) for key, value in routing_table.items()}
+            cls._wildcard_tries = wildcard_tries
+            cls._match_cache = {}
+            cls._routing_version = version
 
     @classmethod
     def _validate_channel(cls, reactor_name: str, event_req: EventReactorReq) -> bool:
@@ -120,8 +197,35 @@ class EventReactorManager:
         """
         channel_manager = get_channel_manager()
         channel_manager.register_reactor_channels(reactor_name, channels)
+        cls._rebuild_routing()
         LogUtils.info(f"✅ Reactor '{reactor_name}' registered to channels: {channels}")
 
+    @classmethod
+    def get_reactor_latency(cls) -> dict[str, dict]:
+        """获取所有响应器各滑动窗口的处理耗时统计.
+
+        Returns:
+            响应器名称 -> {窗口名称 -> 统计快照}
+        """
+        return {name: reactor.latency.snapshot() for name, reactor in cls._get_reactors().items()}
+
+    @classmethod
+    def get_reactor_total_latency(cls) -> dict[str, LatencyHistogram]:
+        """获取所有响应器启动以来的处理耗时直方图.
+
+        Returns:
+            响应器名称 -> 直方图
+        """
+        return {name: reactor.latency.window() for name, reactor in cls._get_reactors().items()}
+
+    @classmethod
+    def _get_reactors(cls) -> dict[str, EventReactor]:
+        reactors = {}
+        for topic_reactors in cls.reactor_map.values():
+            for reactor in topic_reactors:
+                reactors[reactor.reactor_name] = reactor
+        return reactors
+
     @classmethod
     def get_reactor_name_list(cls):
         """获取事件处理器名称列表."""
@@ -136,23 +240,19 @@ class EventReactorManager:
     def bind_topic_reactor(cls, topic: str, reactor: EventReactor) -> bool:
         """注册事件处理器
         这个方法可以被重写，以实现不同的事件注册方式，比如设置重试机制等.
+        topic 可以使用通配符，* 匹配一层，# 匹配零层或多层（只能在最后一层）.
         """
-        # 如果自动重命名，则自动重命名
-        if cls.reactor_map.get(topic) is None:
-            cls.reactor_map[topic] = []
-
-        # 如果名称已经存在，则不注册
-
-        # 寻找是否已经存在
-        if reactor in cls.reactor_map[topic]:
-            # 判断重命名策略
+        if is_wildcard_topic(topic):
+            # 提前校验通配符位置，避免重建路由表时才失败
+            TopicTrie().insert(topic, reactor)
+        # 如果名称已经存在，则按重命名策略处理
+        if reactor in cls.reactor_map.get(topic, ()):
             if cls.auto_rename is False:
                 return False
             cls.auto_rename_reactor(reactor)
-            cls.reactor_map[topic].append(reactor)
-            return True
 
-        cls.reactor_map[topic].append(reactor)
+        cls.reactor_map.update_value(topic, lambda reactors: (*reactors, reactor), ())
+        cls._rebuild_routing()
         return True
 
     @classmethod
@@ -168,19 +268,8 @@ class EventReactorManager:
             content: 事件内容
             channel: 目标通道
         """
-        channel_manager = get_channel_manager()
-
-        # 获取该通道下所有的响应器
-        all_reactors = []
-        for reactor_name in cls.get_reactor_name_list():
-            if channel_manager.can_handle_event(
-                reactor_name, EventReactorReq(topic, content, reactor_name, channel)
-            ):
-                reactors = cls.get_reactor(topic, [reactor_name], channel)
-                all_reactors.extend(reactors)
-
-        # 执行所有匹配的响应器
-        for reactor in all_reactors:
+        # 执行路由表中该通道和主题的所有响应器
+        for reactor in cls.get_routes(topic, channel):
             try:
                 reactor.execute(topic, content)
             except Exception as e:
@@ -106,6 +106,8 @@ class ChannelManager:
     def __init__(self):
         self._channels: dict[str, set[str]] = {}  # 通道 -> 主题集合
         self._reactor_channels: dict[str, list[str]] = {}  # 响应器 -> 通道列表
+        # 响应器通道配置的版本号，每次修改后递增，用于判断路由表是否需要重建
+        self.version = 0
 
     def register_channel(self, channel: str, topics: list[str] | None = None) -> None:
         """注册通道
@@ -128,6 +130,18 @@ class ChannelManager:
             channels: 监听的通道列表
         """
         self._reactor_channels[reactor_name] = channels
+        self.version += 1
+
+    def get_reactor_channels(self, reactor_name: str) -> list[str]:
+        """获取响应器监听的通道，未注册时监听默认通道
+
+        Args:
+            reactor_name: 响应器名称
+
+        Returns:
+            通道列表
+        """
+        return self._reactor_channels.get(reactor_name, [ChannelType.DEFAULT.value])
 
     def is_channel_valid(self, channel: str) -> bool:
         """检查通道是否有效
@@ -153,7 +167,7 @@ class ChannelManager:
             是否可以处理
         """
         # 获取响应器监听的通道
-        allowed_channels = self._reactor_channels.get(reactor_name, [ChannelType.DEFAULT.value])
+        allowed_channels = self.get_reactor_channels(reactor_name)
 
         # 检查事件通道是否在允许列表中
         return event.match_channel(allowed_channels)
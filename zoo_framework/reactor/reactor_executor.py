@@ -0,0 +1,266 @@
+"""事件反应器执行器.
+
+负责执行事件反应器，提供三种模式：
+    inline: 在调用线程中直接执行
+    thread: 在线程池中执行，阻塞 I/O 的反应器可以重叠执行
+    asyncio: 在共享事件循环中执行，协程处理方法直接 await，同步处理方法交给执行器的线程池
+所有模式共用在途窗口（最多同时执行的反应器数）和每个反应器的并发上限，
+窗口或反应器并发已满时 submit 会阻塞调用方，背压传递回事件通道的队列。
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from zoo_framework.utils import LogUtils
+from zoo_framework.utils.loop_thread import get_event_loop_thread
+
+from .event_reactor import EventReactor
+
+REACTOR_EXECUTOR_INLINE = "inline"
+REACTOR_EXECUTOR_THREAD = "thread"
+REACTOR_EXECUTOR_ASYNCIO = "asyncio"
+
+
+class ReactorExecutorFullError(Exception):
+    """在途窗口或反应器并发在超时时间内没有空位."""
+
+
+class BaseReactorExecutor(ABC):
+    """反应器执行器基类.
+
+    子类只需要实现 _start，负责把任务交给具体的执行方式并返回 Future
+    """
+
+    # 是否在事件循环中直接 await 协程函数；否则协程处理方法由反应器在共享事件循环中等待
+    runs_coroutines = False
+
+    def __init__(
+        self,
+        max_in_flight: int = 0,
+        reactor_concurrency: int = 0,
+        submit_timeout: float | None = None,
+    ):
+        """初始化执行器.
+
+        Args:
+            max_in_flight: 最多同时执行的反应器数，0 表示不限制
+            reactor_concurrency: 每个反应器默认的并发上限，0 表示不限制，
+                反应器设置了 max_concurrency 时以反应器为准
+            submit_timeout: submit 等待空位的超时时间（秒），None 表示一直等待
+        """
+        self.max_in_flight = max_in_flight
+        self.reactor_concurrency = reactor_concurrency
+        self.submit_timeout = submit_timeout
+
+        self._window = threading.BoundedSemaphore(max_in_flight) if max_in_flight > 0 else None
+        self._reactor_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._in_flight: set[Future] = set()
+
+    def _get_reactor_slot(self, reactor: EventReactor) -> threading.BoundedSemaphore | None:
+        limit = getattr(reactor, "max_concurrency", 0) or self.reactor_concurrency
+        if limit <= 0:
+            return None
+        with self._lock:
+            slot = self._reactor_slots.get(reactor.reactor_name)
+            if slot is None:
+                slot = threading.BoundedSemaphore(limit)
+                self._reactor_slots[reactor.reactor_name] = slot
+            return slot
+
+    def _acquire(self, semaphore: threading.BoundedSemaphore | None, deadline: float | None):
+        if semaphore is None:
+            return
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not semaphore.acquire(timeout=timeout):
+            raise ReactorExecutorFullError(
+                f"Reactor executor is full, max in flight: {self.max_in_flight}"
+            )
+
+    def submit(self, reactor: EventReactor, fn: Callable[..., Any], *args) -> Future:
+        """提交反应器任务，窗口或反应器并发已满时阻塞.
+
+        Args:
+            reactor: 事件反应器，用于按反应器限制并发
+            fn: 执行函数
+            *args: 执行参数
+
+        Returns:
+            任务的 Future
+
+        Raises:
+            ReactorExecutorFullError: 在 submit_timeout 内没有等到空位
+        """
+        deadline = None
+        if self.submit_timeout is not None:
+            deadline = time.monotonic() + self.submit_timeout
+
+        reactor_slot = self._get_reactor_slot(reactor)
+        self._acquire(reactor_slot, deadline)
+        try:
+            self._acquire(self._window, deadline)
+        except ReactorExecutorFullError:
+            if reactor_slot is not None:
+                reactor_slot.release()
+            raise
+
+        def release(_future: Future):
+            with self._lock:
+                self._in_flight.discard(_future)
+            if self._window is not None:
+                self._window.release()
+            if reactor_slot is not None:
+                reactor_slot.release()
+
+        try:
+            future = self._start(fn, args)
+        except Exception:
+            if self._window is not None:
+                self._window.release()
+            if reactor_slot is not None:
+                reactor_slot.release()
+            raise
+
+        with self._lock:
+            self._in_flight.add(future)
+        future.add_done_callback(release)
+        return future
+
+    @abstractmethod
+    def _start(self, fn: Callable[..., Any], args: tuple) -> Future:
+        """启动一次反应器调用，返回代表该调用的 Future."""
+        pass
+
+    def in_flight(self) -> int:
+        """获取正在执行的反应器任务数."""
+        with self._lock:
+            return len(self._in_flight)
+
+    def join(self, timeout: float | None = None) -> bool:
+        """等待所有在途任务完成.
+
+        Args:
+            timeout: 超时时间（秒），None 表示一直等待
+
+        Returns:
+            是否全部完成
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                pending = set(self._in_flight)
+            if not pending:
+                return True
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            # 等待期间可能有新的任务提交，循环直到在途集合为空
+            wait(pending, timeout=remaining)
+
+    def shutdown(self, wait: bool = True):
+        """关闭执行器，wait 为 True 时等待在途任务完成；持有线程池的子类在此关闭线程池."""
+        if wait:
+            self.join()
+
+
+class InlineReactorExecutor(BaseReactorExecutor):
+    """在调用线程中直接执行反应器."""
+
+    def _start(self, fn: Callable[..., Any], args: tuple) -> Future:
+        future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class ThreadReactorExecutor(BaseReactorExecutor):
+    """在线程池中执行反应器."""
+
+    def __init__(self, max_workers: int = 8, **kwargs):
+        super().__init__(**kwargs)
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ReactorExecutor"
+        )
+
+    def _start(self, fn: Callable[..., Any], args: tuple) -> Future:
+        return self._executor.submit(fn, *args)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+class AsyncioReactorExecutor(BaseReactorExecutor):
+    """在共享事件循环中执行反应器.
+
+    协程函数在事件循环中直接 await，同步函数通过 run_in_executor 交给执行器自己的线程池；
+    事件循环由框架内的异步代码共用，关闭执行器时不会停止
+    """
+
+    runs_coroutines = True
+
+    def __init__(self, max_workers: int = 8, **kwargs):
+        super().__init__(**kwargs)
+        self.max_workers = max_workers
+        self._loop_thread = get_event_loop_thread()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ReactorExecutor"
+        )
+
+    async def _run(self, fn: Callable[..., Any], args: tuple):
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._executor, fn, *args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def _start(self, fn: Callable[..., Any], args: tuple) -> Future:
+        return self._loop_thread.submit(self._run(fn, args))
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+def create_reactor_executor(mode: str = REACTOR_EXECUTOR_THREAD, **kwargs) -> BaseReactorExecutor:
+    """按模式创建反应器执行器.
+
+    Args:
+        mode: inline / thread / asyncio，未知模式使用 thread
+        **kwargs: 执行器参数（max_workers、max_in_flight、reactor_concurrency、submit_timeout）
+
+    Returns:
+        反应器执行器
+    """
+    if mode == REACTOR_EXECUTOR_INLINE:
+        kwargs.pop("max_workers", None)
+        return InlineReactorExecutor(**kwargs)
+    if mode == REACTOR_EXECUTOR_ASYNCIO:
+        return AsyncioReactorExecutor(**kwargs)
+    if mode != REACTOR_EXECUTOR_THREAD:
+        LogUtils.warning(f"Unknown reactor executor: {mode}, use thread")
+    return ThreadReactorExecutor(**kwargs)
+
+
+__all__ = [
+    "REACTOR_EXECUTOR_ASYNCIO",
+    "REACTOR_EXECUTOR_INLINE",
+    "REACTOR_EXECUTOR_THREAD",
+    "AsyncioReactorExecutor",
+    "BaseReactorExecutor",
+    "InlineReactorExecutor",
+    "ReactorExecutorFullError",
+    "ThreadReactorExecutor",
+    "create_reactor_executor",
+]
@@ -0,0 +1,115 @@
+"""主题前缀树.
+
+支持 MQTT 风格的通配订阅，主题按 "." 分层：
+    * 匹配恰好一层，例如 sensor.*.temp 匹配 sensor.kitchen.temp
+    # 匹配零层或多层，只能出现在最后一层，例如 sensor.# 匹配 sensor 和 sensor.kitchen.temp
+匹配时按主题层级逐层向下查找，复杂度与主题深度相关，与订阅数量无关。
+"""
+
+import itertools
+from typing import Any
+
+TOPIC_SEPARATOR = "."
+SINGLE_LEVEL_WILDCARD = "*"
+MULTI_LEVEL_WILDCARD = "#"
+
+
+def is_wildcard_topic(topic: str) -> bool:
+    """主题是否包含通配符."""
+    return any(
+        level in (SINGLE_LEVEL_WILDCARD, MULTI_LEVEL_WILDCARD)
+        for level in topic.split(TOPIC_SEPARATOR)
+    )
+
+
+class _TopicNode:
+    __slots__ = ("children", "multi_values", "values")
+
+    def __init__(self):
+        self.children: dict[str, _TopicNode] = {}
+        # 在该层结束的订阅
+        self.values: list[tuple[int, Any]] = []
+        # 在该层之后以 # 结尾的订阅
+        self.multi_values: list[tuple[int, Any]] = []
+
+
+class TopicTrie:
+    """主题前缀树，值按插入顺序返回."""
+
+    def __init__(self):
+        self._root = _TopicNode()
+        self._counter = itertools.count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, pattern: str, value: Any) -> None:
+        """插入订阅.
+
+        Args:
+            pattern: 订阅主题，可以包含通配符
+            value: 订阅的值
+
+        Raises:
+            ValueError: # 不在最后一层时
+        """
+        levels = pattern.split(TOPIC_SEPARATOR)
+        entry = (next(self._counter), value)
+        node = self._root
+        for index, level in enumerate(levels):
+            if level == MULTI_LEVEL_WILDCARD:
+                if index != len(levels) - 1:
+                    raise ValueError(f"'#' must be the last level of topic: {pattern}")
+                node.multi_values.append(entry)
+                self._size += 1
+                return
+            child = node.children.get(level)
+            if child is None:
+                child = _TopicNode()
+                node.children[level] = child
+            node = child
+
+        node.values.append(entry)
+        self._size += 1
+
+    def match(self, topic: str) -> list[Any]:
+        """获取匹配主题的所有订阅值.
+
+        Args:
+            topic: 事件主题，不包含通配符
+
+        Returns:
+            按插入顺序排列的订阅值
+        """
+        matched: list[tuple[int, Any]] = []
+        nodes = [self._root]
+        for level in topic.split(TOPIC_SEPARATOR):
+            next_nodes = []
+            for node in nodes:
+                matched.extend(node.multi_values)
+                child = node.children.get(level)
+                if child is not None:
+                    next_nodes.append(child)
+                child = node.children.get(SINGLE_LEVEL_WILDCARD)
+                if child is not None:
+                    next_nodes.append(child)
+            nodes = next_nodes
+            if not nodes:
+                break
+
+        for node in nodes:
+            matched.extend(node.multi_values)
+            matched.extend(node.values)
+
+        matched.sort(key=lambda entry: entry[0])
+        return [value for _, value in matched]
+
+
+__all__ = [
+    "MULTI_LEVEL_WILDCARD",
+    "SINGLE_LEVEL_WILDCARD",
+    "TOPIC_SEPARATOR",
+    "TopicTrie",
+    "is_wildcard_topic",
+]
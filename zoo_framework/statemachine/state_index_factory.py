@@ -8,7 +8,7 @@ from abc import ABC, abstractmethod
 from typing import Any
 
 from zoo_framework.statemachine.state_node import StateNode
-from zoo_framework.utils.thread_safe_dict import ThreadSafeDict
+from zoo_framework.utils.thread_safe_dict import StripedThreadSafeDict
 
 
 class StateIndex(ABC):
@@ -51,11 +51,11 @@ class StateIndex(ABC):
 class ThreadSafeDictIndex(StateIndex):
     """线程安全字典索引.
 
-    基于 ThreadSafeDict 的索引实现
+    基于分片加锁的 StripedThreadSafeDict 实现，不同键的写入互不阻塞
     """
 
     def __init__(self):
-        self._index = ThreadSafeDict()
+        self._index = StripedThreadSafeDict()
 
     def get(self, key: str) -> StateNode | None:
         return self._index.get(key)
@@ -64,17 +64,13 @@ class ThreadSafeDictIndex(StateIndex):
         self._index[key] = node
 
     def remove(self, key: str) -> StateNode | None:
-        if key in self._index:
-            node = self._index[key]
-            del self._index[key]
-            return node
-        return None
+        return self._index.pop(key, None)
 
     def has(self, key: str) -> bool:
         return key in self._index
 
     def get_all(self) -> dict[str, StateNode]:
-        return dict(self._index)
+        return self._index.copy()
 
     def find_by_prefix(self, prefix: str) -> list[StateNode]:
         """根据前缀查找节点."""
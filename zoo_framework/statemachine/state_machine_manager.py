@@ -1,7 +1,10 @@
+import threading
+from collections.abc import Callable
 from typing import Any
 
 from zoo_framework.core.aop import cage
 from zoo_framework.statemachine.state_scope import StateScope
+from zoo_framework.statemachine.state_wal import WAL_OP_REMOVE, WAL_OP_SET
 from zoo_framework.utils.thread_safe_dict import ThreadSafeDict
 
 
@@ -23,42 +26,117 @@ class StateMachineManager:
         # 本地存储时间间隔
         self._local_store_interval = 0
 
+        # 修改监听器，set_state / remove_state 后以 (操作, 作用域, 键, 值) 调用
+        self._mutation_listeners: tuple[Callable[[str, str, str, Any], None], ...] = ()
+
+        # 作用域加载器，作用域不在内存中时按需读取，未设置时不加载
+        self._scope_loader: Callable[[str], StateScope | None] | None = None
+        # 上次保存后被移除的作用域，以及正在删除文件的作用域；
+        # 两者中的作用域不会再通过加载器读取已过时的文件
+        self._removed_scopes: set[str] = set()
+        self._deleting_scopes: set[str] = set()
+        self._removed_lock = threading.Lock()
+
+        # 修改锁，set_state / remove_state 的修改和通知在锁内完成；
+        # 后台保存在 fork 期间持有，子进程不会看到只完成一半的修改
+        self._mutation_lock = threading.RLock()
+
+    def get_mutation_lock(self) -> threading.RLock:
+        """获取修改锁."""
+        return self._mutation_lock
+
+    def set_scope_loader(self, loader: Callable[[str], StateScope | None] | None):
+        """设置作用域加载器，第一次访问作用域时读取."""
+        self._scope_loader = loader
+
+    def take_removed_scopes(self) -> set[str]:
+        """取出上次保存后被移除的作用域，删除完成后调用 finish_removed_scopes."""
+        with self._removed_lock:
+            removed, self._removed_scopes = self._removed_scopes, set()
+            self._deleting_scopes |= removed
+        return removed
+
+    def finish_removed_scopes(self, scopes: set[str], success: bool = True):
+        """结束作用域文件的删除，失败时在下次保存时重新删除.
+
+        Args:
+            scopes: take_removed_scopes 取出的作用域
+            success: 是否删除成功
+        """
+        with self._removed_lock:
+            self._deleting_scopes -= scopes
+            if not success:
+                self._removed_scopes |= scopes
+
+    def _is_removed(self, scope: str) -> bool:
+        with self._removed_lock:
+            return scope in self._removed_scopes or scope in self._deleting_scopes
+
+    def _get_scope(self, scope: str) -> StateScope | None:
+        """获取作用域，不在内存中时通过加载器读取；已移除的作用域不再读取."""
+        state_scope = self._state_scope_map.get(scope)
+        if state_scope is not None or self._scope_loader is None:
+            return state_scope
+        if self._is_removed(scope):
+            return None
+
+        state_scope = self._scope_loader(scope)
+        if state_scope is None:
+            return None
+        # 并发加载同一作用域时以先放入的为准
+        return self._state_scope_map.setdefault(scope, state_scope)
+
+    def add_mutation_listener(self, listener: Callable[[str, str, str, Any], None]):
+        """添加修改监听器，用于增量持久化."""
+        self._mutation_listeners = (*self._mutation_listeners, listener)
+
+    def remove_mutation_listener(self, listener: Callable[[str, str, str, Any], None]):
+        """移除修改监听器."""
+        self._mutation_listeners = tuple(
+            item for item in self._mutation_listeners if item is not listener
+        )
+
+    def _notify_mutation(self, op: str, scope: str, key: str, value: Any = None):
+        for listener in self._mutation_listeners:
+            listener(op, scope, key, value)
+
     def have_loaded(self):
         """是否已经加载."""
         return self._local_store_loaded
 
     def load_state_machines(self, state_machine=None):
         """加载状态机."""
-        if state_machine is not None and isinstance(state_machine, dict):
+        if isinstance(state_machine, ThreadSafeDict):
             self._state_scope_map = state_machine
+        elif isinstance(state_machine, dict):
+            self._state_scope_map = ThreadSafeDict(state_machine)
         self._local_store_loaded = True
 
     def get_and_create_scope(self, scope: str):
-        """获取并创建作用域."""
-        if self._state_scope_map.get(scope) is None:
-            self.create_scope(scope)
-        return self._state_scope_map[scope]
+        """获取并创建作用域，作用域已保存但未加载时先加载."""
+        state_scope = self._get_scope(scope)
+        if state_scope is None:
+            state_scope = self._state_scope_map.setdefault(scope, StateScope())
+        return state_scope
 
     def create_scope(self, scope: str):
         """创建作用域."""
-        if self._state_scope_map.has_key(scope):
-            return
-        self._state_scope_map[scope] = StateScope()
+        self.get_and_create_scope(scope)
 
     def set_state(self, scope: str, key: str, value):
         """设置状态节点的值."""
-        if self._state_scope_map.get(scope) is None:
-            self.create_scope(scope)
-
-        state_register = self._state_scope_map[scope]
-        state_register.set_state_node(key, value)
+        # 在修改锁内获取作用域，避免写入已被 remove_state 移除的作用域
+        with self._mutation_lock:
+            state_register = self.get_and_create_scope(scope)
+            state_register.set_state_node(key, value)
+            self._notify_mutation(WAL_OP_SET, scope, key, value)
 
     def get_state(self, scope: str, key: str) -> Any:
         """获取状态节点."""
-        if self._state_scope_map.get(scope) is None:
+        state_register = self._get_scope(scope)
+        if state_register is None:
             return None
 
-        state_register = self._state_scope_map[scope]
         node = state_register.get_state_node(key)
         if None is node:
             return None
@@ -67,35 +145,35 @@ class StateMachineManager:
 
     def remove_state(self, scope: str, key: str):
         """移除状态节点."""
-        if self._state_scope_map.get(scope) is None:
-            return None
-
-        if self._state_scope_map[scope].get_state_node(key) is None:
-            return None
-
-        # 移除状态节点
-        state_register: StateScope = self._state_scope_map[scope]
-        node = state_register.get_state_node(key)
-
-        value = node.get_value()
-        state_register.remove_state_node(key)
-
-        # 如果是头部节点，移除作用域
-        if node.is_top():
-            self._state_scope_map.pop(scope)
-
+        with self._mutation_lock:
+            state_register = self._get_scope(scope)
+            if state_register is None:
+                return None
+
+            # 移除状态节点
+            node = state_register.get_state_node(key)
+            if node is None:
+                return None
+
+            value = node.get_value()
+            state_register.remove_state_node(key)
+
+            # 如果是头部节点，移除作用域
+            if node.is_top():
+                self._state_scope_map.pop(scope, None)
+                with self._removed_lock:
+                    self._removed_scopes.add(scope)
+
+            self._notify_mutation(WAL_OP_REMOVE, scope, key)
         return value
 
     def get_state_machines(self):
-        """获取状态机."""
+        """获取状态机，设置了作用域加载器时只包含已加载的作用域."""
         return self._state_scope_map
 
     def observe_state(self, scope: str, key: str, effect: callable):
         """观察状态节点."""
-        if self._state_scope_map.get(scope) is None:
-            self.create_scope(scope)
-
-        state_register: StateScope = self._state_scope_map[scope]
+        state_register = self.get_and_create_scope(scope)
         state_register.observe_state_node(key, effect)
 
     def unobserve_state(self, scope: str, key: str, effect: callable):
@@ -109,8 +187,8 @@ class StateMachineManager:
         Raises:
             KeyError: 如果作用域或状态不存在
         """
-        if self._state_scope_map.get(scope) is None:
+        state_register = self._get_scope(scope)
+        if state_register is None:
             raise KeyError(f"Scope '{scope}' not found")
 
-        state_register: StateScope = self._state_scope_map[scope]
         state_register.unobserve_state_node(key, effect)
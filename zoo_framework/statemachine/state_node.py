@@ -30,6 +30,17 @@ class StateNode:
         self._effect_list = effect_list
         self.key = key
 
+    @classmethod
+    def restore(
+        cls, key: str, value: Any, version: int, node_type: StateNodeType | None, is_top: bool
+    ) -> StateNode:
+        """从快照恢复状态节点，不触发副作用，也不更新版本号."""
+        node = cls(key, value)
+        node._version = version
+        node._type = node_type
+        node._is_top = is_top
+        return node
+
     def set_top(self, is_top: bool) -> None:
         """设置是否是根节点."""
         self._is_top = is_top
@@ -111,7 +122,11 @@ class StateNode:
 
     def _update_version(self) -> None:
         """更新状态节点的版本号."""
-        self.version = int(time.time())
+        self._version = int(time.time())
+
+    def get_version(self) -> int:
+        """获取状态节点的版本号."""
+        return self._version
 
     def get_state(self) -> Any:
         """获取状态节点的值."""
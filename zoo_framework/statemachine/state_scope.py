@@ -1,4 +1,7 @@
 import copy
+import os
+import threading
+import weakref
 from typing import Any
 
 from zoo_framework.statemachine.state_index_factory import StateIndex, StateIndexFactory
@@ -6,6 +9,19 @@ from zoo_framework.statemachine.state_node import StateNode
 from zoo_framework.statemachine.state_node_type import StateNodeType
 from zoo_framework.utils import LogUtils
 
+# 由快照支持的状态域，fork 出的子进程中重新创建它们的快照锁
+_snapshot_scopes: "weakref.WeakSet[StateScope]" = weakref.WeakSet()
+
+
+def _reinit_snapshot_locks_after_fork():
+    """子进程中重新创建快照锁，fork 时被其他线程持有的锁在子进程中永远不会释放."""
+    for state_scope in list(_snapshot_scopes):
+        state_scope._snapshot_lock = threading.RLock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_snapshot_locks_after_fork)
+
 
 class StateScope:
     """状态域 - P2 优化版本.
@@ -17,8 +33,14 @@ class StateScope:
 
     Attributes:
         _state_index: 状态节点索引
+        _dirty: 上次保存后是否被修改
+        _snapshot: 尚未加载到索引中的快照节点，None 表示全部节点都在索引中
     """
 
+    # 旧版本保存的作用域没有这些属性，使用类属性作为默认值
+    _dirty = False
+    _snapshot = None
+
     def __init__(self, index_type: str = "dict"):
         """初始化状态域.
 
@@ -29,6 +51,92 @@ class StateScope:
         """
         # P2 优化：使用工厂模式创建索引
         self._state_index: StateIndex = StateIndexFactory.create_index(index_type)
+        self._dirty = False
+
+    @classmethod
+    def from_snapshot(cls, snapshot, index_type: str = "dict") -> "StateScope":
+        """创建由快照支持的状态域，节点在第一次访问时才从快照加载.
+
+        Args:
+            snapshot: 作用域快照（ScopeSnapshot）
+            index_type: 索引类型
+        """
+        state_scope = cls(index_type)
+        state_scope._snapshot = snapshot
+        state_scope._snapshot_lock = threading.RLock()
+        _snapshot_scopes.add(state_scope)
+        return state_scope
+
+    def __getstate__(self):
+        # 序列化前加载快照中剩余的节点，快照的内存映射不能 pickle
+        self.load_snapshot()
+        state = self.__dict__.copy()
+        state.pop("_snapshot", None)
+        state.pop("_snapshot_lock", None)
+        return state
+
+    def get_snapshot(self):
+        """获取尚未加载完的作用域快照."""
+        return self._snapshot
+
+    def get_loaded_nodes(self) -> dict:
+        """获取已加载到索引中的节点，不会从快照加载."""
+        return self._state_index.get_all()
+
+    def copy_nodes(self) -> tuple[Any, dict]:
+        """在快照锁内取出尚未加载完的快照和已加载节点的副本，保存时使用.
+
+        Returns:
+            (快照，没有时为 None, 键 -> 节点)
+        """
+        lock = getattr(self, "_snapshot_lock", None)
+        if lock is None:
+            return self._snapshot, dict(self.get_loaded_nodes())
+        with lock:
+            return self._snapshot, dict(self.get_loaded_nodes())
+
+    def load_snapshot(self, prefix: str = "") -> None:
+        """从快照加载节点.
+
+        Args:
+            prefix: 只加载以该前缀开头的节点，为空时加载全部节点并释放快照
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        for key in snapshot.keys(prefix):
+            self.get_state_node(key)
+        if not prefix:
+            with self._snapshot_lock:
+                self._snapshot = None
+
+    def _load_snapshot_node(self, key: str) -> StateNode | None:
+        """从快照加载节点及其子节点."""
+        with self._snapshot_lock:
+            node = self._state_index.get(key)
+            if node is not None or self._snapshot is None:
+                return node
+            node = self._snapshot.load_node(key)
+            if node is None:
+                return None
+            for child_key in self._snapshot.child_keys(key):
+                child = self.get_state_node(child_key)
+                if child is not None:
+                    node.add_child(child)
+            self._state_index.set(key, node)
+            return node
+
+    def is_dirty(self) -> bool:
+        """上次保存后是否被修改."""
+        return self._dirty
+
+    def mark_dirty(self) -> None:
+        """标记为已修改."""
+        self._dirty = True
+
+    def mark_clean(self) -> None:
+        """保存前清除修改标记."""
+        self._dirty = False
 
     def observe_state_node(self, key: str, effect: Any) -> None:
         """观察状态节点.
@@ -92,6 +200,7 @@ class StateScope:
             value: 节点值
             effect: 副作用列表
         """
+        self._dirty = True
         # 1.节点拆分
         key_queue = key.split(".")
 
@@ -159,10 +268,13 @@ class StateScope:
         Returns:
             状态节点或 None
         """
-        return self._state_index.get(key)
+        node = self._state_index.get(key)
+        if node is None and self._snapshot is not None:
+            node = self._load_snapshot_node(key)
+        return node
 
     def get_state_value(self, key: str) -> Any:
-        """获取状态节点的值.
+        """获取状态节点的值，由快照支持时只反序列化访问到的节点.
 
         Args:
             key: 节点键名
@@ -217,6 +329,7 @@ class StateScope:
             LogUtils.error(self.__class__, f"State is not exist, key: {key}")
             return
 
+        self._dirty = True
         if node.get_type() == StateNodeType.branch:
             # 如果是分支节点，删除所有子节点
             for child in node.get_children():
@@ -246,6 +359,7 @@ class StateScope:
         Returns:
             节点字典
         """
+        self.load_snapshot()
         return self._state_index.get_all()
 
     def find_nodes_by_prefix(self, prefix: str) -> list:
@@ -259,6 +373,7 @@ class StateScope:
         Returns:
             节点列表
         """
+        self.load_snapshot(prefix)
         return self._state_index.find_by_prefix(prefix)
 
 
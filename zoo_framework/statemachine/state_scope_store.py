@@ -0,0 +1,146 @@
+"""按作用域分文件的状态存储.
+
+每个 StateScope 保存为目录下的一个文件，只写入被修改过的作用域，
+多个作用域通过小线程池并行写入；加载时按需读取单个作用域，不需要反序列化全部状态。
+"""
+
+import copy
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from urllib.parse import quote, unquote
+
+from zoo_framework.utils import LogUtils
+
+from .state_scope import StateScope
+
+SCOPE_FILE_SUFFIX = ".scope"
+
+
+class StateScopeStore:
+    """按作用域分文件的状态存储."""
+
+    def __init__(self, directory: str, max_workers: int = 4):
+        """初始化存储.
+
+        Args:
+            directory: 作用域文件所在目录
+            max_workers: 并行写入的线程数
+        """
+        self.directory = directory
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        """存储目录是否存在."""
+        return os.path.isdir(self.directory)
+
+    def path_for(self, scope: str) -> str:
+        """作用域对应的文件路径，作用域名称经过转义，可以包含任意字符."""
+        return os.path.join(self.directory, quote(scope, safe="") + SCOPE_FILE_SUFFIX)
+
+    def scope_names(self) -> list[str]:
+        """获取已保存的作用域名称."""
+        if not self.exists():
+            return []
+        return [
+            unquote(name[: -len(SCOPE_FILE_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.endswith(SCOPE_FILE_SUFFIX)
+        ]
+
+    def load(self, scope: str) -> StateScope | None:
+        """读取单个作用域，文件不存在或损坏时返回 None."""
+        path = self.path_for(scope)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                state_scope = pickle.load(f)
+        except Exception as e:
+            LogUtils.error(f"❌ Failed to load scope '{scope}': {e}")
+            return None
+        state_scope.mark_clean()
+        return state_scope
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="StateScopeStore"
+                )
+            return self._executor
+
+    def _write(self, scope: str, state_scope: StateScope) -> None:
+        path = self.path_for(scope)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(state_scope, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def _remove(self, scope: str) -> None:
+        path = self.path_for(scope)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def save(
+        self, dirty: dict[str, StateScope], removed: set[str] | None = None, lock=None
+    ) -> bool:
+        """并行写入修改过的作用域，并删除已移除的作用域文件.
+
+        在 lock 内清除作用域的修改标记并深拷贝作用域，写入线程只序列化副本，
+        写入期间的新修改会重新标记，在下次保存时写入；写入失败的作用域会重新标记为已修改
+
+        Args:
+            dirty: 作用域名称 -> 修改过的作用域
+            removed: 已移除的作用域名称
+            lock: 修改作用域时持有的锁，拷贝期间持有
+
+        Returns:
+            是否全部成功
+        """
+        removed = (removed or set()) - dirty.keys()
+        if not dirty and not removed:
+            return True
+
+        os.makedirs(self.directory, exist_ok=True)
+        executor = self._get_executor()
+        copies = {}
+        with lock or nullcontext():
+            for scope, state_scope in dirty.items():
+                state_scope.mark_clean()
+                copies[scope] = copy.deepcopy(state_scope)
+
+        futures: dict[Future, tuple[str, StateScope | None]] = {}
+        for scope, state_scope in dirty.items():
+            futures[executor.submit(self._write, scope, copies[scope])] = (scope, state_scope)
+        for scope in removed:
+            futures[executor.submit(self._remove, scope)] = (scope, None)
+
+        wait(futures)
+        success = True
+        for future, (scope, state_scope) in futures.items():
+            exception = future.exception()
+            if exception is None:
+                continue
+            success = False
+            if state_scope is not None:
+                state_scope.mark_dirty()
+            LogUtils.error(f"❌ Failed to save scope '{scope}': {exception}")
+        return success
+
+    def shutdown(self) -> None:
+        """关闭写入线程池."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# 导出公共 API
+__all__ = ["StateScopeStore"]
@@ -0,0 +1,391 @@
+"""内存映射的状态机快照.
+
+按列保存所有 StateNode 的键、值、版本号和类型，并记录每列的偏移：
+
+    文件头 | 作用域表 | 键偏移 | 版本号 | 类型 | 标记 | 值偏移 | 字符串区 | 值区
+
+同一作用域的节点按键（UTF-8 字节序）排序连续存放，加载时只映射文件并读取作用域表，
+按键二分查找节点，访问时才反序列化对应的值。启动时间与快照大小无关，
+常驻内存只随实际访问的节点增长。
+
+保存时写入临时文件后替换正在映射的快照，只支持 POSIX 平台；
+Windows 不能替换正在映射的文件。
+"""
+
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from typing import Any
+
+from zoo_framework.core.persistence_scheduler import PersistenceStrategy
+from zoo_framework.utils import LogUtils
+
+from .state_node import StateNode
+from .state_node_type import StateNodeType
+from .state_scope import StateScope
+
+SNAPSHOT_MAGIC = b"ZSNP"
+SNAPSHOT_VERSION = 1
+
+# 魔数、格式版本、保留、作用域数、节点数、文件大小，以及 8 个区段的偏移
+_HEADER = struct.Struct("<4sHHIQQ8Q")
+_SCOPE_ENTRY = struct.Struct("<4Q")
+_OFFSET = struct.Struct("<Q")
+_VERSION = struct.Struct("<q")
+
+# 类型编号，0 表示没有类型（值为 None）
+_NODE_TYPES: list[StateNodeType | None] = [None, *StateNodeType]
+_TYPE_CODES = {node_type: code for code, node_type in enumerate(_NODE_TYPES)}
+
+_FLAG_TOP = 1
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class StateSnapshot:
+    """只读的快照文件，通过 mmap 访问."""
+
+    def __init__(self, filepath: str):
+        """映射快照文件.
+
+        Args:
+            filepath: 快照文件路径
+
+        Raises:
+            ValueError: 文件不是有效的快照
+        """
+        with open(filepath, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = _unpack_header(self._mm, len(self._mm))
+        if header is None:
+            self._mm.close()
+            raise ValueError(f"Invalid state snapshot: {filepath}")
+        scope_count, self.node_count, offsets = header
+        (
+            scope_table,
+            self._key_offsets,
+            self._versions,
+            self._types,
+            self._flags,
+            self._value_offsets,
+            self._string_base,
+            self._value_base,
+        ) = offsets
+
+        # 作用域表很小，加载时全部读取
+        self.scopes: dict[str, ScopeSnapshot] = {}
+        for i in range(scope_count):
+            name_start, name_end, first, end = _SCOPE_ENTRY.unpack_from(
+                self._mm, scope_table + i * _SCOPE_ENTRY.size
+            )
+            name = self._mm[self._string_base + name_start : self._string_base + name_end]
+            self.scopes[name.decode("utf-8")] = ScopeSnapshot(self, first, end)
+
+    def key_bytes(self, index: int) -> bytes:
+        start, end = self._span(self._key_offsets, index)
+        return self._mm[self._string_base + start : self._string_base + end]
+
+    def value_bytes(self, index: int) -> bytes:
+        """节点值序列化后的字节，不反序列化."""
+        start, end = self._span(self._value_offsets, index)
+        return self._mm[self._value_base + start : self._value_base + end]
+
+    def version(self, index: int) -> int:
+        return _VERSION.unpack_from(self._mm, self._versions + index * 8)[0]
+
+    def type_code(self, index: int) -> int:
+        return self._mm[self._types + index]
+
+    def is_top(self, index: int) -> bool:
+        return bool(self._mm[self._flags + index] & _FLAG_TOP)
+
+    def _span(self, column: int, index: int) -> tuple[int, int]:
+        position = column + index * 8
+        return (
+            _OFFSET.unpack_from(self._mm, position)[0],
+            _OFFSET.unpack_from(self._mm, position + 8)[0],
+        )
+
+
+class ScopeSnapshot:
+    """快照中一个作用域的节点，节点按键排序."""
+
+    def __init__(self, snapshot: StateSnapshot, first: int, end: int):
+        self._snapshot = snapshot
+        self._first = first
+        self._end = end
+
+    def __len__(self) -> int:
+        return self._end - self._first
+
+    def _lower_bound(self, target: bytes) -> int:
+        low, high = self._first, self._end
+        while low < high:
+            middle = (low + high) // 2
+            if self._snapshot.key_bytes(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find(self, key: str) -> int:
+        """查找节点的位置，不存在时返回 -1."""
+        target = key.encode("utf-8")
+        index = self._lower_bound(target)
+        if index < self._end and self._snapshot.key_bytes(index) == target:
+            return index
+        return -1
+
+    def __contains__(self, key: str) -> bool:
+        return self.find(key) >= 0
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """按顺序遍历键，可以只遍历指定前缀的键."""
+        target = prefix.encode("utf-8")
+        index = self._lower_bound(target) if target else self._first
+        while index < self._end:
+            key = self._snapshot.key_bytes(index)
+            if not key.startswith(target):
+                return
+            yield key.decode("utf-8")
+            index += 1
+
+    def child_keys(self, key: str) -> list[str]:
+        """直接子节点的键."""
+        prefix = key + "."
+        return [child for child in self.keys(prefix) if "." not in child[len(prefix) :]]
+
+    def entries(self) -> Iterator[tuple[str, int, int, int, bytes]]:
+        """遍历原始节点数据：键、版本号、类型编号、标记、序列化后的值."""
+        snapshot = self._snapshot
+        for index in range(self._first, self._end):
+            yield (
+                snapshot.key_bytes(index).decode("utf-8"),
+                snapshot.version(index),
+                snapshot.type_code(index),
+                _FLAG_TOP if snapshot.is_top(index) else 0,
+                snapshot.value_bytes(index),
+            )
+
+    def load_node(self, key: str) -> StateNode | None:
+        """反序列化单个节点，不包含子节点关系."""
+        index = self.find(key)
+        if index < 0:
+            return None
+        snapshot = self._snapshot
+        return StateNode.restore(
+            key,
+            pickle.loads(snapshot.value_bytes(index)),
+            snapshot.version(index),
+            _NODE_TYPES[snapshot.type_code(index)],
+            snapshot.is_top(index),
+        )
+
+
+def _unpack_header(header: bytes, file_size: int) -> tuple[int, int, tuple] | None:
+    """解析文件头，只检查固定长度的内容和文件大小.
+
+    Returns:
+        (作用域数, 节点数, 区段偏移)，不是有效的快照时返回 None
+    """
+    if len(header) < _HEADER.size:
+        return None
+    magic, version, _, scope_count, node_count, expected_size, *offsets = _HEADER.unpack_from(
+        header
+    )
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or expected_size != file_size:
+        return None
+    if any(offset > file_size for offset in offsets):
+        return None
+    return scope_count, node_count, tuple(offsets)
+
+
+class MmapSnapshotPersistenceStrategy(PersistenceStrategy):
+    """内存映射快照持久化策略.
+
+    save 的数据为 作用域名称 -> StateScope，load 返回的作用域由快照支持，
+    节点在第一次访问时才加载。节点的副作用不会保存。只支持 POSIX 平台
+    """
+
+    @staticmethod
+    def available() -> bool:
+        """当前平台是否支持替换正在映射的快照文件."""
+        return os.name == "posix"
+
+    def save(self, data: Any, filepath: str) -> bool:
+        """写入快照.
+
+        已加载的节点重新序列化，仍在旧快照中的节点直接复制序列化后的字节
+
+        Args:
+            data: 作用域名称 -> StateScope
+            filepath: 快照文件路径
+        """
+        if not self.available():
+            LogUtils.error("❌ Snapshot save is only supported on POSIX platforms")
+            return False
+
+        temp_path = filepath + ".tmp"
+        try:
+            scopes = sorted(
+                (name.encode("utf-8"), name, state_scope) for name, state_scope in data.items()
+            )
+            with open(temp_path, "wb") as f:
+                self._write(f, scopes)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, filepath)
+            return True
+        except Exception as e:
+            LogUtils.error(f"❌ Snapshot save failed: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+    @staticmethod
+    def _collect(state_scope: StateScope) -> list[tuple[bytes, Any]]:
+        """作用域的全部节点，按键排序；值为已加载的节点或旧快照中的原始数据."""
+        nodes: dict[str, Any] = {}
+        snapshot, loaded_nodes = state_scope.copy_nodes()
+        if snapshot is not None:
+            for entry in snapshot.entries():
+                nodes[entry[0]] = entry
+        nodes.update(loaded_nodes)
+        return sorted((key.encode("utf-8"), node) for key, node in nodes.items())
+
+    def _write(self, f, scopes: list[tuple[bytes, str, StateScope]]) -> None:
+        strings = bytearray()
+        key_offsets = array("Q", [0])
+        versions = array("q")
+        types = bytearray()
+        flags = bytearray()
+        scope_entries = []
+        sources = []
+
+        for name_bytes, _, state_scope in scopes:
+            first = len(versions)
+            for key, node in self._collect(state_scope):
+                strings += key
+                key_offsets.append(len(strings))
+                if isinstance(node, StateNode):
+                    versions.append(node.get_version())
+                    types.append(_TYPE_CODES.get(node.get_type(), 0))
+                    flags.append(_FLAG_TOP if node.is_top() else 0)
+                    sources.append(node)
+                else:
+                    _, version, type_code, flag, value = node
+                    versions.append(version)
+                    types.append(type_code)
+                    flags.append(flag)
+                    sources.append(value)
+            scope_entries.append((name_bytes, first, len(versions)))
+
+        name_offsets = []
+        for name_bytes, first, end in scope_entries:
+            name_offsets.append((len(strings), len(strings) + len(name_bytes), first, end))
+            strings += name_bytes
+
+        node_count = len(versions)
+        if sys.byteorder != "little":
+            # 文件中的数值列统一为小端
+            for column in (key_offsets, versions):
+                column.byteswap()
+
+        # 计算各区段偏移
+        offsets = []
+        position = _HEADER.size
+        for size in (
+            _SCOPE_ENTRY.size * len(scope_entries),
+            8 * (node_count + 1),
+            8 * node_count,
+            node_count,
+            node_count,
+            8 * (node_count + 1),
+            len(strings),
+        ):
+            offsets.append(position)
+            position = _align(position + size)
+        value_base = position
+        offsets.append(value_base)
+
+        f.write(bytes(value_base))
+        f.seek(offsets[0])
+        for entry in name_offsets:
+            f.write(_SCOPE_ENTRY.pack(*entry))
+        for offset, column in zip(
+            (offsets[1], offsets[2], offsets[3], offsets[4], offsets[6]),
+            (key_offsets, versions, types, flags, strings),
+            strict=True,
+        ):
+            f.seek(offset)
+            f.write(column)
+
+        # 值区在最后，逐个写入，不在内存中拼接
+        f.seek(value_base)
+        value_offsets = array("Q", [0])
+        size = 0
+        for source in sources:
+            value = (
+                pickle.dumps(source.get_state(), protocol=pickle.HIGHEST_PROTOCOL)
+                if isinstance(source, StateNode)
+                else source
+            )
+            f.write(value)
+            size += len(value)
+            value_offsets.append(size)
+        file_size = value_base + size
+
+        if sys.byteorder != "little":
+            value_offsets.byteswap()
+        f.seek(offsets[5])
+        f.write(value_offsets)
+        f.seek(0)
+        f.write(
+            _HEADER.pack(
+                SNAPSHOT_MAGIC,
+                SNAPSHOT_VERSION,
+                0,
+                len(scope_entries),
+                node_count,
+                file_size,
+                *offsets,
+            )
+        )
+
+    def load(self, filepath: str) -> dict[str, StateScope] | None:
+        """映射快照，返回由快照支持的作用域."""
+        try:
+            snapshot = StateSnapshot(filepath)
+        except Exception as e:
+            LogUtils.error(f"❌ Snapshot load failed: {e}")
+            return None
+        return {
+            name: StateScope.from_snapshot(scope_snapshot)
+            for name, scope_snapshot in snapshot.scopes.items()
+        }
+
+    def validate(self, filepath: str) -> bool:
+        """检查文件头和文件大小，不读取节点数据."""
+        try:
+            with open(filepath, "rb") as f:
+                header = f.read(_HEADER.size)
+                f.seek(0, os.SEEK_END)
+                file_size = f.tell()
+        except OSError:
+            return False
+        return _unpack_header(header, file_size) is not None
+
+
+# 导出公共 API
+__all__ = [
+    "MmapSnapshotPersistenceStrategy",
+    "ScopeSnapshot",
+    "StateSnapshot",
+]
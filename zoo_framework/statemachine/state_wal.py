@@ -0,0 +1,212 @@
+"""状态机预写日志.
+
+记录 set_state / remove_state 的修改，每条记录为一帧：
+    4 字节长度 + 4 字节 CRC32 + pickle 后的 (操作, 作用域, 键, 值)
+追加时只写入文件缓冲区，由日志自己的同步线程在 fsync_interval 后统一 flush + fsync，
+fsync 期间不持有追加锁，进程崩溃最多丢失一个 fsync 间隔内的修改。
+回放时遇到不完整或校验失败的帧即停止，该帧是崩溃时没有写完的最后一帧，
+日志文件会被截断到最后一个完整帧，之后的追加不会写在残帧后面。
+"""
+
+import os
+import pickle
+import struct
+import threading
+import zlib
+from collections.abc import Iterator
+from typing import Any
+
+from zoo_framework.utils import LogUtils
+
+WAL_OP_SET = "set"
+WAL_OP_REMOVE = "remove"
+
+_FRAME_HEADER = struct.Struct("<II")
+
+
+class StateWriteAheadLog:
+    """状态机预写日志."""
+
+    def __init__(self, path: str, fsync_interval: float = 1.0):
+        """初始化预写日志.
+
+        Args:
+            path: 日志文件路径，压缩时当前日志会轮转为 path + ".old"
+            fsync_interval: 两次 fsync 的最长间隔（秒），0 表示每次追加后立即 fsync
+        """
+        self.path = path
+        self.old_path = path + ".old"
+        self.fsync_interval = fsync_interval
+        self._file = None
+        # 追加锁，保护文件缓冲区的写入
+        self._lock = threading.Lock()
+        # 同步锁，fsync 期间持有，轮转和关闭文件前先获取，追加不需要等待 fsync
+        self._sync_lock = threading.Lock()
+        # 同步线程，第一次追加时启动
+        self._sync_thread: threading.Thread | None = None
+        self._sync_requested = threading.Event()
+        self._closed = threading.Event()
+        # 当前日志的记录数和字节数
+        self.record_count = 0
+        self.size = 0
+        # 无法序列化而没有写入日志的修改数
+        self.error_count = 0
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "ab")  # noqa: SIM115
+            self.size = self._file.tell()
+        return self._file
+
+    def append(self, op: str, scope: str, key: str, value: Any = None) -> None:
+        """追加一条修改记录.
+
+        Args:
+            op: 操作，set / remove
+            scope: 作用域
+            key: 状态键
+            value: set 的值
+        """
+        try:
+            payload = pickle.dumps((op, scope, key, value), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            # 作为修改监听器调用时状态已经修改，不向调用方抛出，记录后跳过
+            with self._lock:
+                self.error_count += 1
+            LogUtils.error(f"❌ WAL record for {scope}.{key} cannot be pickled: {e}")
+            return
+
+        frame = _FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            self._open().write(frame)
+            self.record_count += 1
+            self.size += len(frame)
+            if self.fsync_interval > 0:
+                self._start_sync_thread()
+        if self.fsync_interval <= 0:
+            self.sync()
+        else:
+            self._sync_requested.set()
+
+    def _start_sync_thread(self) -> None:
+        if self._sync_thread is None:
+            # 关闭后重新追加时重新启动同步线程
+            self._closed.clear()
+            self._sync_thread = threading.Thread(
+                target=self._sync_loop, name="StateWALSync", daemon=True
+            )
+            self._sync_thread.start()
+
+    def _sync_loop(self) -> None:
+        """同步线程：有新的追加时等待 fsync_interval，合并这段时间内的追加后 fsync."""
+        while True:
+            self._sync_requested.wait()
+            if self._closed.wait(self.fsync_interval):
+                return
+            self._sync_requested.clear()
+            try:
+                self.sync()
+            except Exception as e:
+                LogUtils.error(f"❌ WAL sync failed: {e}")
+
+    def sync(self) -> None:
+        """把已追加的记录写入磁盘，fsync 期间不阻塞追加."""
+        with self._sync_lock:
+            with self._lock:
+                if self._file is None:
+                    return
+                self._file.flush()
+                fileno = self._file.fileno()
+            os.fsync(fileno)
+
+    def _sync_locked(self) -> None:
+        """同时持有同步锁和追加锁时写入磁盘."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def rotate(self) -> None:
+        """把当前日志轮转为旧日志，之后的记录写入新日志.
+
+        压缩开始前调用：旧日志中的修改都会包含在接下来保存的快照中，
+        快照保存成功后调用 discard_old 删除旧日志
+        """
+        with self._sync_lock, self._lock:
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if os.path.exists(self.path):
+                if os.path.exists(self.old_path):
+                    # 上一次压缩失败留下的旧日志，合并到一起保证回放顺序
+                    with open(self.old_path, "ab") as old, open(self.path, "rb") as current:
+                        old.write(current.read())
+                    os.remove(self.path)
+                else:
+                    os.replace(self.path, self.old_path)
+            self.record_count = 0
+            self.size = 0
+
+    def discard_old(self) -> None:
+        """快照保存成功后删除旧日志."""
+        if os.path.exists(self.old_path):
+            os.remove(self.old_path)
+
+    def replay(self) -> Iterator[tuple[str, str, str, Any]]:
+        """按写入顺序读取旧日志和当前日志中的记录.
+
+        Yields:
+            (操作, 作用域, 键, 值)
+        """
+        for path in (self.old_path, self.path):
+            if os.path.exists(path):
+                yield from self._read(path)
+
+    @staticmethod
+    def _read(path: str) -> Iterator[tuple[str, str, str, Any]]:
+        """读取日志文件中的记录，遇到不完整或校验失败的帧时把文件截断到最后一个完整帧.
+
+        截断后再追加的记录紧跟在最后一个完整帧之后，下一次回放不会停在旧的残帧上
+        """
+        good_offset = None
+        with open(path, "rb") as f:
+            while True:
+                offset = f.tell()
+                header = f.read(_FRAME_HEADER.size)
+                if not header:
+                    break
+                if len(header) < _FRAME_HEADER.size:
+                    LogUtils.warning(f"⚠️ Truncated WAL frame in {path}")
+                    good_offset = offset
+                    break
+                length, checksum = _FRAME_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    LogUtils.warning(f"⚠️ Corrupted WAL frame in {path}, stop replay")
+                    good_offset = offset
+                    break
+                yield pickle.loads(payload)
+        if good_offset is not None:
+            os.truncate(path, good_offset)
+
+    def close(self) -> None:
+        """写入剩余记录并关闭日志."""
+        self._closed.set()
+        self._sync_requested.set()
+        sync_thread = self._sync_thread
+        if sync_thread is not None and sync_thread is not threading.current_thread():
+            sync_thread.join()
+        self._sync_thread = None
+        with self._sync_lock, self._lock:
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# 导出公共 API
+__all__ = ["WAL_OP_REMOVE", "WAL_OP_SET", "StateWriteAheadLog"]
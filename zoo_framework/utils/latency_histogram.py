@@ -0,0 +1,213 @@
+"""延迟直方图.
+
+按 HDR Histogram 的对数-线性方式分桶：小于 2^SUB_BUCKET_BITS 微秒的值每微秒一个桶，
+更大的值每个 2 的幂区间再线性分成 2^(SUB_BUCKET_BITS-1) 个桶，相对误差不超过 1/16。
+桶数固定，内存占用与记录次数无关，两个直方图按桶相加即可合并。
+"""
+
+import math
+import threading
+import time
+from array import array
+from operator import add
+
+# 每个 2 的幂区间的线性分桶精度
+SUB_BUCKET_BITS = 5
+# 可记录的最大值（微秒），约 19 小时，更大的值记入最后一个桶
+MAX_VALUE_BITS = 36
+
+_SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+_SUB_BUCKET_HALF = _SUB_BUCKET_COUNT >> 1
+_MAX_VALUE = (1 << MAX_VALUE_BITS) - 1
+
+# 滑动窗口：名称 -> 窗口长度（秒）
+LATENCY_WINDOWS = {"1m": 60, "5m": 300, "15m": 900}
+
+# 快照中输出的分位数：名称 -> 百分位
+LATENCY_PERCENTILES = {"p50": 50.0, "p90": 90.0, "p99": 99.0, "p999": 99.9}
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return _SUB_BUCKET_COUNT + (shift - 1) * _SUB_BUCKET_HALF + (value >> shift) - _SUB_BUCKET_HALF
+
+
+def _bucket_upper(index: int) -> int:
+    """桶内的最大值（微秒）."""
+    if index < _SUB_BUCKET_COUNT:
+        return index
+    shift, offset = divmod(index - _SUB_BUCKET_COUNT, _SUB_BUCKET_HALF)
+    shift += 1
+    return ((offset + _SUB_BUCKET_HALF + 1) << shift) - 1
+
+
+BUCKET_COUNT = _bucket_index(_MAX_VALUE) + 1
+
+
+class LatencyHistogram:
+    """固定内存的延迟直方图，记录单位为秒.
+
+    本身不加锁，多线程记录时由调用方加锁，或使用 WindowedHistogram
+    """
+
+    def __init__(self, typecode: str = "Q"):
+        """初始化直方图.
+
+        Args:
+            typecode: 计数数组的类型，短时间窗口可以使用 "I" 减少内存
+        """
+        self._typecode = typecode
+        self._counts = array(typecode, bytes(BUCKET_COUNT * array(typecode).itemsize))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """记录一次耗时."""
+        seconds = max(0.0, seconds)
+        micros = min(int(seconds * 1_000_000), _MAX_VALUE)
+        self._counts[_bucket_index(micros)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """把另一个直方图的计数加到当前直方图.
+
+        Returns:
+            当前直方图
+        """
+        if other.count == 0:
+            return self
+        self._counts = array(self._typecode, map(add, self._counts, other._counts))
+        self.count += other.count
+        self.total += other.total
+        if other.max > self.max:
+            self.max = other.max
+        return self
+
+    def reset(self) -> None:
+        """清空直方图."""
+        if self.count == 0:
+            return
+        self._counts = array(self._typecode, bytes(len(self._counts) * self._counts.itemsize))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def percentile(self, percent: float) -> float:
+        """获取分位数（秒），返回所在桶的上界，不超过记录到的最大值.
+
+        Args:
+            percent: 百分位，例如 99.9
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            if seen >= rank:
+                return min(_bucket_upper(index) / 1_000_000, self.max)
+        return self.max
+
+    def mean(self) -> float:
+        """获取平均值（秒）."""
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self) -> dict:
+        """获取统计快照：次数、平均值、各分位数和最大值（秒）."""
+        result = {"count": self.count, "mean": self.mean()}
+        for name, percent in LATENCY_PERCENTILES.items():
+            result[name] = self.percentile(percent)
+        result["max"] = self.max
+        return result
+
+
+class WindowedHistogram:
+    """带滑动窗口的延迟直方图，线程安全.
+
+    时间按 slot_seconds 分槽，每个槽一个直方图，环形复用；
+    查询窗口时合并窗口内的槽，槽在第一次记录时才分配内存
+    """
+
+    def __init__(self, slot_seconds: float = 15, max_window: float = 900):
+        """初始化直方图.
+
+        Args:
+            slot_seconds: 每个槽的时长（秒），即窗口滑动的粒度
+            max_window: 可查询的最长窗口（秒）
+        """
+        self.slot_seconds = slot_seconds
+        self._slot_num = math.ceil(max_window / slot_seconds) + 1
+        self._slots: list[LatencyHistogram | None] = [None] * self._slot_num
+        self._slot_ids = [-1] * self._slot_num
+        # 启动以来的全部记录
+        self._total = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def _slot_id(self, now: float | None) -> int:
+        return int((time.monotonic() if now is None else now) // self.slot_seconds)
+
+    def record(self, seconds: float, now: float | None = None) -> None:
+        """记录一次耗时.
+
+        Args:
+            seconds: 耗时（秒）
+            now: 记录时间（单调时钟），默认为当前时间
+        """
+        slot_id = self._slot_id(now)
+        position = slot_id % self._slot_num
+        with self._lock:
+            slot = self._slots[position]
+            if slot is None:
+                slot = LatencyHistogram("I")
+                self._slots[position] = slot
+            if self._slot_ids[position] != slot_id:
+                slot.reset()
+                self._slot_ids[position] = slot_id
+            slot.record(seconds)
+            self._total.record(seconds)
+
+    def window(self, seconds: float | None = None, now: float | None = None) -> LatencyHistogram:
+        """合并窗口内的记录.
+
+        Args:
+            seconds: 窗口长度（秒），None 表示启动以来的全部记录
+            now: 查询时间（单调时钟），默认为当前时间
+
+        Returns:
+            合并后的直方图，可以继续与其他直方图合并
+        """
+        merged = LatencyHistogram()
+        with self._lock:
+            if seconds is None:
+                return merged.merge(self._total)
+
+            current = self._slot_id(now)
+            oldest = current - min(math.ceil(seconds / self.slot_seconds), self._slot_num) + 1
+            for slot, slot_id in zip(self._slots, self._slot_ids, strict=True):
+                if slot is not None and oldest <= slot_id <= current:
+                    merged.merge(slot)
+        return merged
+
+    def snapshot(self, now: float | None = None) -> dict:
+        """获取各滑动窗口的统计快照."""
+        return {
+            name: self.window(seconds, now).snapshot() for name, seconds in LATENCY_WINDOWS.items()
+        }
+
+
+# 导出公共 API
+__all__ = [
+    "BUCKET_COUNT",
+    "LATENCY_PERCENTILES",
+    "LATENCY_WINDOWS",
+    "LatencyHistogram",
+    "WindowedHistogram",
+]
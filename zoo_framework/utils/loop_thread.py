@@ -0,0 +1,123 @@
+"""共享事件循环线程.
+
+框架内的异步代码（异步事件通道、异步反应器）都提交到同一个后台事件循环，
+避免每次调用都创建和销毁事件循环，也不需要为每个等待中的协程占用一个线程。
+"""
+
+import asyncio
+import threading
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future
+from typing import Any
+
+
+class EventLoopThread:
+    """在守护线程中运行的事件循环，第一次使用时启动."""
+
+    def __init__(self, name: str = "ZooEventLoop"):
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """获取事件循环，未启动时启动."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            return loop
+        return self.start()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """启动事件循环线程."""
+        with self._lock:
+            if self._loop is not None and not self._loop.is_closed():
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            started.wait()
+            self._loop = loop
+            return loop
+
+    def is_running(self) -> bool:
+        """事件循环是否在运行."""
+        return self._loop is not None and self._loop.is_running()
+
+    def in_loop_thread(self) -> bool:
+        """当前线程是否为事件循环线程."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        """把协程提交到事件循环.
+
+        Args:
+            coro: 协程
+
+        Returns:
+            concurrent.futures.Future，可在任意线程中等待结果
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any:
+        """把协程提交到事件循环并等待结果，不能在事件循环线程中调用.
+
+        Args:
+            coro: 协程
+            timeout: 超时时间（秒）
+
+        Returns:
+            协程的返回值
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("EventLoopThread.run cannot be called from the loop thread")
+        return self.submit(coro).result(timeout)
+
+    def call_soon(self, callback: Callable[..., Any], *args) -> None:
+        """在事件循环中执行回调，在事件循环线程中调用时直接执行."""
+        if self.in_loop_thread():
+            callback(*args)
+            return
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stop(self, timeout: float = 5) -> None:
+        """停止事件循环线程."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+
+# 全局事件循环线程
+_event_loop_thread: EventLoopThread | None = None
+_event_loop_thread_lock = threading.Lock()
+
+
+def get_event_loop_thread() -> EventLoopThread:
+    """获取全局事件循环线程."""
+    global _event_loop_thread
+    with _event_loop_thread_lock:
+        if _event_loop_thread is None:
+            _event_loop_thread = EventLoopThread()
+        return _event_loop_thread
+
+
+# 导出公共 API
+__all__ = ["EventLoopThread", "get_event_loop_thread"]
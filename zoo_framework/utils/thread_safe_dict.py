@@ -1,6 +1,33 @@
-from multiprocessing import Lock
+"""线程安全字典.
 
-_lock = Lock()
+每个实例使用自己的 threading.Lock，不同的字典之间互不阻塞。
+单个键的读取（get、[]、in、len）是 GIL 下的原子字典操作，不加锁；
+写入和需要遍历整个字典的操作（keys、values、items）在锁内执行。
+写入集中的字典可以使用 StripedThreadSafeDict，按键的哈希分到多个分片，各分片独立加锁；
+读多写少的注册表可以使用 CopyOnWriteDict，读取直接使用不可变快照，不复制也不加锁。
+"""
+
+import os
+import threading
+import weakref
+from collections.abc import Callable
+from types import MappingProxyType
+
+_MISSING = object()
+
+# 所有 ThreadSafeDict、StripedThreadSafeDict 和 CopyOnWriteDict 实例，
+# fork 出的子进程中重新创建它们的锁
+_thread_safe_dicts: weakref.WeakSet = weakref.WeakSet()
+
+
+def _reinit_locks_after_fork():
+    """子进程中重新创建锁，fork 时被其他线程持有的锁在子进程中永远不会释放."""
+    for thread_safe_dict in list(_thread_safe_dicts):
+        thread_safe_dict._reinit_locks()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_locks_after_fork)
 
 
 class ThreadSafeDict:
@@ -10,55 +37,279 @@ class ThreadSafeDict:
         if _dict is None:
             _dict = {}
         self._dict = _dict
+        self._lock = threading.Lock()
+        _thread_safe_dicts.add(self)
+
+    def __getstate__(self):
+        # 锁不能 pickle，持久化和深拷贝时只保留数据
+        return {"_dict": self.copy()}
+
+    def __setstate__(self, state):
+        self._dict = state["_dict"]
+        self._lock = threading.Lock()
+        _thread_safe_dicts.add(self)
+
+    def _reinit_locks(self):
+        self._lock = threading.Lock()
 
     def __getitem__(self, key):
-        with _lock:
-            return self._dict[key]
+        return self._dict[key]
 
     def __setitem__(self, key, value):
-        with _lock:
+        with self._lock:
             self._dict[key] = value
 
     def __delitem__(self, key):
-        with _lock:
+        with self._lock:
             del self._dict[key]
 
     def __len__(self):
-        with _lock:
-            return len(self._dict)
+        return len(self._dict)
 
     def __contains__(self, key):
-        with _lock:
-            return key in self._dict
+        return key in self._dict
+
+    def __iter__(self):
+        return iter(self.keys())
 
     def keys(self):
-        with _lock:
+        with self._lock:
             return list(self._dict.keys())
 
     def values(self):
-        with _lock:
+        with self._lock:
             return list(self._dict.values())
 
     def items(self):
-        with _lock:
+        with self._lock:
             return list(self._dict.items())
 
-    def get(self, handler_name):
-        with _lock:
-            return self._dict.get(handler_name)
+    def copy(self) -> dict:
+        with self._lock:
+            return dict(self._dict)
+
+    def get(self, handler_name, default=None):
+        return self._dict.get(handler_name, default)
 
     def has_key(self, key):
-        with _lock:
-            return key in self._dict
+        return key in self._dict
 
-    def pop(self, key):
-        with _lock:
-            return self._dict.pop(key)
+    def setdefault(self, key, default=None):
+        with self._lock:
+            return self._dict.setdefault(key, default)
+
+    def pop(self, key, default=_MISSING):
+        with self._lock:
+            if default is _MISSING:
+                return self._dict.pop(key)
+            return self._dict.pop(key, default)
 
     def get_values(self):
-        with _lock:
-            return list(self._dict.values())
+        return self.values()
 
     def get_keys(self):
-        with _lock:
-            return list(self._dict.keys())
+        return self.keys()
+
+
+class StripedThreadSafeDict:
+    """分片加锁的线程安全字典.
+
+    键按哈希分到 stripes 个分片，每个分片一个字典和一把锁，
+    不同分片的写入互不阻塞。遍历时逐个分片加锁，结果不保留插入顺序。
+    """
+
+    def __init__(self, _dict=None, stripes: int = 16):
+        self._stripes = max(1, int(stripes))
+        self._shards: tuple[dict, ...] = tuple({} for _ in range(self._stripes))
+        self._locks = tuple(threading.Lock() for _ in range(self._stripes))
+        _thread_safe_dicts.add(self)
+        if _dict:
+            for key, value in _dict.items():
+                self._shard(key)[key] = value
+
+    def __getstate__(self):
+        return {"_dict": self.copy(), "_stripes": self._stripes}
+
+    def __setstate__(self, state):
+        self.__init__(state["_dict"], state["_stripes"])
+
+    def _reinit_locks(self):
+        self._locks = tuple(threading.Lock() for _ in range(self._stripes))
+
+    def _index(self, key) -> int:
+        return hash(key) % self._stripes
+
+    def _shard(self, key) -> dict:
+        return self._shards[self._index(key)]
+
+    def __getitem__(self, key):
+        return self._shard(key)[key]
+
+    def __setitem__(self, key, value):
+        index = self._index(key)
+        with self._locks[index]:
+            self._shards[index][key] = value
+
+    def __delitem__(self, key):
+        index = self._index(key)
+        with self._locks[index]:
+            del self._shards[index][key]
+
+    def __len__(self):
+        return sum(len(shard) for shard in self._shards)
+
+    def __contains__(self, key):
+        return key in self._shard(key)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def items(self):
+        result = []
+        for lock, shard in zip(self._locks, self._shards, strict=True):
+            with lock:
+                result.extend(shard.items())
+        return result
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    def get(self, handler_name, default=None):
+        return self._shard(handler_name).get(handler_name, default)
+
+    def has_key(self, key):
+        return key in self
+
+    def setdefault(self, key, default=None):
+        index = self._index(key)
+        with self._locks[index]:
+            return self._shards[index].setdefault(key, default)
+
+    def pop(self, key, default=_MISSING):
+        index = self._index(key)
+        with self._locks[index]:
+            if default is _MISSING:
+                return self._shards[index].pop(key)
+            return self._shards[index].pop(key, default)
+
+    def get_values(self):
+        return self.values()
+
+    def get_keys(self):
+        return self.keys()
+
+
+class CopyOnWriteDict:
+    """写时复制的线程安全字典.
+
+    当前数据是一个不会再被修改的字典，写入时在锁内复制、修改后整体替换。
+    读取（包括 keys、values、items）直接返回当前快照的视图，不复制也不加锁，
+    适合注册表这类很少写入、每次分发都要读取的字典。
+    """
+
+    def __init__(self, _dict=None):
+        self._dict: dict = dict(_dict) if _dict else {}
+        self._lock = threading.Lock()
+        _thread_safe_dicts.add(self)
+
+    def __getstate__(self):
+        return {"_dict": self._dict}
+
+    def __setstate__(self, state):
+        self._dict = dict(state["_dict"])
+        self._lock = threading.Lock()
+        _thread_safe_dicts.add(self)
+
+    def _reinit_locks(self):
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> MappingProxyType:
+        """获取当前数据的只读快照，之后的写入不会影响该快照."""
+        return MappingProxyType(self._dict)
+
+    def _write(self, func: Callable[[dict], object]):
+        """在锁内复制当前数据，修改后替换."""
+        with self._lock:
+            data = dict(self._dict)
+            result = func(data)
+            self._dict = data
+            return result
+
+    def __getitem__(self, key):
+        return self._dict[key]
+
+    def __setitem__(self, key, value):
+        self._write(lambda data: data.__setitem__(key, value))
+
+    def __delitem__(self, key):
+        self._write(lambda data: data.__delitem__(key))
+
+    def __len__(self):
+        return len(self._dict)
+
+    def __contains__(self, key):
+        return key in self._dict
+
+    def __iter__(self):
+        return iter(self._dict)
+
+    def keys(self):
+        return self._dict.keys()
+
+    def values(self):
+        return self._dict.values()
+
+    def items(self):
+        return self._dict.items()
+
+    def copy(self) -> dict:
+        return dict(self._dict)
+
+    def get(self, handler_name, default=None):
+        return self._dict.get(handler_name, default)
+
+    def has_key(self, key):
+        return key in self._dict
+
+    def setdefault(self, key, default=None):
+        value = self._dict.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        return self._write(lambda data: data.setdefault(key, default))
+
+    def update_value(self, key, func: Callable[[object], object], default=None):
+        """在写锁内用 func(旧值) 的结果替换键的值，键不存在时旧值为 default.
+
+        Returns:
+            新的值
+        """
+
+        def update(data: dict):
+            value = func(data.get(key, default))
+            data[key] = value
+            return value
+
+        return self._write(update)
+
+    def pop(self, key, default=_MISSING):
+        if default is _MISSING:
+            return self._write(lambda data: data.pop(key))
+        if key not in self._dict:
+            return default
+        return self._write(lambda data: data.pop(key, default))
+
+    def get_values(self):
+        return self.values()
+
+    def get_keys(self):
+        return self.keys()
+
+
+# 导出公共 API
+__all__ = ["CopyOnWriteDict", "StripedThreadSafeDict", "ThreadSafeDict"]
@@ -1,6 +1,8 @@
 from .base_worker import BaseWorker
 from .event_worker import EventWorker
 from .state_machine_work import StateMachineWorker
+from .worker_cancel_token import WorkerCancelledError, WorkerCancelToken
+from .worker_metrics import WorkerMetrics, WorkerRunRecord, get_worker_metrics
 from .worker_props import WorkerProps
 from .worker_register import WorkerRegister
 from .worker_result import WorkerResult
@@ -23,9 +25,14 @@ __all__ = [
     "BaseWorker",
     "EventWorker",
     "StateMachineWorker",
+    "WorkerCancelToken",
+    "WorkerCancelledError",
+    "WorkerMetrics",
     "WorkerProps",
     "WorkerRegister",
     "WorkerResult",
+    "WorkerRunRecord",
+    "get_worker_metrics",
 ]
 
 # 如果异步 Worker 可用，添加到导出列表
@@ -6,11 +6,13 @@ P2: 异步 IO 优化 - 支持异步 Worker 实现
 import asyncio
 import time
 from abc import abstractmethod
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from concurrent.futures import Future
 from enum import Enum
 from typing import Any
 
 from zoo_framework.utils import LogUtils
+from zoo_framework.utils.loop_thread import get_event_loop_thread
 from zoo_framework.workers import BaseWorker
 
 
@@ -29,13 +31,15 @@ class AsyncWorker(BaseWorker):
 
     特性：
     - 原生协程支持
-    - 自动事件循环管理
+    - 自动事件循环管理：不在事件循环中调用时，提交到框架共享的后台事件循环，
+      不再为每次调用创建和销毁事件循环
     - 支持同步和异步两种执行模式
     - 性能大幅提升
     """
 
     def __init__(self, name: str | None = None):
-        super().__init__(name)
+        self._worker_name = name or self.__class__.__name__
+        super().__init__({"name": self._worker_name})
         self._loop: asyncio.AbstractEventLoop | None = None
         self._async_type = AsyncWorkerType.COROUTINE
         self._max_concurrent = 10  # 最大并发数
@@ -75,7 +79,8 @@ class AsyncWorker(BaseWorker):
     def execute(self, *args, **kwargs) -> Any:
         """同步执行入口.
 
-        自动处理异步执行逻辑
+        自动处理异步执行逻辑：在事件循环中调用时返回 Task，
+        否则提交到共享事件循环并等待结果
 
         Args:
             *args: 位置参数
@@ -87,11 +92,15 @@ class AsyncWorker(BaseWorker):
         # 检查是否在事件循环中
         try:
             loop = asyncio.get_running_loop()
-            # 已在事件循环中，创建任务
-            return loop.create_task(self._execute_async(*args, **kwargs))
         except RuntimeError:
-            # 不在事件循环中，运行新循环
-            return asyncio.run(self._execute_async(*args, **kwargs))
+            # 不在事件循环中，提交到共享事件循环并等待
+            return self.run_in_background(*args, **kwargs).result()
+        # 已在事件循环中，创建任务
+        return loop.create_task(self._execute_async(*args, **kwargs))
+
+    def _execute(self):
+        """作为普通 Worker 被 Waiter 调度时，在共享事件循环中执行 async_execute."""
+        return self.execute()
 
     async def _execute_async(self, *args, **kwargs) -> Any:
         """内部异步执行."""
@@ -117,53 +126,19 @@ class AsyncWorker(BaseWorker):
             )
             raise
 
-    def run_in_background(self, *args, **kwargs) -> Any:
+    def run_in_background(self, *args, **kwargs) -> Future:
         """在后台运行.
 
-        将任务提交到事件循环后台执行
+        将任务提交到框架共享的后台事件循环，可以在任意线程中调用
 
         Args:
             *args: 位置参数
             **kwargs: 关键字参数
 
         Returns:
-            异步任务或模拟任务对象
+            concurrent.futures.Future，支持 done/result/cancel/add_done_callback
         """
-        try:
-            loop = asyncio.get_running_loop()
-            return loop.create_task(self._execute_async(*args, **kwargs))
-        except RuntimeError:
-            # 没有运行的事件循环，创建新线程运行
-            import threading
-
-            result_container = {}
-
-            def run_async():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    result = loop.run_until_complete(self._execute_async(*args, **kwargs))
-                    result_container["result"] = result
-                finally:
-                    loop.close()
-
-            thread = threading.Thread(target=run_async)
-            thread.start()
-
-            # 返回一个模拟的任务对象
-            class FakeTask:
-                def __init__(self, thread, container):
-                    self._thread = thread
-                    self._container = container
-
-                def done(self):
-                    return not self._thread.is_alive()
-
-                def result(self):
-                    self._thread.join()
-                    return self._container.get("result")
-
-            return FakeTask(thread, result_container)
+        return get_event_loop_thread().submit(self._execute_async(*args, **kwargs))
 
 
 class AsyncEventWorker(AsyncWorker):
@@ -197,11 +172,26 @@ class AsyncEventWorker(AsyncWorker):
         Returns:
             处理结果
         """
-        if event_type not in self._handlers:
+        if event_type in self._handlers:
+            handler = self._handlers[event_type]
+            return await handler(*args, **kwargs)
+
+        # 未单独注册时，交给 @event 注册到反应器管理器中的反应器（支持通配订阅）
+        from zoo_framework.reactor import EventReactorManager
+
+        reactors = EventReactorManager().get_reactor(event_type)
+        if not reactors:
             raise ValueError(f"No handler registered for event type: {event_type}")
 
-        handler = self._handlers[event_type]
-        return await handler(*args, **kwargs)
+        content = args[0] if args else kwargs.get("content")
+        loop = asyncio.get_running_loop()
+        coroutines = []
+        for reactor in reactors:
+            if reactor.is_async():
+                coroutines.append(reactor.execute_async(event_type, content))
+            else:
+                coroutines.append(loop.run_in_executor(None, reactor.execute, event_type, content))
+        return await asyncio.gather(*coroutines)
 
 
 class AsyncStateMachineWorker(AsyncWorker):
@@ -253,13 +243,26 @@ class AsyncWorkerPool:
     """异步 Worker 池.
 
     管理多个异步 Worker 的池
+
+    批量处理时由 max_workers 个消费协程从有界队列中取任务执行，
+    输入按需从迭代器中读取，已读取但未被调用方取走的结果数不超过 max_workers + queue_size，
+    处理超大迭代器时内存占用保持不变
     """
 
-    def __init__(self, max_workers: int = 10):
+    # 队列结束标记
+    _STOP = object()
+
+    def __init__(self, max_workers: int = 10, queue_size: int | None = None):
+        """初始化 Worker 池.
+
+        Args:
+            max_workers: 同时执行的任务数
+            queue_size: 等待执行的任务队列长度，默认为 max_workers 的 2 倍
+        """
         self._max_workers = max_workers
+        self._queue_size = queue_size if queue_size is not None else max_workers * 2
         self._workers: list[AsyncWorker] = []
         self._semaphore = asyncio.Semaphore(max_workers)
-        self._queue: asyncio.Queue = asyncio.Queue()
 
     async def submit(self, worker: AsyncWorker, *args, **kwargs) -> Any:
         """提交任务到 Worker 池.
@@ -275,18 +278,123 @@ class AsyncWorkerPool:
         async with self._semaphore:
             return await worker._execute_async(*args, **kwargs)
 
-    async def map(self, worker: AsyncWorker, items: list) -> list:
+    async def map(self, worker: AsyncWorker, items: Iterable | AsyncIterable) -> list:
         """批量处理.
 
         Args:
             worker: 异步 Worker
-            items: 待处理项列表
+            items: 待处理项，可以是同步或异步迭代器
+
+        Returns:
+            按输入顺序排列的结果列表
+        """
+        return [result async for result in self.imap(worker, items)]
+
+    def imap(self, worker: AsyncWorker, items: Iterable | AsyncIterable) -> AsyncIterator:
+        """流式批量处理，按输入顺序产出结果.
+
+        Args:
+            worker: 异步 Worker
+            items: 待处理项，可以是同步或异步迭代器
 
         Returns:
-            结果列表
+            结果的异步迭代器，任务失败时在产出该结果的位置抛出异常
         """
-        tasks = [self.submit(worker, item) for item in items]
-        return await asyncio.gather(*tasks)
+        return self._stream(worker, items, ordered=True)
+
+    def as_completed(self, worker: AsyncWorker, items: Iterable | AsyncIterable) -> AsyncIterator:
+        """流式批量处理，按完成顺序产出结果.
+
+        Args:
+            worker: 异步 Worker
+            items: 待处理项，可以是同步或异步迭代器
+
+        Returns:
+            结果的异步迭代器，任务失败时在产出该结果的位置抛出异常
+        """
+        return self._stream(worker, items, ordered=False)
+
+    async def _stream(
+        self, worker: AsyncWorker, items: Iterable | AsyncIterable, ordered: bool
+    ) -> AsyncIterator:
+        # 已读取但结果未被取走的任务数上限，保证乱序等待的结果也不会无限堆积
+        window = asyncio.Semaphore(self._max_workers + self._queue_size)
+        input_queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        output_queue: asyncio.Queue = asyncio.Queue()
+
+        async def produce():
+            index = 0
+            error = None
+            try:
+                if isinstance(items, AsyncIterable):
+                    async for item in items:
+                        await window.acquire()
+                        await input_queue.put((index, item))
+                        index += 1
+                else:
+                    for item in items:
+                        await window.acquire()
+                        await input_queue.put((index, item))
+                        index += 1
+            except Exception as e:
+                error = e
+
+            # 被取消时不再通知消费协程，它们会一起被取消
+            for _ in range(self._max_workers):
+                await input_queue.put(self._STOP)
+            if error is not None:
+                raise error
+
+        async def consume():
+            while True:
+                entry = await input_queue.get()
+                if entry is self._STOP:
+                    return
+                index, item = entry
+                try:
+                    result = await worker._execute_async(item)
+                    await output_queue.put((index, result, None))
+                except Exception as e:
+                    await output_queue.put((index, None, e))
+
+        async def close():
+            # 输入读完且所有消费协程退出后通知调用方结束；读取输入失败时把异常交给调用方
+            results = await asyncio.gather(producer, *consumers, return_exceptions=True)
+            error = next((r for r in results if isinstance(r, BaseException)), None)
+            await output_queue.put((None, None, error))
+
+        producer = asyncio.ensure_future(produce())
+        consumers = [asyncio.ensure_future(consume()) for _ in range(self._max_workers)]
+        closer = asyncio.ensure_future(close())
+
+        pending: dict[int, tuple[Any, Exception | None]] = {}
+        next_index = 0
+        try:
+            while True:
+                index, result, error = await output_queue.get()
+                if index is None:
+                    if error is not None:
+                        raise error
+                    return
+
+                if not ordered:
+                    window.release()
+                    if error is not None:
+                        raise error
+                    yield result
+                    continue
+
+                pending[index] = (result, error)
+                while next_index in pending:
+                    result, error = pending.pop(next_index)
+                    next_index += 1
+                    window.release()
+                    if error is not None:
+                        raise error
+                    yield result
+        finally:
+            for task in (producer, *consumers, closer):
+                task.cancel()
 
 
 # 导出公共 API
@@ -2,6 +2,13 @@ import time
 
 from zoo_framework.utils import LogUtils
 
+from .worker_cancel_token import WorkerCancelledError, WorkerCancelToken
+from .worker_metrics import (
+    OUTCOME_CANCELLED,
+    OUTCOME_ERROR,
+    OUTCOME_SUCCESS,
+    get_worker_metrics,
+)
 from .worker_result import WorkerResult
 
 
@@ -10,6 +17,10 @@ class BaseWorker:
         self._props = props
         self.state = {}
         self._destroy_func = None
+        # 取消令牌，运行超时时由 Waiter 设置
+        self.cancel_token = WorkerCancelToken()
+        # 被 Waiter 派遣的时间（单调时钟），用于计算排队时间
+        self.dispatch_time: float | None = None
         self._on_create()
         self.num = 1
 
@@ -17,6 +28,17 @@ class BaseWorker:
         if self._destroy_func:
             self._destroy_func()
 
+    def __getstate__(self):
+        # 取消令牌和销毁回调只在当前进程有效，pickle 到子进程时丢弃
+        state = self.__dict__.copy()
+        state.pop("cancel_token", None)
+        state["_destroy_func"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cancel_token = WorkerCancelToken()
+
     def is_loop(self):
         if self._props.get("is_loop"):
             return self._props.get("is_loop")
@@ -26,6 +48,15 @@ class BaseWorker:
     def run_timeout(self):
         return self._props.get("run_timeout")
 
+    def is_cancelled(self) -> bool:
+        """是否已被 Waiter 取消，长时间运行的 _execute 应定期检查."""
+        return self.cancel_token.is_cancelled()
+
+    @property
+    def delay_time(self):
+        """两次执行之间的延迟，由 Waiter 的定时器负责，不再占用线程 sleep."""
+        return self._props.get("delay_time")
+
     @property
     def name(self):
         if self._props.get("name"):
@@ -43,22 +74,38 @@ class BaseWorker:
 
     def run(self):
         result = {}
+        start_time = time.monotonic()
+        queue_wait = None
+        if self.dispatch_time is not None:
+            queue_wait = max(0.0, start_time - self.dispatch_time)
+            self.dispatch_time = None
+
+        outcome = OUTCOME_SUCCESS
         try:
             LogUtils.info(f"{self.name} Worker is Start", self.__class__.__name__)
             result = self._execute()
             self._destroy_result(result)
             LogUtils.info(f"{self.name} Worker is Stop", self.__class__.__name__)
+        except WorkerCancelledError:
+            outcome = OUTCOME_CANCELLED
+            LogUtils.warning(f"{self.name} Worker is cancelled", self.__class__.__name__)
         except Exception as e:
+            outcome = OUTCOME_ERROR
             self._on_error()
             LogUtils.error(str(e), self.__class__.__name__)
         finally:
             self._on_done()
 
-        if self._props.get("delay_time"):
-            time.sleep(self._props["delay_time"])
+        duration = time.monotonic() - start_time
+        get_worker_metrics().record(self, duration, outcome, queue_wait)
 
         return WorkerResult(
-            str(self.__class__.__name__).lower() + "_result", result, self.__class__.__name__
+            str(self.__class__.__name__).lower() + "_result",
+            result,
+            self.__class__.__name__,
+            outcome=outcome,
+            duration=duration,
+            queue_wait=queue_wait,
         )
 
     def _on_error(self):
@@ -1,7 +1,7 @@
+import time
+from concurrent.futures import wait
 from typing import TYPE_CHECKING
 
-import gevent
-
 from zoo_framework.core.aop import cage
 from zoo_framework.event.event_channel_manager import EventChannelManager
 from zoo_framework.workers import BaseWorker
@@ -9,6 +9,7 @@ from zoo_framework.workers import BaseWorker
 if TYPE_CHECKING:
     from zoo_framework.event import EventChannel
     from zoo_framework.fifo.node import EventNode
+    from zoo_framework.reactor import BaseReactorExecutor, EventReactor
 
 
 @cage
@@ -20,38 +21,103 @@ class EventWorker(BaseWorker):
         # 事件处理器注册器
         self.eventChannelManager: EventChannelManager = EventChannelManager()
 
+        # 反应器执行器，第一次处理事件时按配置创建
+        self._reactor_executor: BaseReactorExecutor | None = None
+
+        # 本轮收到事件的批量模式反应器，通道出队完成后刷新未满的批次
+        self._batch_reactors: dict[str, EventReactor] = {}
+
+    @property
+    def reactor_executor(self) -> "BaseReactorExecutor":
+        if self._reactor_executor is None:
+            from zoo_framework.params import EventParams
+            from zoo_framework.reactor import create_reactor_executor
+
+            self._reactor_executor = create_reactor_executor(
+                EventParams.EVENT_REACTOR_EXECUTOR,
+                max_workers=EventParams.EVENT_REACTOR_POOL_SIZE,
+                max_in_flight=EventParams.EVENT_REACTOR_MAX_IN_FLIGHT,
+                reactor_concurrency=EventParams.EVENT_REACTOR_CONCURRENCY,
+            )
+        return self._reactor_executor
+
+    def set_reactor_executor(self, executor: "BaseReactorExecutor"):
+        """替换反应器执行器，旧的执行器会在在途任务完成后关闭."""
+        old_executor, self._reactor_executor = self._reactor_executor, executor
+        if old_executor is not None:
+            old_executor.shutdown(wait=False)
+
     def _execute(self):
         from zoo_framework.params import EventParams
 
         channel_names = self.eventChannelManager.get_all_channel_name()
-        g_queue = []
+        futures = []
         # TODO：获得除去失败事件通道的所有事件通道
         for channel_name in channel_names:
             channel: EventChannel = self.eventChannelManager.get_channel(channel_name)
             if channel is None:
                 continue
-            # 获得所有的事件通道
-            while channel.size() > 0:
-                event_node: EventNode = channel.pop_value()
-                # 判断事件是否过期
-                if event_node.is_expire():
-                    event_node.expire_callback()
-                    continue
-                # 获得事件反应器
-                reactors = self.eventChannelManager.get_channel_reactors(event_node)
-                # 如果这里为空，需要查看node 是否有重试次数，如果有重试次数，需要重新放入队列
-                if len(reactors) == 0:
-                    if event_node.get_retry_times() > 0:
-                        event_node.retry_times = event_node.get_retry_times() - 1
-                        channel.push_event(event_node)
-                    continue
-                for reactor in reactors:
-                    # 执行事件反应器
-                    g = gevent.spawn(reactor.perform, (event_node.content, event_node.topic))
-                    g_queue.append(g)
-
-        # 根据优先级排序
-
-        if len(g_queue) > 0:
-            # 执行处理方法
-            gevent.joinall(g_queue, timeout=EventParams.EVENT_JOIN_TIMEOUT)
+            # 各通道在自己的线程池中并行处理，并发数由通道自己限制，
+            # 事件多的通道不会占用其他通道的处理线程
+            futures.extend(channel.drain(self.handle_event))
+
+        if len(futures) == 0 and self._reactor_executor is None:
+            return
+
+        # 先等通道出队完成，再在剩余时间内等待已提交的反应器执行完成
+        deadline = time.monotonic() + EventParams.EVENT_JOIN_TIMEOUT
+        if len(futures) > 0:
+            wait(futures, timeout=EventParams.EVENT_JOIN_TIMEOUT)
+        if self._reactor_executor is not None:
+            self._flush_batches(deadline)
+            self._reactor_executor.join(timeout=max(0.0, deadline - time.monotonic()))
+
+    def _flush_batches(self, deadline: float):
+        """执行本轮未达到 batch_size 的批次.
+
+        先等已提交的事件进入批次缓冲，再把各反应器的 flush 交给执行器，
+        没有设置逗留时间的批次不会一直等待后续事件
+        """
+        batch_reactors, self._batch_reactors = self._batch_reactors, {}
+        if not batch_reactors:
+            return
+        executor = self._reactor_executor
+        executor.join(timeout=max(0.0, deadline - time.monotonic()))
+        for reactor in batch_reactors.values():
+            executor.submit(reactor, reactor.flush)
+
+    def handle_event(self, event_node: "EventNode"):
+        """处理单个事件，在事件通道的处理线程中执行."""
+        # 判断事件是否过期
+        if event_node.is_expire():
+            event_node.expire_callback()
+            return
+        # 获得事件反应器
+        reactors = self.eventChannelManager.get_channel_reactors(event_node)
+        # 如果这里为空，需要查看node 是否有重试次数，如果有重试次数，需要重新放入队列
+        if not reactors:
+            if event_node.get_retry_times() > 0:
+                event_node.retry_times = event_node.get_retry_times() - 1
+                channel: EventChannel = self.eventChannelManager.get_channel(
+                    event_node.channel_name
+                )
+                channel.push_event(event_node)
+            return
+        executor = self.reactor_executor
+        for reactor in reactors:
+            if reactor.is_batch():
+                self._batch_reactors[reactor.reactor_name] = reactor
+            # 交给反应器执行器，同一事件的多个反应器可以重叠执行；
+            # 在途窗口或反应器并发已满时在这里阻塞，背压传回事件通道的队列。
+            # 批量模式的反应器会按反应器合并同一通道中连续出队的事件，
+            # 执行器在事件循环中运行时，协程处理方法直接 await，不占用线程
+            run = reactor.submit
+            if executor.runs_coroutines and reactor.is_async() and not reactor.is_batch():
+                run = reactor.execute_async
+            executor.submit(
+                reactor,
+                run,
+                event_node.topic,
+                event_node.content,
+                event_node.channel_name,
+            )
@@ -1,8 +1,14 @@
 import copy
 import pickle
 import threading
+import time
+from collections.abc import Callable
 
+from zoo_framework.core.persistence_scheduler import ForkSnapshotter
 from zoo_framework.statemachine.state_machine_manager import StateMachineManager
+from zoo_framework.statemachine.state_scope_store import StateScopeStore
+from zoo_framework.statemachine.state_snapshot import MmapSnapshotPersistenceStrategy
+from zoo_framework.statemachine.state_wal import WAL_OP_REMOVE, WAL_OP_SET, StateWriteAheadLog
 from zoo_framework.utils import FileUtils, LogUtils
 
 from .base_worker import BaseWorker
@@ -13,6 +19,10 @@ class StateMachineWorker(BaseWorker):
 
     特性：
     - 自动加载和保存状态机
+    - 修改写入预写日志，每个周期只 fsync 增量，日志过大时压缩为快照
+    - 按作用域分文件存储，只并行写入修改过的作用域，作用域在第一次访问时加载
+    - 内存映射快照存储，启动时不反序列化，节点在第一次访问时加载
+    - 可在 fork 出的子进程中保存完整快照，保存期间不阻塞状态机的修改
     - 线程安全的状态机访问
     - 支持文件校验和备份
     """
@@ -28,24 +38,191 @@ class StateMachineWorker(BaseWorker):
         self.is_loop = True
         # 标记是否已加载
         self._loaded = False
+        # 预写日志，未启用时为 None
+        self._wal: StateWriteAheadLog | None = None
+        # 按作用域分文件的存储，single 模式时为 None
+        self._scope_store: StateScopeStore | None = None
+        # 后台保存，未启用时为 None
+        self._snapshotter: ForkSnapshotter | None = None
+        # 持久化指标，后台保存的回调在其他线程中更新，由锁保护
+        self._persistence_metrics_lock = threading.Lock()
+        self._persistence_metrics = {
+            "save_count": 0,
+            "save_error_count": 0,
+            "last_save_duration": 0.0,
+            "last_save_time": 0.0,
+        }
+
+    def get_persistence_metrics(self) -> dict:
+        """获取持久化指标：保存次数、失败次数、最近一次保存的耗时和时间戳."""
+        with self._persistence_metrics_lock:
+            return dict(self._persistence_metrics)
 
     def _destroy(self, result):
         """销毁时保存状态."""
-        self._save_state_machines()
+        if self._snapshotter is not None:
+            self._snapshotter.wait()
+        if self._wal is not None:
+            self._compact(StateMachineManager())
+            self._wal.close()
+        else:
+            self._save_state_machines()
+        if self._scope_store is not None:
+            self._scope_store.shutdown()
+        if self._snapshotter is not None:
+            self._snapshotter.wait()
 
     def _execute(self):
         """执行状态机持久化任务."""
+        from zoo_framework.params import StateMachineParams
+
         # 使用线程锁保护状态机操作
         with self._instance_lock:
             state_machine_manager = StateMachineManager()
 
             # 检查状态机是否已加载
             if not self._loaded:
-                self._load_state_machines(state_machine_manager)
+                if (
+                    StateMachineParams.STORAGE_MODE == "mmap"
+                    and not MmapSnapshotPersistenceStrategy.available()
+                ):
+                    LogUtils.warning("⚠️ mmap storage is only supported on POSIX, use single")
+                if self._get_storage_mode() == "scope":
+                    self._open_scope_store(state_machine_manager)
+                else:
+                    self._load_state_machines(state_machine_manager)
+                    self._open_snapshotter()
+                self._open_wal(state_machine_manager)
                 self._loaded = True
-            else:
+            elif self._wal is None:
                 # 定期保存状态
                 self._save_state_machines(state_machine_manager)
+            else:
+                # 增量已在预写日志中，只需写入磁盘
+                self._wal.sync()
+                if self._wal.size >= StateMachineParams.WAL_COMPACT_SIZE:
+                    self._compact(state_machine_manager)
+
+    @staticmethod
+    def _get_storage_mode() -> str:
+        """获取存储方式，平台不支持 mmap 时按 single 保存."""
+        from zoo_framework.params import StateMachineParams
+
+        mode = StateMachineParams.STORAGE_MODE
+        if mode == "mmap" and not MmapSnapshotPersistenceStrategy.available():
+            return "single"
+        return mode
+
+    def _open_snapshotter(self):
+        """启用后台保存."""
+        from zoo_framework.params import StateMachineParams
+
+        if not StateMachineParams.BACKGROUND_SAVE:
+            return
+        if not ForkSnapshotter.available():
+            LogUtils.warning(
+                "⚠️ os.fork is not available, state machines are saved in the foreground"
+            )
+            return
+        self._snapshotter = ForkSnapshotter(StateMachineParams.BACKGROUND_SAVE_TIMEOUT)
+
+    def _open_scope_store(self, state_machine_manager):
+        """使用按作用域分文件的存储，作用域在第一次访问时加载.
+
+        Args:
+            state_machine_manager: 状态机管理器实例
+        """
+        from zoo_framework.params import StateMachineParams
+
+        store = StateScopeStore(
+            StateMachineParams.PICKLE_PATH + ".scopes", StateMachineParams.SCOPE_IO_WORKERS
+        )
+        self._scope_store = store
+        if not store.exists() and FileUtils.file_exists(StateMachineParams.PICKLE_PATH):
+            # 从单文件迁移：读取全部作用域后逐个写入
+            LogUtils.info("📦 Migrating state machines to per-scope files")
+            self._load_state_machines(state_machine_manager)
+            for state_scope in state_machine_manager.get_state_machines().values():
+                state_scope.mark_dirty()
+            self._save_scopes(state_machine_manager)
+        else:
+            state_machine_manager.load_state_machines()
+
+        state_machine_manager.set_scope_loader(store.load)
+
+    def _save_scopes(self, state_machine_manager) -> bool:
+        """并行写入修改过的作用域，删除已移除的作用域文件.
+
+        Args:
+            state_machine_manager: 状态机管理器实例
+
+        Returns:
+            是否保存成功
+        """
+        start_time = time.monotonic()
+        dirty = {
+            scope: state_scope
+            for scope, state_scope in state_machine_manager.get_state_machines().items()
+            if state_scope.is_dirty()
+        }
+        removed = state_machine_manager.take_removed_scopes()
+        saved = self._scope_store.save(
+            dirty, removed, lock=state_machine_manager.get_mutation_lock()
+        )
+        state_machine_manager.finish_removed_scopes(removed, saved)
+        if saved:
+            self._record_save_metrics(start_time)
+            LogUtils.debug(f"💾 {len(dirty)} state scopes saved")
+            return True
+        self._record_save_error()
+        return False
+
+    def _open_wal(self, state_machine_manager):
+        """回放预写日志，并开始记录之后的修改.
+
+        Args:
+            state_machine_manager: 状态机管理器实例
+        """
+        from zoo_framework.params import StateMachineParams
+
+        if not StateMachineParams.WAL_ENABLE:
+            return
+
+        wal = StateWriteAheadLog(
+            StateMachineParams.PICKLE_PATH + ".wal", StateMachineParams.WAL_FSYNC_INTERVAL
+        )
+        replayed = self._replay_wal(wal, state_machine_manager)
+        self._wal = wal
+        state_machine_manager.add_mutation_listener(wal.append)
+
+        if replayed > 0:
+            LogUtils.info(f"✅ State machines replayed {replayed} WAL records")
+            # 合并进快照；崩溃时没有写完的最后一帧已在回放时截断
+            self._compact(state_machine_manager)
+
+    @staticmethod
+    def _replay_wal(wal: StateWriteAheadLog, state_machine_manager) -> int:
+        """按顺序回放预写日志中的修改，返回回放的记录数."""
+        count = 0
+        for op, scope, key, value in wal.replay():
+            if op == WAL_OP_SET:
+                state_machine_manager.set_state(scope, key, value)
+            elif op == WAL_OP_REMOVE:
+                state_machine_manager.remove_state(scope, key)
+            count += 1
+        return count
+
+    def _compact(self, state_machine_manager):
+        """把预写日志压缩为完整快照.
+
+        先轮转日志再保存快照，保存期间的修改写入新日志；
+        快照保存成功后才删除旧日志，失败时下次加载仍会回放
+        """
+        if self._snapshotter is not None and self._snapshotter.is_running():
+            # 上一次后台保存完成时会删除旧日志，完成前不能再次轮转
+            return
+        self._wal.rotate()
+        self._save_state_machines(state_machine_manager, on_saved=self._wal.discard_old)
 
     def _load_state_machines(self, state_machine_manager):
         """加载状态机（线程安全）.
@@ -60,6 +237,11 @@ class StateMachineWorker(BaseWorker):
             if state_machine_manager.have_loaded():
                 return
 
+            if self._get_storage_mode() == "mmap" and self._load_snapshot(
+                state_machine_manager, StateMachineParams.PICKLE_PATH
+            ):
+                return
+
             if FileUtils.file_exists(StateMachineParams.PICKLE_PATH):
                 try:
                     with open(StateMachineParams.PICKLE_PATH, "rb") as f:
@@ -89,47 +271,147 @@ class StateMachineWorker(BaseWorker):
                 LogUtils.info("📝 No state machine file found, creating new")
                 state_machine_manager.load_state_machines()
 
-    def _save_state_machines(self, state_machine_manager=None):
+    @staticmethod
+    def _load_snapshot(state_machine_manager, file_path: str) -> bool:
+        """映射快照文件，文件不是快照格式（例如旧的 pickle 文件）时返回 False.
+
+        Args:
+            state_machine_manager: 状态机管理器实例
+            file_path: 快照文件路径
+        """
+        strategy = MmapSnapshotPersistenceStrategy()
+        if not FileUtils.file_exists(file_path) or not strategy.validate(file_path):
+            return False
+        state_machines = strategy.load(file_path)
+        if state_machines is None:
+            return False
+        LogUtils.info(f"✅ State machines mapped: {len(state_machines)} scopes")
+        state_machine_manager.load_state_machines(state_machines)
+        return True
+
+    def _save_state_machines(
+        self, state_machine_manager=None, on_saved: Callable[[], None] | None = None
+    ) -> bool:
         """保存状态机（线程安全）.
 
         Args:
             state_machine_manager: 状态机管理器实例，为 None 时自动获取
-        """
-        from zoo_framework.params import StateMachineParams
+            on_saved: 保存成功后调用，后台保存时在保存完成后调用
 
+        Returns:
+            是否保存成功；后台保存时为是否已开始保存
+        """
         if state_machine_manager is None:
             state_machine_manager = StateMachineManager()
 
+        if self._scope_store is not None:
+            saved = self._save_scopes(state_machine_manager)
+        elif self._snapshotter is not None:
+            return self._save_in_background(state_machine_manager, on_saved)
+        else:
+            saved = self._save_in_foreground(state_machine_manager)
+
+        if saved and on_saved is not None:
+            on_saved()
+        return saved
+
+    def _save_in_foreground(self, state_machine_manager) -> bool:
+        """在当前线程中保存状态机."""
+        from zoo_framework.params import StateMachineParams
+
         # 使用文件锁保护文件写入
         with self._file_lock:
+            start_time = time.monotonic()
             try:
-                # 先创建备份
-                self._create_backup(StateMachineParams.PICKLE_PATH)
-
-                # 写入临时文件
-                temp_path = StateMachineParams.PICKLE_PATH + ".tmp"
                 state_machines = state_machine_manager.get_state_machines()
+                if self._get_storage_mode() != "mmap":
+                    # 深拷贝避免并发修改；快照逐个节点序列化，不需要深拷贝
+                    state_machines = copy.deepcopy(state_machines)
+                self._write_state_machines(state_machines)
+                return self._record_save(start_time)
 
-                # 深拷贝避免并发修改
-                copy_value = copy.deepcopy(state_machines)
+            except Exception as e:
+                self._record_save_error()
+                LogUtils.error(f"❌ Failed to save state machines: {e}")
+                # 尝试恢复备份；快照失败时原文件未被修改，且可能正被映射，不能覆盖
+                if self._get_storage_mode() != "mmap":
+                    self._restore_backup(StateMachineParams.PICKLE_PATH)
+                return False
 
-                with open(temp_path, "wb") as f:
-                    pickle.dump(copy_value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    def _save_in_background(self, state_machine_manager, on_saved=None) -> bool:
+        """在 fork 出的子进程中保存状态机.
 
-                # 原子性替换文件
-                import os
+        子进程拥有 fork 时刻内存的写时复制副本，不需要深拷贝，
+        父进程只在 fork 期间持有文件锁和状态机的修改锁
 
-                if os.path.exists(StateMachineParams.PICKLE_PATH):
-                    os.replace(temp_path, StateMachineParams.PICKLE_PATH)
-                else:
-                    os.rename(temp_path, StateMachineParams.PICKLE_PATH)
+        Returns:
+            是否已开始保存，上一次后台保存尚未完成时返回 False
+        """
+        start_time = time.monotonic()
+        state_machines = state_machine_manager.get_state_machines()
 
-                LogUtils.debug("💾 State machines saved successfully")
+        def write() -> bool:
+            self._write_state_machines(state_machines)
+            return True
 
-            except Exception as e:
-                LogUtils.error(f"❌ Failed to save state machines: {e}")
-                # 尝试恢复备份
-                self._restore_backup(StateMachineParams.PICKLE_PATH)
+        def done(success: bool) -> None:
+            if not success:
+                self._record_save_error()
+                LogUtils.error("❌ Failed to save state machines in background")
+                return
+            self._record_save(start_time)
+            if on_saved is not None:
+                on_saved()
+
+        with self._file_lock:
+            return self._snapshotter.start(
+                write, done, lock=state_machine_manager.get_mutation_lock()
+            )
+
+    def _write_state_machines(self, state_machines) -> None:
+        """备份后写入状态机文件，失败时抛出异常.
+
+        Args:
+            state_machines: 作用域名称 -> StateScope
+        """
+        import os
+
+        from zoo_framework.params import StateMachineParams
+
+        # 先创建备份
+        self._create_backup(StateMachineParams.PICKLE_PATH)
+
+        if self._get_storage_mode() == "mmap":
+            if not MmapSnapshotPersistenceStrategy().save(
+                state_machines, StateMachineParams.PICKLE_PATH
+            ):
+                raise OSError("snapshot save failed")
+            return
+
+        # 写入临时文件后原子性替换
+        temp_path = StateMachineParams.PICKLE_PATH + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(state_machines, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, StateMachineParams.PICKLE_PATH)
+
+    def _record_save(self, start_time: float) -> bool:
+        """记录一次成功的保存."""
+        LogUtils.debug("💾 State machines saved successfully")
+        self._record_save_metrics(start_time)
+        return True
+
+    def _record_save_metrics(self, start_time: float) -> None:
+        """更新保存次数、最近一次保存的耗时和时间戳."""
+        duration = time.monotonic() - start_time
+        with self._persistence_metrics_lock:
+            self._persistence_metrics["save_count"] += 1
+            self._persistence_metrics["last_save_duration"] = duration
+            self._persistence_metrics["last_save_time"] = time.time()
+
+    def _record_save_error(self) -> None:
+        """更新保存失败次数."""
+        with self._persistence_metrics_lock:
+            self._persistence_metrics["save_error_count"] += 1
 
     def _create_backup(self, file_path: str):
         """创建文件备份.
@@ -188,6 +470,10 @@ class StateMachineWorker(BaseWorker):
         backup_files.sort(reverse=True)
         latest_backup = backup_files[0]
 
+        if self._load_snapshot(state_machine_manager, latest_backup):
+            LogUtils.info(f"✅ State machines restored from backup: {latest_backup}")
+            return
+
         try:
             with open(latest_backup, "rb") as f:
                 state_machines = pickle.load(f)
@@ -0,0 +1,41 @@
+import threading
+
+
+class WorkerCancelledError(Exception):
+    """Worker 被取消（通常是运行超时）时抛出的异常."""
+
+
+class WorkerCancelToken:
+    """Worker 取消令牌.
+
+    Waiter 在 worker 运行超时时设置令牌，协作式 worker 在 _execute 中
+    通过 is_cancelled 或 raise_if_cancelled 检查并尽快退出。
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """设置取消标记."""
+        self._event.set()
+
+    def reset(self):
+        """清除取消标记，每次派遣前由 Waiter 调用."""
+        self._event.clear()
+
+    def is_cancelled(self) -> bool:
+        """是否已取消."""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """如果已取消则抛出 WorkerCancelledError."""
+        if self._event.is_set():
+            raise WorkerCancelledError("worker has been cancelled")
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """可被取消打断的等待，用于替代 worker 内部的 time.sleep.
+
+        :param timeout: 等待时间（秒）
+        :return: 是否已取消
+        """
+        return self._event.wait(timeout)
@@ -0,0 +1,156 @@
+"""Worker 运行指标.
+
+Worker 每次运行结束后生成一条运行记录（单调时钟耗时、结果、排队时间、资源池占用），
+记录被追加到每个订阅者自己的 deque 中。追加不加锁，运行路径不会因为
+订阅者（如 SVMWorker）正在持锁统计而阻塞；订阅者在需要时自行取出记录汇总。
+"""
+
+import threading
+import time
+from collections import deque
+
+# 运行结果
+OUTCOME_SUCCESS = "success"
+OUTCOME_ERROR = "error"
+OUTCOME_CANCELLED = "cancelled"
+OUTCOME_TIMEOUT = "timeout"
+
+
+class WorkerRunRecord:
+    """一次 Worker 运行的记录."""
+
+    __slots__ = (
+        "duration",
+        "finished_at",
+        "outcome",
+        "pool_active",
+        "pool_size",
+        "queue_wait",
+        "worker_id",
+        "worker_name",
+    )
+
+    def __init__(
+        self,
+        worker_name: str,
+        worker_id: int,
+        duration: float,
+        outcome: str,
+        queue_wait: float | None = None,
+        pool_active: int = 0,
+        pool_size: int = 0,
+        finished_at: float | None = None,
+    ):
+        self.worker_name = worker_name
+        self.worker_id = worker_id
+        # 运行耗时（秒），单调时钟
+        self.duration = duration
+        # 运行结果：success / error / cancelled / timeout
+        self.outcome = outcome
+        # 从派遣到开始运行的排队时间（秒），直接调用 run 时为 None
+        self.queue_wait = queue_wait
+        # 运行结束时资源池中正在运行的 worker 数和资源池大小
+        self.pool_active = pool_active
+        self.pool_size = pool_size
+        # 运行结束的时间（单调时钟），用于按时间窗口统计
+        self.finished_at = time.monotonic() if finished_at is None else finished_at
+
+    @property
+    def success(self) -> bool:
+        return self.outcome == OUTCOME_SUCCESS
+
+
+class WorkerMetrics:
+    """Worker 运行指标收集器."""
+
+    def __init__(self, max_pending: int = 10000):
+        """初始化收集器.
+
+        Args:
+            max_pending: 每个订阅者最多缓存的未取出记录数，超出时丢弃最旧的记录
+        """
+        self.max_pending = max_pending
+        # 订阅者队列，整体替换，record 时无锁遍历
+        self._subscribers: tuple[deque, ...] = ()
+        self._lock = threading.Lock()
+        # 资源池占用，由 Waiter 在派遣和释放 worker 时更新
+        self.pool_active = 0
+        self.pool_size = 0
+
+    def subscribe(self) -> deque:
+        """订阅运行记录.
+
+        Returns:
+            接收记录的队列，订阅者通过 popleft 取出
+        """
+        pending = deque(maxlen=self.max_pending)
+        with self._lock:
+            self._subscribers = (*self._subscribers, pending)
+        return pending
+
+    def unsubscribe(self, pending: deque) -> None:
+        """取消订阅."""
+        with self._lock:
+            self._subscribers = tuple(q for q in self._subscribers if q is not pending)
+
+    def set_pool_occupancy(self, active: int, size: int) -> None:
+        """更新资源池占用."""
+        self.pool_active = active
+        self.pool_size = size
+
+    def record(
+        self,
+        worker,
+        duration: float,
+        outcome: str,
+        queue_wait: float | None = None,
+    ) -> None:
+        """记录一次运行，不阻塞.
+
+        Args:
+            worker: 运行的 worker
+            duration: 运行耗时（秒）
+            outcome: 运行结果
+            queue_wait: 排队时间（秒）
+        """
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+
+        record = WorkerRunRecord(
+            worker.name,
+            id(worker),
+            duration,
+            outcome,
+            queue_wait,
+            self.pool_active,
+            self.pool_size,
+        )
+        for pending in subscribers:
+            pending.append(record)
+
+
+# 全局 Worker 运行指标收集器
+_worker_metrics: WorkerMetrics | None = None
+_worker_metrics_lock = threading.Lock()
+
+
+def get_worker_metrics() -> WorkerMetrics:
+    """获取全局 Worker 运行指标收集器."""
+    global _worker_metrics
+    with _worker_metrics_lock:
+        if _worker_metrics is None:
+            _worker_metrics = WorkerMetrics()
+        return _worker_metrics
+
+
+# 导出公共 API
+__all__ = [
+    "OUTCOME_CANCELLED",
+    "OUTCOME_ERROR",
+    "OUTCOME_SUCCESS",
+    "OUTCOME_TIMEOUT",
+    "WorkerMetrics",
+    "WorkerRunRecord",
+    "get_worker_metrics",
+]
@@ -1,5 +1,9 @@
 class WorkerResult:
-    def __init__(self, topic, content, cls_name):
+    def __init__(self, topic, content, cls_name, outcome=None, duration=None, queue_wait=None):
         self.topic = topic
         self.content = content
         self.cls_name = cls_name
+        # 运行结果、耗时和排队时间，进程模式下随结果回到主进程后记录指标
+        self.outcome = outcome
+        self.duration = duration
+        self.queue_wait = queue_wait